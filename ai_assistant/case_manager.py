@@ -1,6 +1,8 @@
 import pandas as pd
 import logging
+from datetime import datetime
 from config import Config
+from utils.case_search_index import CaseSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,17 @@ class CaseManager:
             self.filepath = os.path.join(script_dir, Config.CASES_FILE_PATH)
         self.df = self.load_cases()
         
+        # Per-PV content hashes of the current load, used to diff reloads
+        self.row_hashes = self.compute_row_hashes(self.df)
+        self.last_changes = None
+        self.revision = 0  # Bumped whenever a reload changes any case
+        self._change_listeners = []
+        
+        # Built lazily on first use and dropped whenever the data reloads
+        self._search_index = None
+        self._balance_map = None
+        self._case_table = None
+        
     def load_cases(self):
         """Load cases from Excel file with proper error handling"""
         try:
@@ -39,6 +52,99 @@ class CaseManager:
             print(f"❌ Error loading spreadsheet: {e}")
             return pd.DataFrame()
 
+    def compute_row_hashes(self, df):
+        """Compute a content hash per PV (first occurrence wins, like get_case_by_pv)"""
+        try:
+            if df is None or df.empty or df.shape[1] < 2:
+                return {}
+            
+            hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+            pvs = df[1].astype(str).str.strip()
+            
+            row_hashes = {}
+            for pv, row_hash in zip(pvs, hashes):
+                if pv and pv not in row_hashes:
+                    row_hashes[pv] = str(row_hash)
+            return row_hashes
+            
+        except Exception as e:
+            logger.error(f"Error hashing case rows: {e}")
+            return {}
+    
+    def diff_row_hashes(self, old_hashes, new_hashes):
+        """Compare two PV->hash maps and return added, removed and changed PVs"""
+        old_pvs = set(old_hashes)
+        new_pvs = set(new_hashes)
+        
+        return {
+            "added": sorted(new_pvs - old_pvs),
+            "removed": sorted(old_pvs - new_pvs),
+            "changed": sorted(pv for pv in old_pvs & new_pvs if old_hashes[pv] != new_hashes[pv]),
+        }
+    
+    def add_change_listener(self, callback):
+        """Register a callback(changes) invoked after a reload that changed cases"""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback):
+        """Unregister a change listener"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def reload_cases(self, filepath=None):
+        """
+        Reload the spreadsheet and notify listeners of the cases that changed
+        
+        Args:
+            filepath: Optional new spreadsheet path (defaults to the current one)
+        
+        Returns:
+            dict: added/removed/changed PV lists plus counts, or None if the load failed
+        """
+        previous_path = self.filepath
+        if filepath:
+            self.filepath = filepath
+        
+        new_df = self.load_cases()
+        if new_df.empty and not self.df.empty:
+            # Keep the previous data rather than wiping every case on a bad load
+            logger.error(f"Reload of {self.filepath} returned no cases - keeping previous data")
+            self.filepath = previous_path
+            return None
+        
+        new_hashes = self.compute_row_hashes(new_df)
+        changes = self.diff_row_hashes(self.row_hashes, new_hashes)
+        changes["total"] = len(new_hashes)
+        changes["unchanged"] = len(new_hashes) - len(changes["added"]) - len(changes["changed"])
+        changes["filepath"] = self.filepath
+        changes["timestamp"] = datetime.now().isoformat()
+        
+        self.df = new_df
+        self.row_hashes = new_hashes
+        self.last_changes = changes
+        self._search_index = None
+        self._balance_map = None
+        self._case_table = None
+        
+        logger.info(f"Spreadsheet reload: {len(changes['added'])} added, "
+                    f"{len(changes['removed'])} removed, {len(changes['changed'])} changed, "
+                    f"{changes['unchanged']} unchanged")
+        
+        if changes["added"] or changes["removed"] or changes["changed"]:
+            self.revision += 1
+            self._notify_change_listeners(changes)
+        
+        return changes
+    
+    def _notify_change_listeners(self, changes):
+        """Send a change set to every registered listener"""
+        for callback in list(self._change_listeners):
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.error(f"Error in case change listener {callback}: {e}")
+    
     def get_case_by_pv(self, pv):
         """Get case by PV number with duplicate detection"""
         try:
@@ -118,30 +224,182 @@ class CaseManager:
         except Exception as e:
             logger.error(f"Error checking duplicates: {e}")
 
+    def get_search_index(self):
+        """Return the trigram search index, building it on first use"""
+        if self._search_index is None:
+            self._search_index = CaseSearchIndex.from_dataframe(self.df)
+        return self._search_index
+    
+    def get_balance_map(self):
+        """Return a PV -> balance (column AB) map, computed once per load"""
+        if self._balance_map is None:
+            try:
+                if self.df.empty or self.df.shape[1] <= 27:
+                    self._balance_map = {}
+                else:
+                    pvs = self.df[1].astype(str).str.strip()
+                    balances = pd.to_numeric(
+                        self.df[27].astype(str).str.replace('$', '', regex=False)
+                                                .str.replace(',', '', regex=False).str.strip(),
+                        errors="coerce"
+                    ).fillna(0.0)
+                    balance_map = {}
+                    for pv, balance in zip(pvs, balances):
+                        if pv and pv not in balance_map:
+                            balance_map[pv] = float(balance)
+                    self._balance_map = balance_map
+            except Exception as e:
+                logger.error(f"Error building balance map: {e}")
+                return {}
+        return self._balance_map
+    
+    def get_case_table(self):
+        """
+        Return the cases as a typed table, computed once per load
+        
+        Columns use the format_case keys (text columns as stripped strings, DOI
+        formatted the same way, Balance as float) plus "DOI Date", the parsed DOI
+        (NaT when blank or unparseable). The index matches self.df.
+        """
+        if self._case_table is None:
+            try:
+                self._case_table = self._build_case_table(self.df)
+            except Exception as e:
+                logger.error(f"Error building case table: {e}")
+                return self._build_case_table(pd.DataFrame())
+        return self._case_table
+    
+    def _build_case_table(self, df):
+        """Vectorized equivalent of format_case over a whole DataFrame"""
+        def text(col):
+            if col in df.columns:
+                return df[col].astype(str).str.strip()
+            return pd.Series("", index=df.index, dtype=object)
+        
+        doi_str = text(4).replace({"nan": "", "NaT": ""})
+        date_part = doi_str.str.split().str[0].fillna("")
+        doi_date = pd.to_datetime(date_part.where(date_part != ""), errors="coerce", format="mixed")
+        
+        # Same rules as format_case: keep 2099 placeholders and MM/DD/YYYY as-is,
+        # reformat other parseable dates, fall back to the date part otherwise
+        is_placeholder = doi_str.str.contains("2099", regex=False)
+        is_slashed = date_part.str.count("/") == 2
+        doi = date_part.where(is_slashed | doi_date.isna(), doi_date.dt.strftime("%m/%d/%Y"))
+        doi = doi.where(~is_placeholder, doi_str)
+        
+        if 27 in df.columns:
+            balance = pd.to_numeric(
+                text(27).str.replace('$', '', regex=False).str.replace(',', '', regex=False),
+                errors="coerce"
+            ).fillna(0.0)
+        else:
+            balance = pd.Series(0.0, index=df.index)
+        
+        return pd.DataFrame({
+            "CMS": text(0),
+            "PV": text(1),
+            "Status": text(2),
+            "Name": text(3),
+            "DOI": doi,
+            "DOA": doi,
+            "Attorney Email": text(18),
+            "Attorney Phone": text(19),
+            "Law Firm": text(12),
+            "Balance": balance.astype(float),
+            "DOI Date": doi_date.where(~is_placeholder),
+        }, index=df.index)
+    
+    def get_all_cases(self):
+        """Format every case (itertuples avoids building a Series per row)"""
+        try:
+            if self.df.empty:
+                return []
+            return [self.format_case(row) for row in self.df.itertuples(index=False, name=None)]
+        except Exception as e:
+            logger.error(f"Error formatting all cases: {e}")
+            return []
+    
+    def get_cases_by_pvs(self, pvs):
+        """Format cases for a list of PVs in the given order using a single lookup"""
+        try:
+            if self.df.empty or not pvs:
+                return []
+            
+            wanted = [str(pv).strip() for pv in pvs]
+            pv_column = self.df[1].astype(str).str.strip()
+            rows = self.df[pv_column.isin(wanted)]
+            rows_by_pv = {}
+            for idx, row in rows.iterrows():
+                rows_by_pv.setdefault(pv_column[idx], row)
+            
+            return [self.format_case(rows_by_pv[pv]) for pv in wanted if pv in rows_by_pv]
+            
+        except Exception as e:
+            logger.error(f"Error looking up cases by PV: {e}")
+            return []
+    
+    def fuzzy_search(self, search_term, limit=50):
+        """Ranked fuzzy search over patient names, law firms and attorney emails"""
+        try:
+            matches = self.get_search_index().search(search_term, limit=limit)
+            return self.get_cases_by_pvs([m["pv"] for m in matches])
+        except Exception as e:
+            logger.error(f"Error in fuzzy search for '{search_term}': {e}")
+            return []
+    
+    def live_search(self, search_term, previous_term=None, previous_pvs=None):
+        """
+        Matching PVs for search-as-you-type
+
+        When the new term extends the previous one, PV/CMS prefix matching
+        only checks the previous result set (a longer prefix can only match
+        fewer cases). Fuzzy scores do not shrink that way, so fuzzy matches
+        always come from the whole index.
+
+        Returns:
+            list: PV strings (PV/CMS prefix matches first, then fuzzy matches by rank)
+        """
+        term = str(search_term).strip().lower()
+        if not term:
+            return []
+
+        index = self.get_search_index()
+        restrict_to = None
+        if previous_pvs is not None and previous_term and term.startswith(str(previous_term).strip().lower()):
+            restrict_to = set(previous_pvs)
+
+        pvs = index.prefix_search(term, restrict_to=restrict_to)
+        seen = set(pvs)
+        for match in index.search(term, limit=None):
+            if match["pv"] not in seen:
+                seen.add(match["pv"])
+                pvs.append(match["pv"])
+        return pvs
+
     def search_case(self, search_term):
-        """Search for a case by PV, Name, or CMS number"""
+        """Search for a case by PV or CMS number, then fuzzy match name, firm or email"""
         try:
             if self.df.empty:
                 return None
             
             # Convert search term to string and lower case for comparison
-            search_term = str(search_term).lower()
+            search_term = str(search_term).strip().lower()
             
             # Search by PV (column 1)
             pv_matches = self.df[self.df[1].astype(str).str.lower() == search_term]
             if not pv_matches.empty:
                 return self.format_case(pv_matches.iloc[0])
             
-            # Search by Name (column 3)
-            name_matches = self.df[self.df[3].astype(str).str.lower().str.contains(search_term, na=False)]
-            if not name_matches.empty:
-                return [self.format_case(row) for _, row in name_matches.iterrows()]
-            
             # Search by CMS (column 0)
             cms_matches = self.df[self.df[0].astype(str).str.lower() == search_term]
             if not cms_matches.empty:
                 return self.format_case(cms_matches.iloc[0])
             
+            # Ranked fuzzy match on name, law firm and attorney email
+            fuzzy_matches = self.fuzzy_search(search_term)
+            if fuzzy_matches:
+                return fuzzy_matches
+            
             return None
             
         except Exception as e:
@@ -22,6 +22,47 @@ class Config:
     DEFAULT_FROM_NAME = os.getenv("DEFAULT_FROM_NAME", "AI Assistant")
     DEFAULT_SIGNATURE = os.getenv("DEFAULT_SIGNATURE", "")
     
+    # CMS site - point CMS_BASE_URL at utils/mock_cms_server.py for headless benchmarks
+    CMS_BASE_URL = os.getenv("CMS_BASE_URL", "https://cms.transconfinancialinc.com/CMS")
+    CMS_HEADLESS = os.getenv("CMS_HEADLESS", "false").lower() in ("1", "true", "yes")
+    
+    # Pending CMS notes (durable queue)
+    CMS_QUEUE_DB_PATH = os.getenv("CMS_QUEUE_DB_PATH", "data/cms_notes.db")
+    CMS_NOTE_WORKERS = int(os.getenv("CMS_NOTE_WORKERS", "1"))  # Browser tabs adding notes at once
+    CMS_NOTE_RETRIES = int(os.getenv("CMS_NOTE_RETRIES", "2"))  # Extra attempts per note on the same tab
+    CMS_NOTE_DELAY_SECONDS = float(os.getenv("CMS_NOTE_DELAY_SECONDS", "0"))  # Pause between notes on a tab
+    CMS_STEP_TIMEOUT_MS = int(os.getenv("CMS_STEP_TIMEOUT_MS", "15000"))  # Max wait for each add_note step
+    CMS_MAX_SESSION_RESTARTS = int(os.getenv("CMS_MAX_SESSION_RESTARTS", "3"))  # Relogins per batch before pausing it
+    CMS_NOTE_COALESCE = os.getenv("CMS_NOTE_COALESCE", "separate")  # Several notes for a PID: "separate" or "combine"
+    CMS_NOTE_DRIVER = os.getenv("CMS_NOTE_DRIVER", "browser")  # "browser" (Playwright) or "http" (direct form posts)
+    # The HTTP driver's endpoints and form fields are only verified against utils/mock_cms_server.py -
+    # "http" is ignored unless this is explicitly turned on
+    CMS_HTTP_DRIVER_ENABLED = os.getenv("CMS_HTTP_DRIVER_ENABLED", "false").lower() in ("1", "true", "yes")
+    CMS_VERIFY_TLS = os.getenv("CMS_VERIFY_TLS", "true").lower() in ("1", "true", "yes")  # HTTP driver certificate checks
+    # Background consumer that adds notes on the persistent CMS session while sends run
+    CMS_BACKGROUND_CONSUMER = os.getenv("CMS_BACKGROUND_CONSUMER", "false").lower() in ("1", "true", "yes")
+    CMS_CONSUMER_POLL_SECONDS = float(os.getenv("CMS_CONSUMER_POLL_SECONDS", "5"))  # Idle wait between queue checks
+    CMS_CONSUMER_BATCH_PIDS = int(os.getenv("CMS_CONSUMER_BATCH_PIDS", "10"))  # PIDs per pass (pause/stop granularity)
+    CMS_CONSUMER_HIGH_WATER = int(os.getenv("CMS_CONSUMER_HIGH_WATER", "50"))  # Backlog that opens extra tabs
+    CMS_CONSUMER_KEEPALIVE_SECONDS = float(os.getenv("CMS_CONSUMER_KEEPALIVE_SECONDS", "240"))  # Idle page reload
+    
+    # Bulk email outbox (durable send queue)
+    OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", "data/email_outbox.db")
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "4"))
+    OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "30"))
+    SEND_RATE_PER_MINUTE = int(os.getenv("SEND_RATE_PER_MINUTE", "30"))
+    SEND_RATE_PER_DAY = int(os.getenv("SEND_RATE_PER_DAY", "500"))
+    DIGEST_MIN_CASES = int(os.getenv("DIGEST_MIN_CASES", "2"))  # Cases needed before a firm gets a digest
+    
+    # Scheduled sends - business hours in the recipient firm's timezone
+    SEND_WINDOW_TIMEZONE = os.getenv("SEND_WINDOW_TIMEZONE", "America/Los_Angeles")
+    SEND_WINDOW_START = os.getenv("SEND_WINDOW_START", "09:00")
+    SEND_WINDOW_END = os.getenv("SEND_WINDOW_END", "17:00")
+    SEND_WINDOW_WEEKDAYS = os.getenv("SEND_WINDOW_WEEKDAYS", "0,1,2,3,4")  # Monday=0
+    
+    # Gmail API endpoint override - e.g. http://127.0.0.1:8765/ for utils/fake_gmail_server.py (skips OAuth)
+    GMAIL_API_ENDPOINT = os.getenv("GMAIL_API_ENDPOINT", "")
+    
     # Gmail API scopes
     GMAIL_SCOPES = [
         "https://www.googleapis.com/auth/gmail.readonly",
@@ -9,6 +9,7 @@ import os
 import logging
 import json
 import asyncio
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import pytz
@@ -41,15 +42,21 @@ from services.bulk_email_service import BulkEmailService
 from services.case_acknowledgment_service import CaseAcknowledgmentService
 from services.template_summary_service import TemplateSummaryService
 from utils.progress_manager import ProgressManager, ProgressContext, with_progress
-from utils.threaded_operations import EmailCacheWorker, GmailSearchWorker, CategorizeWorker, CollectionsAnalyzerWorker
+from utils.table_models import DictTableModel, CaseFilterProxyModel
+from utils.threaded_operations import EmailCacheWorker, GmailSearchWorker, CategorizeWorker, CollectionsAnalyzerWorker, CategoryAnalysisWorker, OutboxSenderWorker, BatchPrepareWorker, ScheduledSendWorker, CMSNoteConsumerWorker
 try:
-    from services.cms_integration import add_cms_note_for_email, process_session_cms_notes, get_session_stats
+    from services.cms_integration import (
+        add_cms_note_for_email, process_session_cms_notes, get_session_stats, get_last_run_summary,
+        CMSNoteConsumer
+    )
     CMS_AVAILABLE = True
 except ImportError:
     CMS_AVAILABLE = False
     add_cms_note_for_email = None
     process_session_cms_notes = None
     get_session_stats = None
+    get_last_run_summary = None
+    CMSNoteConsumer = None
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -90,6 +97,10 @@ class CategoriesWidget(QWidget):
         self.parent_window = parent
         self.ack_service = CaseAcknowledgmentService()
         self.category_data = {}  # Store original data for filtering
+        self.category_models = {}
+        self.category_proxies = {}
+        self.category_views = {}
+        self.analysis_worker = None
         self.init_ui()
     
     def init_ui(self):
@@ -173,17 +184,35 @@ class CategoriesWidget(QWidget):
         title_label = QLabel(f"<h3>{title}</h3>")
         layout.addWidget(title_label)
         
-        # Table for cases
-        table = QTableWidget()
+        # Table for cases - model/view so only visible rows are rendered
+        model = DictTableModel([
+            ("PV #", "pv"),
+            ("Name", "name"),
+            ("Balance", "balance", self._format_balance),
+            ("Days Since Contact", "days_since_contact", lambda days, row: str(days) if days else 'Never'),
+            ("Law Firm", "law_firm"),
+            ("Attorney Email", "attorney_email"),
+            ("Status", "status", lambda status, row: str(status) if status else 'Unknown'),
+            ("Acknowledged", "acknowledged", self._format_acknowledged),
+        ], self, foregrounds={"acknowledged": self._acknowledged_color})
+        proxy = CaseFilterProxyModel(self)
+        proxy.setSourceModel(model)
+        
+        table = QTableView()
         table.setObjectName(f"{category}_table")
-        table.setColumnCount(9)
-        table.setHorizontalHeaderLabels([
-            "PV #", "Name", "Balance", "Days Since Contact", "Law Firm", 
-            "Attorney Email", "Status", "Acknowledged", "Actions"
-        ])
+        table.setModel(proxy)
         table.horizontalHeader().setStretchLastSection(False)
         table.setAlternatingRowColors(True)
         table.setSortingEnabled(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setContextMenuPolicy(Qt.CustomContextMenu)
+        table.customContextMenuRequested.connect(lambda pos, c=category: self.show_case_context_menu(c, pos))
+        table.doubleClicked.connect(lambda index, c=category: self.summarize_case(self.category_proxies[c].row_data(index.row()).get('pv')))
+        
+        self.category_models[category] = model
+        self.category_proxies[category] = proxy
+        self.category_views[category] = table
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -205,184 +234,166 @@ class CategoriesWidget(QWidget):
         return widget
     
     def refresh_analysis(self):
-        """Refresh the case categories"""
+        """Refresh the case categories in a background worker"""
+        if self.analysis_worker and self.analysis_worker.isRunning():
+            return
+        
         try:
             # Ensure email cache is set on tracker if available
             if hasattr(self.parent_window, 'email_cache_service'):
                 if not hasattr(self.collections_tracker, 'email_cache'):
                     self.collections_tracker.email_cache = self.parent_window.email_cache_service
-                    
-            # Use enhanced progress with live logs
-            with ProgressContext(self.parent_window, "Refreshing Analysis", "Analyzing case categories...", 
-                               pulse=False, maximum=100, show_logs=True) as progress:
-                
-                # Clear cache to force fresh analysis
-                progress.set_message("Clearing cache...")
-                progress.log("🗑️ Clearing category cache")
-                self.collections_tracker.clear_stale_cache()
-                progress.process_events()
-                
-                # Get comprehensive case categories with enhanced progress
-                progress.log("🔍 Analyzing case activity patterns")
-                
-                def update_progress(msg, pct):
-                    progress.update(pct if pct > 0 else progress.dialog.progress_bar.value(), msg)
-                    if "Found" in msg or "Processing" in msg:
-                        progress.log(msg)
-                    progress.process_events()
-                
-                case_categories = self.collections_tracker.get_comprehensive_stale_cases(
-                    self.case_manager,
-                    exclude_acknowledged=True,
-                    progress_callback=update_progress,
-                    skip_email_search=True  # Use cached data for fast refresh
-                )
-                
-                # Debug logging to see what categories we got
-                logger.info(f"Categories returned: {case_categories.keys()}")
-                for cat_name, cat_cases in case_categories.items():
-                    logger.info(f"Category '{cat_name}': {len(cat_cases)} cases")
-                
-                # Store data for filtering
-                progress.update(60, "Processing case data...")
-                progress.log("📦 Processing case categories")
-                self.category_data = case_categories
-                progress.process_events()
-                
-                # Apply current filter and update tables
-                progress.update(80, "Applying filters and updating display...")
-                progress.log("🎯 Applying balance filters")
-                self.apply_balance_filter()
-                progress.process_events()
-                
-                # Update statistics
-                progress.update(95, "Updating statistics...")
-                progress.log("📊 Calculating statistics")
-                self.update_stats()
-                
-                progress.update(100, "Analysis complete!")
-                progress.log("✅ Category analysis complete")
+            
+            progress = ProgressManager(self)
+            progress.show_progress("Refreshing Analysis", "Analyzing case categories...",
+                                   maximum=100, cancelable=True, show_logs=True)
+            
+            worker = CategoryAnalysisWorker(self.collections_tracker, self.case_manager)
+            # Signals are queued onto the GUI thread - no process_events() polling needed
+            worker.progress_update.connect(lambda pct, msg: self._on_analysis_progress(progress, pct, msg))
+            worker.log_message.connect(progress.log)
+            worker.finished.connect(lambda snapshot: self._on_analysis_finished(progress, snapshot))
+            worker.cancelled.connect(lambda: self._on_analysis_cancelled(progress))
+            worker.error.connect(lambda err: self._on_analysis_error(progress, err))
+            progress.dialog.rejected.connect(worker.stop)
+            
+            self.analysis_worker = worker
+            self.refresh_btn.setEnabled(False)
+            self.refresh_btn.setText("⏳ Analyzing...")
+            worker.start()
+            
+        except Exception as e:
+            self._reset_refresh_button()
+            QMessageBox.critical(self, "Error", f"Failed to refresh analysis: {str(e)}")
+    
+    def _on_analysis_progress(self, progress, pct, msg):
+        """Show worker progress in the dialog"""
+        if progress.dialog:
+            if pct > 0:
+                progress.dialog.setValue(pct)
+            progress.dialog.setLabelText(msg)
+    
+    def _on_analysis_finished(self, progress, snapshot):
+        """Swap in the worker's snapshot and reload every table from it"""
+        progress.close()
+        self._reset_refresh_button()
+        
+        try:
+            categories = snapshot["categories"]
+            logger.info(f"Categories returned: {list(categories.keys())}")
+            
+            # One assignment replaces the data; the balance filter stays applied by the proxies
+            self.category_data = dict(categories)
+            self.refresh_category_tables(self.category_models.keys())
+            self.update_stats(snapshot["dashboard"])
             
             QMessageBox.information(self, "Success", "Categories refreshed!")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to refresh analysis: {str(e)}")
     
+    def _on_analysis_cancelled(self, progress):
+        """Keep the tables as they were when the user cancels"""
+        progress.close()
+        self._reset_refresh_button()
+        if self.parent_window and hasattr(self.parent_window, 'log_activity'):
+            self.parent_window.log_activity("Category refresh cancelled")
+    
+    def _on_analysis_error(self, progress, error):
+        """Report a failed analysis"""
+        progress.close()
+        self._reset_refresh_button()
+        QMessageBox.critical(self, "Error", f"Failed to refresh analysis: {error}")
+    
+    def _reset_refresh_button(self):
+        """Re-enable the refresh button once the worker is done"""
+        worker = self.analysis_worker
+        if worker is not None:
+            # Called from the worker's last signal - let run() return before the QThread goes
+            worker.wait()
+            worker.deleteLater()
+            self.analysis_worker = None
+        self.refresh_btn.setEnabled(True)
+        self.refresh_btn.setText("🔄 Refresh Categories")
+    
+    def stop_analysis(self):
+        """Stop a running analysis and wait for the worker to exit"""
+        if self.analysis_worker and self.analysis_worker.isRunning():
+            self.analysis_worker.stop()
+            self.analysis_worker.wait(5000)
+    
     def update_category_table(self, category, cases):
         """Update a specific category table with cases"""
-        # Find the table widget
-        widget = self.findChild(QTableWidget, f"{category}_table")
-        if not widget:
+        model = self.category_models.get(category)
+        if model is None:
             return
         
-        # Clear existing rows to ensure clean state
-        widget.setRowCount(0)
+        model.set_rows(cases)
+        self.category_views[category].resizeColumnsToContents()
+    
+    def _format_balance(self, balance, row):
+        """Currency display for the balance column"""
+        if isinstance(balance, (int, float)):
+            return f"${balance:,.2f}"
+        return "$0.00"
+    
+    def _format_acknowledged(self, value, row):
+        """Acknowledgment display, looked up only when the row is painted"""
+        ack_info = self.ack_service.get_acknowledgment_info(str(row.get('pv', '')))
+        if ack_info:
+            return f"✅ {ack_info.get('reason', 'Acknowledged')[:20]}..."
+        return ""
+    
+    def _acknowledged_color(self, row):
+        """Green text for acknowledged cases"""
+        if self.ack_service.get_acknowledgment_info(str(row.get('pv', ''))):
+            return QColor(0, 200, 0)
+        return None
+    
+    def show_case_context_menu(self, category, pos):
+        """Actions menu for the case under the cursor"""
+        table = self.category_views[category]
+        index = table.indexAt(pos)
+        if not index.isValid():
+            return
         
-        # DEBUG: Log what we're updating
-        print(f"[DEBUG] Updating {category} table with {len(cases)} cases")
-        if cases:
-            print(f"[DEBUG] First case: PV={cases[0].get('pv')}, Name={cases[0].get('name')}")
-            if len(cases) > 1:
-                print(f"[DEBUG] Last case: PV={cases[-1].get('pv')}, Name={cases[-1].get('name')}")
+        case = self.category_proxies[category].row_data(index.row())
+        if not case:
+            return
         
-        widget.setRowCount(len(cases))
+        pv = str(case.get('pv', ''))
+        name = str(case.get('name', ''))
+        status = str(case.get('status', 'Unknown'))
+        ack_info = self.ack_service.get_acknowledgment_info(pv)
         
-        for row, case in enumerate(cases):
-            # CRITICAL: Capture all case data at the start to ensure consistency
-            pv = str(case.get('pv', ''))
-            name = str(case.get('name', ''))
-            status = str(case.get('status', 'Unknown'))
-            
-            # PV #
-            widget.setItem(row, 0, QTableWidgetItem(pv))
-            
-            # Name
-            widget.setItem(row, 1, QTableWidgetItem(name))
-            
-            # Balance - format as currency
-            balance = case.get('balance', 0.0)
-            if isinstance(balance, (int, float)):
-                balance_item = QTableWidgetItem(f"${balance:,.2f}")
-                # Store raw value for sorting
-                balance_item.setData(Qt.UserRole, balance)
-            else:
-                balance_item = QTableWidgetItem("$0.00")
-                balance_item.setData(Qt.UserRole, 0.0)
-            widget.setItem(row, 2, balance_item)
-            
-            # Days since contact
-            days = case.get('days_since_contact', 'Never')
-            widget.setItem(row, 3, QTableWidgetItem(str(days) if days else 'Never'))
-            
-            # Law Firm
-            widget.setItem(row, 4, QTableWidgetItem(str(case.get('law_firm', ''))))
-            
-            # Attorney Email
-            widget.setItem(row, 5, QTableWidgetItem(str(case.get('attorney_email', ''))))
-            
-            # Status
-            widget.setItem(row, 6, QTableWidgetItem(status))
-            
-            # Acknowledgment status
-            ack_info = self.ack_service.get_acknowledgment_info(pv)
-            if ack_info:
-                ack_text = f"✅ {ack_info.get('reason', 'Acknowledged')[:20]}..."
-                ack_item = QTableWidgetItem(ack_text)
-                ack_item.setForeground(QColor(0, 200, 0))
-                widget.setItem(row, 7, ack_item)
-            else:
-                widget.setItem(row, 7, QTableWidgetItem(""))
-            
-            # Actions button
-            action_btn = QPushButton("Actions")
-            action_menu = QMenu()
-            
-            # CRITICAL: Create a helper function to ensure proper value capture
-            def create_action_handler(func, *args):
-                """Helper to properly capture values for action handlers"""
-                return lambda checked=False: func(*args)
-            
-            # Add actions with properly captured values
-            summarize_action = action_menu.addAction("📄 Summarize")
-            # DEBUG: Print what PV we're capturing
-            print(f"[DEBUG] Creating actions for row {row}: PV={pv}, Name={name}")
-            summarize_action.triggered.connect(create_action_handler(self.summarize_case, pv))
-            
-            followup_action = action_menu.addAction("✉️ Draft Follow-up")
-            followup_action.triggered.connect(create_action_handler(self.draft_followup, pv))
-            
-            status_action = action_menu.addAction("📮 Draft Status Request")
-            status_action.triggered.connect(create_action_handler(self.draft_status_request, pv))
-            
-            # Add CCP 335.1 action if in CCP 335.1 category
-            if category == "ccp_335_1":
-                ccp_action = action_menu.addAction("⚖️ Send CCP 335.1 Inquiry")
-                # Make a copy of case data to avoid reference issues
-                case_copy = dict(case)
-                ccp_action.triggered.connect(create_action_handler(self.send_ccp_335_1_inquiry, pv, case_copy))
-            
-            action_menu.addSeparator()
-            
-            # Acknowledgment actions
-            if ack_info:
-                unack_action = action_menu.addAction("❌ Remove Acknowledgment")
-                unack_action.triggered.connect(create_action_handler(self.unacknowledge_case, pv))
-                
-                extend_action = action_menu.addAction("⏰ Extend Snooze")
-                extend_action.triggered.connect(create_action_handler(self.extend_snooze, pv))
-            else:
-                ack_action = action_menu.addAction("✅ Acknowledge Case")
-                ack_action.triggered.connect(create_action_handler(self.acknowledge_case, pv, name, status))
-            
-            action_btn.setMenu(action_menu)
-            widget.setCellWidget(row, 8, action_btn)
+        menu = QMenu(self)
+        menu.addAction("📄 Summarize").triggered.connect(lambda checked=False: self.summarize_case(pv))
+        menu.addAction("✉️ Draft Follow-up").triggered.connect(lambda checked=False: self.draft_followup(pv))
+        menu.addAction("📮 Draft Status Request").triggered.connect(lambda checked=False: self.draft_status_request(pv))
+        
+        # Add CCP 335.1 action if in CCP 335.1 category
+        if category == "ccp_335_1":
+            case_copy = dict(case)
+            menu.addAction("⚖️ Send CCP 335.1 Inquiry").triggered.connect(
+                lambda checked=False: self.send_ccp_335_1_inquiry(pv, case_copy))
+        
+        menu.addSeparator()
         
-        widget.resizeColumnsToContents()
+        # Acknowledgment actions
+        if ack_info:
+            menu.addAction("❌ Remove Acknowledgment").triggered.connect(lambda checked=False: self.unacknowledge_case(pv))
+            menu.addAction("⏰ Extend Snooze").triggered.connect(lambda checked=False: self.extend_snooze(pv))
+        else:
+            menu.addAction("✅ Acknowledge Case").triggered.connect(
+                lambda checked=False: self.acknowledge_case(pv, name, status))
+        
+        menu.exec_(table.viewport().mapToGlobal(pos))
     
-    def update_stats(self):
-        """Update statistics label"""
+    def update_stats(self, dashboard=None):
+        """Update statistics label (dashboard may come precomputed from the analysis worker)"""
         try:
-            dashboard = self.collections_tracker.get_collections_dashboard()
+            if dashboard is None:
+                dashboard = self.collections_tracker.get_collections_dashboard()
             
             # Get CCP 335.1 count from category data if available
             ccp_335_1_count = len(self.category_data.get('ccp_335_1', [])) if hasattr(self, 'category_data') else 0
@@ -403,45 +414,83 @@ class CategoriesWidget(QWidget):
     
     def apply_balance_filter(self):
         """Apply balance filter to all category tables"""
+        filter_type = self.balance_filter_combo.currentText() if hasattr(self, 'balance_filter_combo') else "All"
+        threshold_text = self.balance_threshold.text() if hasattr(self, 'balance_threshold') else ""
+        
+        threshold = 0.0
+        if threshold_text:
+            try:
+                threshold = float(threshold_text.replace(',', '').replace('$', ''))
+            except ValueError:
+                threshold = 0.0
+        
+        if filter_type == "Above":
+            predicate = lambda case: case.get('balance', 0.0) >= threshold
+        elif filter_type == "Below":
+            predicate = lambda case: case.get('balance', 0.0) <= threshold
+        else:
+            predicate = None
+        
+        # Proxies re-filter the rows they already hold - nothing is rebuilt
+        for proxy in self.category_proxies.values():
+            proxy.set_predicate("balance", predicate)
+    
+    def apply_case_changes(self, changes):
+        """Refresh only the category tables holding PVs touched by a spreadsheet reload"""
+        if not self.category_data:
+            return
+        
+        # A running refresh reads the reloaded spreadsheet itself and replaces everything
+        if self.analysis_worker and self.analysis_worker.isRunning():
+            return
+        
+        affected = set(changes.get("added", [])) | set(changes.get("removed", [])) | set(changes.get("changed", []))
+        if not affected:
+            return
+        
         try:
-            filter_type = self.balance_filter_combo.currentText() if hasattr(self, 'balance_filter_combo') else "All"
-            threshold_text = self.balance_threshold.text() if hasattr(self, 'balance_threshold') else ""
+            # The tracker has already patched its cache; without a fresh one the analysis runs in the worker
+            new_data = self.collections_tracker.get_cached_stale_cases(exclude_acknowledged=True)
+            if new_data is None:
+                self.refresh_analysis()
+                return
             
-            threshold = 0.0
-            if threshold_text:
-                try:
-                    threshold = float(threshold_text.replace(',', '').replace('$', ''))
-                except ValueError:
-                    threshold = 0.0
+            touched = []
+            for category in set(self.category_data) | set(new_data):
+                old_pvs = {str(c.get('pv')) for c in self.category_data.get(category, [])}
+                new_pvs = {str(c.get('pv')) for c in new_data.get(category, [])}
+                if (old_pvs | new_pvs) & affected:
+                    touched.append(category)
             
-            # Apply filter to each category
-            for category in ["critical", "high_priority", "no_response", "recently_sent", "never_contacted", "missing_doi", "ccp_335_1"]:
+            self.category_data = new_data
+            self.refresh_category_tables(touched)
+            self.update_stats()
+            
+            if self.parent_window:
+                self.parent_window.log_activity(f"Updated {len(touched)} category tables for {len(affected)} changed cases")
+                
+        except Exception as e:
+            logger.error(f"Error applying case changes to categories: {e}")
+    
+    def refresh_category_tables(self, categories):
+        """Load the given categories into their table models"""
+        try:
+            balance_map = None
+            for category in categories:
                 cases = self.category_data.get(category, [])
                 
-                # Add balance information to each case
-                filtered_cases = []
-                for case in cases:
-                    # Get full case data with balance
-                    pv = case.get('pv')
-                    if pv:
-                        full_case = self.case_manager.get_case_by_pv(pv)
-                        if full_case:
-                            case['balance'] = full_case.get('Balance', 0.0)
-                    
-                    # Apply filter
-                    balance = case.get('balance', 0.0)
-                    if filter_type == "All":
-                        filtered_cases.append(case)
-                    elif filter_type == "Above" and balance >= threshold:
-                        filtered_cases.append(case)
-                    elif filter_type == "Below" and balance <= threshold:
-                        filtered_cases.append(case)
+                # Stale results carry their balance; older cached results may not
+                missing = [case for case in cases if 'balance' not in case]
+                if missing:
+                    if balance_map is None:
+                        balance_map = self.case_manager.get_balance_map()
+                    for case in missing:
+                        case['balance'] = balance_map.get(str(case.get('pv', '')).strip(), 0.0)
                 
-                # Update table with filtered cases
-                self.update_category_table(category, filtered_cases)
+                self.update_category_table(category, cases)
                 
         except Exception as e:
-            print(f"Error applying balance filter: {e}")
+            print(f"Error refreshing category tables: {e}")
     
     def process_category(self, category):
         """Process all cases in a category"""
@@ -488,8 +537,6 @@ class CategoriesWidget(QWidget):
     def remove_case_from_display(self, pv):
         """Remove a case from the current category display after email sent"""
         try:
-            print(f"[DEBUG] Removing PV {pv} from category displays")
-            
             # Find and remove the case from all category tables
             for category in ["critical", "high_priority", "no_response", "recently_sent", "never_contacted", "missing_doi", "ccp_335_1"]:
                 if category in self.category_data:
@@ -497,15 +544,9 @@ class CategoriesWidget(QWidget):
                     original_count = len(self.category_data[category])
                     self.category_data[category] = [c for c in self.category_data[category] if str(c.get('pv')) != str(pv)]
                     
-                    # If we removed something, update that category's table
+                    # If we removed something, drop just that row from the table model
                     if len(self.category_data[category]) < original_count:
-                        print(f"[DEBUG] Removed PV {pv} from {category}, updating table with {len(self.category_data[category])} remaining cases")
-                        
-                        # Force immediate table refresh
-                        self.update_category_table(category, self.category_data[category])
-                        
-                        # Process events to ensure UI updates immediately
-                        QApplication.processEvents()
+                        self.category_models[category].remove_rows(lambda row: str(row.get('pv')) == str(pv))
                         
                         # Update the category tab title with new count
                         for i in range(self.category_tabs.count()):
@@ -556,22 +597,6 @@ class CategoriesWidget(QWidget):
     
     def summarize_case(self, pv):
         """Trigger case summarization"""
-        print(f"[DEBUG] summarize_case called with PV: {pv}")
-        # Get the current case data for this PV to ensure we have the right info
-        current_case = None
-        for category in self.category_data.values():
-            for case in category:
-                if str(case.get('pv')) == str(pv):
-                    current_case = case
-                    break
-            if current_case:
-                break
-        
-        if current_case:
-            print(f"[DEBUG] Found case for PV {pv}: Name={current_case.get('name')}")
-        else:
-            print(f"[DEBUG] WARNING: Could not find case data for PV {pv} in category_data")
-        
         if self.parent_window:
             # Pass reference to this widget so it can be notified when email is sent from summary
             self.parent_window.summarize_case_by_pv(pv, category_widget=self)
@@ -1145,6 +1170,14 @@ class BulkEmailWidget(QWidget):
         self.test_mode_check.stateChanged.connect(self.toggle_test_mode)
         header_layout.addWidget(self.test_mode_check)
         
+        # Digest mode - one email per firm address listing all of its cases
+        self.digest_mode_check = QCheckBox("One Email per Firm")
+        self.digest_mode_check.setToolTip("Combine cases going to the same firm address into a single digest email")
+        if self.parent_window and hasattr(self.parent_window, 'settings'):
+            self.digest_mode_check.setChecked(self.parent_window.settings.value("bulk_firm_digest", False, type=bool))
+        self.digest_mode_check.stateChanged.connect(self.on_digest_mode_changed)
+        header_layout.addWidget(self.digest_mode_check)
+        
         layout.addLayout(header_layout)
         
         # Test mode info
@@ -1244,26 +1277,73 @@ class BulkEmailWidget(QWidget):
         self.send_btn.clicked.connect(self.send_batch)
         self.send_btn.setEnabled(False)
         
+        self.schedule_btn = QPushButton("🕘 Schedule for Business Hours")
+        self.schedule_btn.clicked.connect(self.schedule_batch)
+        self.schedule_btn.setEnabled(False)
+        self.schedule_btn.setToolTip("Send during each firm's local business hours, spread across the day")
+        
         self.export_btn = QPushButton("💾 Export to Excel")
         self.export_btn.clicked.connect(self.export_batch)
         
+        self.resume_outbox_btn = QPushButton("▶️ Resume Outbox")
+        self.resume_outbox_btn.clicked.connect(self.resume_outbox)
+        self.resume_outbox_btn.setToolTip("Send emails left queued by an interrupted batch")
+        
         button_layout.addWidget(self.refresh_categories_btn)
         button_layout.addWidget(self.populate_btn)
         button_layout.addWidget(self.preview_btn)
         button_layout.addWidget(self.send_btn)
+        button_layout.addWidget(self.schedule_btn)
         button_layout.addWidget(self.export_btn)
+        button_layout.addWidget(self.resume_outbox_btn)
         
         layout.addLayout(button_layout)
         
+        # Send rate ceilings - adjustable while a batch is running
+        rate_layout = QHBoxLayout()
+        rate_layout.addWidget(QLabel("Send rate:"))
+        
+        self.rate_per_minute_spin = QSpinBox()
+        self.rate_per_minute_spin.setRange(1, 600)
+        self.rate_per_minute_spin.setSuffix(" / min")
+        self.rate_per_minute_spin.setValue(self.bulk_service.rate_limiter.per_minute)
+        self.rate_per_minute_spin.valueChanged.connect(self.on_rate_limits_changed)
+        rate_layout.addWidget(self.rate_per_minute_spin)
+        
+        self.rate_per_day_spin = QSpinBox()
+        self.rate_per_day_spin.setRange(1, 10000)
+        self.rate_per_day_spin.setSuffix(" / day")
+        self.rate_per_day_spin.setValue(self.bulk_service.rate_limiter.per_day)
+        self.rate_per_day_spin.valueChanged.connect(self.on_rate_limits_changed)
+        rate_layout.addWidget(self.rate_per_day_spin)
+        
+        self.throughput_label = QLabel("")
+        self.throughput_label.setStyleSheet("color: #666;")
+        rate_layout.addWidget(self.throughput_label)
+        rate_layout.addStretch()
+        layout.addLayout(rate_layout)
+        
+        # Restore the last ceilings the user chose
+        if self.parent_window and hasattr(self.parent_window, 'settings'):
+            self.rate_per_minute_spin.setValue(self.parent_window.settings.value(
+                "send_rate_per_minute", self.rate_per_minute_spin.value(), type=int))
+            self.rate_per_day_spin.setValue(self.parent_window.settings.value(
+                "send_rate_per_day", self.rate_per_day_spin.value(), type=int))
+        
         # Simple status label (minimal space)
         self.status_label = QLabel("Ready to process emails")
         self.status_label.setStyleSheet("padding: 3px; color: #666;")
         layout.addWidget(self.status_label)
         
+        self.schedule_status_label = QLabel("")
+        self.schedule_status_label.setStyleSheet("padding: 3px; color: #666;")
+        layout.addWidget(self.schedule_status_label)
+        
         # Statistics
         self.stats_label = QLabel()
         self.update_statistics()
         layout.addWidget(self.stats_label)
+        self.update_outbox_status()
         
         self.setLayout(layout)
         
@@ -1426,115 +1506,230 @@ class BulkEmailWidget(QWidget):
     
     def populate_batch(self):
         """Populate the batch based on selected criteria"""
+        if getattr(self, 'prepare_worker', None) and self.prepare_worker.isRunning():
+            return
+        
         try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
+            job = self.get_batch_job()
             
-            # Store the batch emails for later use
-            self.current_batch = self.get_selected_batch()
-            
-            if not self.current_batch:
+            if job is None:
+                # Balance and custom selections are built inline
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                emails = self.get_selected_batch()
                 QApplication.restoreOverrideCursor()
-                QMessageBox.warning(self, "No Cases", "No cases found for the selected criteria.")
+                self.fill_preview(emails)
+                self.finish_populate()
                 return
             
-            # Populate preview table
-            self.preview_table.setRowCount(len(self.current_batch))
-            
-            for row, email in enumerate(self.current_batch):
-                pv = str(email.get('pv', ''))
-                
-                # PV #
-                self.preview_table.setItem(row, 0, QTableWidgetItem(pv))
-                
-                # Name
-                self.preview_table.setItem(row, 1, QTableWidgetItem(str(email.get('name', ''))))
-                
-                # Balance - format as currency
-                balance = email.get('case_data', {}).get('Balance', 0.0) if 'case_data' in email else 0.0
-                if not balance:
-                    # Try to get from case manager
-                    case = self.case_manager.get_case_by_pv(pv)
-                    if case:
-                        balance = case.get('Balance', 0.0)
-                balance_item = QTableWidgetItem(f"${balance:,.2f}")
-                balance_item.setData(Qt.UserRole, balance)  # Store raw value for sorting
-                self.preview_table.setItem(row, 2, balance_item)
-                
-                # Law Firm
-                self.preview_table.setItem(row, 3, QTableWidgetItem(str(email.get('law_firm', ''))))
-                
-                # Email - show TEST MODE clearly
-                email_to = str(email.get('to', ''))
-                email_item = QTableWidgetItem(email_to)
-                if self.bulk_service.test_mode:
-                    email_item.setBackground(QColor(255, 255, 0))  # Yellow background
-                    email_item.setForeground(QColor(255, 0, 0))  # Red text
-                    email_item.setToolTip(f"TEST MODE: Actually sending to {email_to}\nOriginal: {email.get('original_to', 'N/A')}")
-                self.preview_table.setItem(row, 4, email_item)
-                
-                # Status
-                status = email.get('case_data', {}).get('status', '') if 'case_data' in email else ''
-                self.preview_table.setItem(row, 5, QTableWidgetItem(str(status)))
-                
-                # Acknowledgment status
-                ack_info = self.ack_service.get_acknowledgment_info(pv)
-                if ack_info:
-                    ack_text = f"✅ {ack_info.get('reason', 'Acknowledged')[:15]}..."
-                    ack_item = QTableWidgetItem(ack_text)
-                    ack_item.setForeground(QColor(0, 200, 0))
-                    self.preview_table.setItem(row, 6, ack_item)
-                else:
-                    self.preview_table.setItem(row, 6, QTableWidgetItem(""))
-                
-                # Actions button
-                action_btn = QPushButton("Actions")
-                action_menu = QMenu()
-                
-                # Add summarize, draft follow-up, and draft status request options
-                case_data = email.get('case_data', {})
-                
-                # Summarize option
-                summarize_action = action_menu.addAction("📊 Summarize")
-                summarize_action.triggered.connect(lambda checked, cd=case_data: self.summarize_case_from_bulk(cd))
-                
-                # Draft follow-up option
-                draft_followup_action = action_menu.addAction("📧 Draft Follow-up")
-                draft_followup_action.triggered.connect(lambda checked, cd=case_data: self.draft_followup_from_bulk(cd))
-                
-                # Draft status request option
-                draft_status_action = action_menu.addAction("📋 Draft Status Request")
-                draft_status_action.triggered.connect(lambda checked, cd=case_data: self.draft_status_request_from_bulk(cd))
-                
-                action_menu.addSeparator()
-                
-                if ack_info:
-                    unack_action = action_menu.addAction("❌ Remove Acknowledgment")
-                    unack_action.triggered.connect(lambda checked, p=pv: self.unacknowledge_case(p))
-                else:
-                    ack_action = action_menu.addAction("✅ Acknowledge Case")
-                    ack_action.triggered.connect(lambda checked, p=pv, n=email.get('name', ''), s=status: 
-                                               self.acknowledge_case(p, n, s))
-                
-                action_btn.setMenu(action_menu)
-                self.preview_table.setCellWidget(row, 7, action_btn)
-                
-                # Checkbox for selection (now in column 8)
-                checkbox = QCheckBox()
-                # Don't auto-check acknowledged cases
-                checkbox.setChecked(not bool(ack_info))
-                self.preview_table.setCellWidget(row, 8, checkbox)
+            # Emails stream into the preview as the worker generates them
+            self.current_batch = []
+            self.preview_table.setSortingEnabled(False)
+            self.preview_table.setRowCount(0)
+            self.populate_btn.setEnabled(False)
+            self.status_label.setText("Preparing batch...")
             
-            self.preview_table.resizeColumnsToContents()
-            self.preview_btn.setEnabled(True)
-            self.send_btn.setEnabled(True)
-            
-            QApplication.restoreOverrideCursor()
-            QMessageBox.information(self, "Batch Populated", f"Populated {len(self.current_batch)} cases for review.")
+            self.prepare_worker = BatchPrepareWorker(job)
+            self.prepare_worker.email_ready.connect(self.on_batch_email_ready)
+            self.prepare_worker.finished.connect(self.on_batch_prepared)
+            self.prepare_worker.error.connect(self.on_batch_prepare_error)
+            self.prepare_worker.start()
             
         except Exception as e:
             QApplication.restoreOverrideCursor()
             QMessageBox.critical(self, "Error", f"Failed to populate batch: {str(e)}")
     
+    def get_batch_job(self):
+        """Return a callable(on_email) preparing the selected batch, or None for inline modes"""
+        limit = self.limit_spin.value() if self.limit_spin.value() > 0 else None
+        service = self.bulk_service
+        
+        category = None
+        subcategory = None
+        by_priority = self.by_priority_radio.isChecked()
+        if self.by_category_radio.isChecked():
+            category = {
+                "Critical (90+ days no response)": "critical",
+                "High Priority (60+ days no response)": "high_priority",
+                "No Response (30+ days no response)": "no_response",
+                "Recently Sent (<30 days)": "recently_sent",
+                "Never Contacted": "never_contacted",
+                "Missing DOI": "missing_doi",
+                "CCP 335.1 (>2yr Statute Inquiry)": "ccp_335_1"
+            }.get(self.selection_combo.currentText())
+        elif self.by_firm_radio.isChecked():
+            category = "by_firm"
+            subcategory = self.selection_combo.currentText()
+        elif self.by_priority_radio.isChecked():
+            category = {
+                "Critical (90+ days no response)": "critical",
+                "High Priority (60+ days no response)": "high_priority",
+                "No Response (30+ days no response)": "no_response"
+            }.get(self.selection_combo.currentText())
+        elif self.custom_selection_radio.isChecked():
+            numbers = [n.strip() for n in self.custom_input.toPlainText().replace(',', '\n').split('\n') if n.strip()]
+            return lambda on_email: service.prepare_batch_from_numbers(numbers, on_email=on_email)
+        
+        if category is None:
+            return None
+        
+        def prepare(on_email):
+            # Ensure cases have been categorized at least once
+            if not service.categorized_cases:
+                service.categorize_cases()
+            return service.prepare_batch(category, subcategory=subcategory, limit=limit, on_email=on_email,
+                                         by_priority=by_priority)
+        return prepare
+    
+    def on_batch_email_ready(self, email):
+        """Show a prepared email as soon as the worker hands it over"""
+        self.current_batch.append(email)
+        self.add_preview_row(email)
+        self.status_label.setText(f"Preparing batch... {len(self.current_batch)} emails ready")
+    
+    def on_batch_prepared(self, emails):
+        """Put the streamed rows in batch order once everything is ready"""
+        self.populate_btn.setEnabled(True)
+        if [e.get('pv') for e in emails] != [e.get('pv') for e in self.current_batch]:
+            self.fill_preview(emails)
+        if self.custom_selection_radio.isChecked():
+            self.log_number_report()
+        self.finish_populate()
+    
+    def log_number_report(self):
+        """Summarize how the pasted PV/CMS numbers resolved"""
+        report = getattr(self.bulk_service, 'last_number_report', None) if self.bulk_service else None
+        if not report or not self.parent_window:
+            return
+        
+        lines = [f"Resolved pasted numbers in {report.get('elapsed_ms', 0)} ms: "
+                 f"{len(report['found'])} found, {len(report['already_sent'])} already sent, "
+                 f"{len(report['not_found'])} not found, {len(report['ambiguous'])} ambiguous"]
+        if report['not_found']:
+            lines.append(f"  Not found: {', '.join(report['not_found'][:20])}")
+        for item in report['ambiguous'][:20]:
+            lines.append(f"  Ambiguous: {item['input']} matches PVs {', '.join(item['pvs'])}")
+        for line in lines:
+            self.parent_window.log_activity(line)
+    
+    def on_batch_prepare_error(self, error):
+        """Report a failed batch preparation"""
+        self.populate_btn.setEnabled(True)
+        self.preview_table.setSortingEnabled(True)
+        self.status_label.setText("Batch preparation failed")
+        QMessageBox.critical(self, "Error", f"Failed to populate batch: {error}")
+    
+    def fill_preview(self, emails):
+        """Replace the preview table with the given emails"""
+        self.current_batch = list(emails or [])
+        self.preview_table.setSortingEnabled(False)
+        self.preview_table.setRowCount(0)
+        for email in self.current_batch:
+            self.add_preview_row(email)
+    
+    def finish_populate(self):
+        """Enable the batch actions once the preview is complete"""
+        self.preview_table.setSortingEnabled(True)
+        
+        if not self.current_batch:
+            self.status_label.setText("No cases found")
+            QMessageBox.warning(self, "No Cases", "No cases found for the selected criteria.")
+            return
+        
+        self.preview_table.resizeColumnsToContents()
+        self.preview_btn.setEnabled(True)
+        self.send_btn.setEnabled(True)
+        self.schedule_btn.setEnabled(True)
+        self.status_label.setText(f"Populated {len(self.current_batch)} cases for review")
+        QMessageBox.information(self, "Batch Populated", f"Populated {len(self.current_batch)} cases for review.")
+    
+    def add_preview_row(self, email):
+        """Append one email to the preview table"""
+        row = self.preview_table.rowCount()
+        self.preview_table.insertRow(row)
+        
+        pv = str(email.get('pv', ''))
+        
+        # PV #
+        self.preview_table.setItem(row, 0, QTableWidgetItem(pv))
+        
+        # Name
+        self.preview_table.setItem(row, 1, QTableWidgetItem(str(email.get('name', ''))))
+        
+        # Balance - format as currency
+        balance = email.get('case_data', {}).get('Balance', 0.0) if 'case_data' in email else 0.0
+        if not balance:
+            # Try to get from case manager
+            case = self.case_manager.get_case_by_pv(pv)
+            if case:
+                balance = case.get('Balance', 0.0)
+        balance_item = QTableWidgetItem(f"${balance:,.2f}")
+        balance_item.setData(Qt.UserRole, balance)  # Store raw value for sorting
+        self.preview_table.setItem(row, 2, balance_item)
+        
+        # Law Firm
+        self.preview_table.setItem(row, 3, QTableWidgetItem(str(email.get('law_firm', ''))))
+        
+        # Email - show TEST MODE clearly
+        email_to = str(email.get('to', ''))
+        email_item = QTableWidgetItem(email_to)
+        if self.bulk_service.test_mode:
+            email_item.setBackground(QColor(255, 255, 0))  # Yellow background
+            email_item.setForeground(QColor(255, 0, 0))  # Red text
+            email_item.setToolTip(f"TEST MODE: Actually sending to {email_to}\nOriginal: {email.get('original_to', 'N/A')}")
+        self.preview_table.setItem(row, 4, email_item)
+        
+        # Status
+        status = email.get('case_data', {}).get('status', '') if 'case_data' in email else ''
+        self.preview_table.setItem(row, 5, QTableWidgetItem(str(status)))
+        
+        # Acknowledgment status
+        ack_info = self.ack_service.get_acknowledgment_info(pv)
+        if ack_info:
+            ack_text = f"✅ {ack_info.get('reason', 'Acknowledged')[:15]}..."
+            ack_item = QTableWidgetItem(ack_text)
+            ack_item.setForeground(QColor(0, 200, 0))
+            self.preview_table.setItem(row, 6, ack_item)
+        else:
+            self.preview_table.setItem(row, 6, QTableWidgetItem(""))
+        
+        # Actions button
+        action_btn = QPushButton("Actions")
+        action_menu = QMenu()
+        
+        # Add summarize, draft follow-up, and draft status request options
+        case_data = email.get('case_data', {})
+        
+        # Summarize option
+        summarize_action = action_menu.addAction("📊 Summarize")
+        summarize_action.triggered.connect(lambda checked, cd=case_data: self.summarize_case_from_bulk(cd))
+        
+        # Draft follow-up option
+        draft_followup_action = action_menu.addAction("📧 Draft Follow-up")
+        draft_followup_action.triggered.connect(lambda checked, cd=case_data: self.draft_followup_from_bulk(cd))
+        
+        # Draft status request option
+        draft_status_action = action_menu.addAction("📋 Draft Status Request")
+        draft_status_action.triggered.connect(lambda checked, cd=case_data: self.draft_status_request_from_bulk(cd))
+        
+        action_menu.addSeparator()
+        
+        if ack_info:
+            unack_action = action_menu.addAction("❌ Remove Acknowledgment")
+            unack_action.triggered.connect(lambda checked, p=pv: self.unacknowledge_case(p))
+        else:
+            ack_action = action_menu.addAction("✅ Acknowledge Case")
+            ack_action.triggered.connect(lambda checked, p=pv, n=email.get('name', ''), s=status: 
+                                       self.acknowledge_case(p, n, s))
+        
+        action_btn.setMenu(action_menu)
+        self.preview_table.setCellWidget(row, 7, action_btn)
+        
+        # Checkbox for selection (now in column 8)
+        checkbox = QCheckBox()
+        # Don't auto-check acknowledged cases
+        checkbox.setChecked(not bool(ack_info))
+        self.preview_table.setCellWidget(row, 8, checkbox)
+
     def preview_batch(self):
         """Preview selected emails from the batch"""
         try:
@@ -1622,7 +1817,7 @@ class BulkEmailWidget(QWidget):
                     "No Response (30+ days no response)": "no_response"
                 }
                 priority = priority_map.get(self.selection_combo.currentText())
-                return self.bulk_service.prepare_batch(priority, limit=limit)
+                return self.bulk_service.prepare_batch(priority, limit=limit, by_priority=True)
                 
             elif self.by_balance_radio.isChecked():
                 # Get balance selection
@@ -1704,130 +1899,245 @@ class BulkEmailWidget(QWidget):
                 self.parent_window.log_activity(f"Error getting batch: {str(e)}")
             return []
     
-    def send_batch(self):
-        """Send the selected emails with progress tracking"""
+    def get_checked_emails(self):
+        """Emails whose preview row is checked (warns and returns [] when there are none)"""
+        if not hasattr(self, 'current_batch') or not self.current_batch:
+            QMessageBox.warning(self, "No Batch", "Please populate a batch first.")
+            return []
+        
+        selected_emails = []
+        for row in range(self.preview_table.rowCount()):
+            checkbox = self.preview_table.cellWidget(row, 8)  # Updated column
+            if checkbox and checkbox.isChecked():
+                # Use the full email data from current_batch
+                selected_emails.append(self.current_batch[row])
+        
+        if not selected_emails:
+            QMessageBox.warning(self, "No Selection", "No emails selected for sending.")
+        return selected_emails
+    
+    def clear_preview(self):
+        """Reset the preview once its emails were sent or scheduled"""
+        self.preview_table.setRowCount(0)
+        self.current_batch = []
+        self.send_btn.setEnabled(False)
+        self.schedule_btn.setEnabled(False)
+        self.preview_btn.setEnabled(False)
+    
+    def schedule_batch(self):
+        """Queue the selected emails for each firm's business hours"""
         try:
-            if not hasattr(self, 'current_batch') or not self.current_batch:
-                QMessageBox.warning(self, "No Batch", "Please populate a batch first.")
+            selected_emails = self.get_checked_emails()
+            if not selected_emails:
                 return
             
-            # Get selected emails from preview
-            selected_emails = []
-            for row in range(self.preview_table.rowCount()):
-                checkbox = self.preview_table.cellWidget(row, 8)  # Updated column
-                if checkbox and checkbox.isChecked():
-                    # Use the full email data from current_batch
-                    selected_emails.append(self.current_batch[row])
+            reply = QMessageBox.question(
+                self, "Confirm Schedule",
+                f"Schedule {len(selected_emails)} emails for business hours?\n"
+                f"Mode: {'TEST' if self.bulk_service.test_mode else 'PRODUCTION'}\n\n"
+                f"Emails go out while the app is open; missed slots are re-planned on the next start.",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+            
+            result = self.bulk_service.schedule_batch(
+                selected_emails, digest=self.digest_mode_check.isChecked()
+            )
+            
+            msg = f"🕘 Scheduled {result['queued']} emails\n"
+            if result["first_send"]:
+                msg += (f"\nFirst send: {result['first_send']:%a %m/%d %I:%M %p}"
+                        f"\nLast send: {result['last_send']:%a %m/%d %I:%M %p}\n")
+            if result["skipped"]:
+                msg += f"\n⏭️ Skipped (already sent today): {len(result['skipped'])}\n"
+            for tz_name, count in sorted(result["timezones"].items()):
+                msg += f"\n  • {tz_name}: {count}"
+            
+            if self.parent_window:
+                self.parent_window.log_activity(f"🕘 Scheduled {result['queued']} emails for business hours")
+                if hasattr(self.parent_window, 'start_scheduled_sender'):
+                    self.parent_window.start_scheduled_sender()
             
+            QMessageBox.information(self, "Batch Scheduled", msg)
+            self.clear_preview()
+            self.update_outbox_status()
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to schedule batch: {str(e)}")
+    
+    def send_batch(self):
+        """Send the selected emails with progress tracking"""
+        try:
+            selected_emails = self.get_checked_emails()
             if not selected_emails:
-                QMessageBox.warning(self, "No Selection", "No emails selected for sending.")
                 return
             
             # Confirm sending
+            count_text = f"{len(selected_emails)} emails"
+            if self.digest_mode_check.isChecked():
+                digests = self.bulk_service.build_firm_digests(selected_emails)
+                count_text = f"{len(selected_emails)} cases as {len(digests)} emails (one per firm)"
             reply = QMessageBox.question(
                 self, "Confirm Send",
-                f"Send {len(selected_emails)} emails?\n"
+                f"Send {count_text}?\n"
                 f"Mode: {'TEST' if self.bulk_service.test_mode else 'PRODUCTION'}",
                 QMessageBox.Yes | QMessageBox.No
             )
             
             if reply == QMessageBox.Yes:
-                # Create progress dialog
-                progress_dialog = QProgressDialog(
-                    "Sending emails...", "Cancel", 0, len(selected_emails), self
-                )
-                progress_dialog.setWindowTitle("Bulk Email Progress")
-                progress_dialog.setWindowModality(Qt.WindowModal)
-                progress_dialog.setMinimumDuration(0)
-                progress_dialog.setValue(0)
-                
-                # Update status
-                self.status_label.setText(f"Starting to send {len(selected_emails)} emails...")
-                
                 # Log start of batch to main activity log
                 if self.parent_window:
                     self.parent_window.log_activity(f"📤 Starting bulk email batch: {len(selected_emails)} emails")
                 
-                # Process emails with progress updates
-                sent_emails = []
-                failed_emails = []
-                
-                for i, email_data in enumerate(selected_emails):
-                    if progress_dialog.wasCanceled():
-                        if self.parent_window:
-                            self.parent_window.log_activity("⚠️ Processing cancelled by user")
-                        break
-                    
-                    # Update progress
-                    pv = email_data.get('pv', 'Unknown')
-                    name = email_data.get('name', 'Unknown')
-                    progress_dialog.setLabelText(f"Sending email {i+1}/{len(selected_emails)}\nPV: {pv} - {name}")
-                    progress_dialog.setValue(i)
-                    
-                    # Process email
-                    try:
-                        # Send individual email
-                        result = self.bulk_service.send_batch([email_data])
-                        if result['sent']:
-                            sent_emails.extend(result['sent'])
-                            # Log successful send to main activity log
-                            if self.parent_window:
-                                self.parent_window.log_activity(f"✅ Sent email for PV {pv} - {name}")
-                        else:
-                            failed_emails.extend(result['failed'])
-                            # Log failed send to main activity log
-                            if self.parent_window:
-                                self.parent_window.log_activity(f"❌ Failed to send for PV {pv} - {name}")
-                    except Exception as e:
-                        failed_emails.append({'pv': pv, 'error': str(e)})
-                        if self.parent_window:
-                            self.parent_window.log_activity(f"❌ Error sending email for PV {pv}: {str(e)}")
-                    
-                    # Update status label with progress
-                    self.status_label.setText(f"Processing: {i+1}/{len(selected_emails)} | Sent: {len(sent_emails)} | Failed: {len(failed_emails)}")
-                    QApplication.processEvents()
-                
-                progress_dialog.setValue(len(selected_emails))
-                progress_dialog.close()
-                
-                # Log completion to main activity log
-                self.status_label.setText(f"Batch complete: {len(sent_emails)} sent, {len(failed_emails)} failed")
-                if self.parent_window:
-                    self.parent_window.log_activity(f"📊 Batch complete: {len(sent_emails)} sent, {len(failed_emails)} failed")
-                
-                # Show detailed results
-                result_msg = f"Batch Processing Complete!\n\n"
-                result_msg += f"✅ Successfully Sent: {len(sent_emails)} emails\n"
-                result_msg += f"❌ Failed: {len(failed_emails)} emails\n\n"
-                
-                if failed_emails:
-                    result_msg += "Failed emails:\n"
-                    for fail in failed_emails[:5]:  # Show first 5 failures
-                        result_msg += f"  • PV {fail.get('pv', 'Unknown')}: {fail.get('error', 'Unknown error')}\n"
-                    if len(failed_emails) > 5:
-                        result_msg += f"  ... and {len(failed_emails) - 5} more\n"
-                
-                QMessageBox.information(self, "Batch Complete", result_msg)
-                
-                # Clear preview and reset batch
-                self.preview_table.setRowCount(0)
-                self.current_batch = []
-                self.send_btn.setEnabled(False)
-                self.preview_btn.setEnabled(False)
-                
-                # Update statistics and CMS card
-                self.update_statistics()
-                
-                # Update the CMS card to reflect new pending notes
-                if hasattr(self.parent_window, 'update_cms_card'):
-                    self.parent_window.update_cms_card()
-                    self.parent_window.log_activity(f"Added {len(sent_emails)} emails to CMS notes queue")
+                self.start_outbox_worker(selected_emails)
                 
         except Exception as e:
-            if 'progress_dialog' in locals():
-                progress_dialog.close()
             QMessageBox.critical(self, "Error", f"Failed to send batch: {str(e)}")
     
+    def resume_outbox(self):
+        """Finish sending emails left in the outbox by an interrupted batch"""
+        if self.parent_window:
+            self.parent_window.log_activity("📤 Resuming queued outbox emails")
+        self.start_outbox_worker(None)
+    
+    def start_outbox_worker(self, emails):
+        """Send a batch (or drain the outbox when emails is None) in a background worker"""
+        if getattr(self, 'send_worker', None) and self.send_worker.isRunning():
+            QMessageBox.information(self, "Sending", "A batch is already being sent.")
+            return
+        
+        total = len(emails) if emails is not None else self.bulk_service.outbox.pending_count(scheduled=False)
+        progress_dialog = QProgressDialog(f"Sending {total} emails...", "Stop", 0, 100, self)
+        progress_dialog.setWindowTitle("Bulk Email Progress")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setValue(0)
+        
+        self.status_label.setText(f"Starting to send {total} emails...")
+        self.send_btn.setEnabled(False)
+        self.resume_outbox_btn.setEnabled(False)
+        
+        digest = emails is not None and self.digest_mode_check.isChecked()
+        self.send_worker = OutboxSenderWorker(self.bulk_service, emails, digest=digest)
+        self.send_worker.progress_update.connect(
+            lambda pct, msg: (progress_dialog.setValue(pct), progress_dialog.setLabelText(msg), self.status_label.setText(msg))
+        )
+        if self.parent_window:
+            self.send_worker.log_message.connect(self.parent_window.log_activity)
+        self.send_worker.metrics_update.connect(self.update_throughput)
+        self.send_worker.finished.connect(lambda results: self.on_send_finished(results, progress_dialog))
+        self.send_worker.error.connect(lambda err: self.on_send_error(err, progress_dialog))
+        progress_dialog.canceled.connect(self.send_worker.stop)
+        self.send_worker.start()
+        if hasattr(self.parent_window, 'start_background_cms_consumer'):
+            self.parent_window.start_background_cms_consumer(auto=True)
+    
+    def on_send_finished(self, results, progress_dialog):
+        """Show batch results and reset the preview"""
+        progress_dialog.close()
+        sent_emails = results.get('sent', [])
+        failed_emails = results.get('failed', [])
+        skipped = results.get('skipped', [])
+        
+        # Log completion to main activity log
+        self.status_label.setText(f"Batch complete: {len(sent_emails)} sent, {len(failed_emails)} failed")
+        if self.parent_window:
+            self.parent_window.log_activity(f"📊 Batch complete: {len(sent_emails)} sent, {len(failed_emails)} failed")
+        
+        # Show detailed results
+        result_msg = f"Batch Processing Complete!\n\n"
+        result_msg += f"✅ Successfully Sent: {len(sent_emails)} emails\n"
+        if results.get('total_cases', 0) > results.get('total', 0):
+            result_msg += f"📑 Digest mode: {results['total_cases']} cases in {results['total']} emails\n"
+        result_msg += f"❌ Failed: {len(failed_emails)} emails\n"
+        if skipped:
+            result_msg += f"⏭️ Skipped (already sent today): {len(skipped)} emails\n"
+        if results.get('retrying'):
+            result_msg += f"🔁 Waiting to retry: {results['retrying']} emails\n"
+        if results.get('daily_limit_reached'):
+            result_msg += "\n⏸️ Daily send limit reached - remaining emails stay queued in the outbox\n"
+        elif results.get('stopped'):
+            result_msg += "\n⚠️ Stopped early - remaining emails stay queued in the outbox\n"
+        if results.get('metrics'):
+            result_msg += f"📈 Average rate: {results['metrics'].get('average_per_minute', 0)} emails/min\n"
+        result_msg += "\n"
+        
+        if failed_emails:
+            result_msg += "Failed emails:\n"
+            for fail in failed_emails[:5]:  # Show first 5 failures
+                result_msg += f"  • PV {fail.get('pv', 'Unknown')}: {fail.get('error', 'Unknown error')}\n"
+            if len(failed_emails) > 5:
+                result_msg += f"  ... and {len(failed_emails) - 5} more\n"
+        
+        QMessageBox.information(self, "Batch Complete", result_msg)
+        
+        # Clear preview and reset batch
+        self.clear_preview()
+        
+        # Update statistics and CMS card
+        self.update_statistics()
+        self.update_outbox_status()
+        
+        # Update the CMS card to reflect new pending notes
+        if hasattr(self.parent_window, 'update_cms_card'):
+            self.parent_window.update_cms_card()
+            self.parent_window.log_activity(f"Added {len(sent_emails)} emails to CMS notes queue")
+    
+    def on_send_error(self, error, progress_dialog):
+        """Report a batch that failed outside of individual sends"""
+        progress_dialog.close()
+        self.update_outbox_status()
+        QMessageBox.critical(self, "Error", f"Failed to send batch: {error}\n\nUnsent emails remain queued in the outbox.")
+    
+    def on_digest_mode_changed(self):
+        """Remember whether batches go out as one digest per firm"""
+        if self.parent_window and hasattr(self.parent_window, 'settings'):
+            self.parent_window.settings.setValue("bulk_firm_digest", self.digest_mode_check.isChecked())
+    
+    def on_rate_limits_changed(self):
+        """Apply new send ceilings right away and remember them"""
+        per_minute = self.rate_per_minute_spin.value()
+        per_day = self.rate_per_day_spin.value()
+        self.bulk_service.set_rate_limits(per_minute=per_minute, per_day=per_day)
+        if self.parent_window and hasattr(self.parent_window, 'settings'):
+            self.parent_window.settings.setValue("send_rate_per_minute", per_minute)
+            self.parent_window.settings.setValue("send_rate_per_day", per_day)
+    
+    def update_throughput(self, metrics):
+        """Show live send metrics"""
+        eta = metrics.get('eta_seconds')
+        eta_text = f"{eta // 60}m {eta % 60}s" if eta is not None else "--"
+        self.throughput_label.setText(
+            f"📈 {metrics.get('per_minute', 0)}/min | "
+            f"Sent {metrics.get('sent', 0)}/{metrics.get('total', 0)} | "
+            f"Failed {metrics.get('failed', 0)} | "
+            f"Bookkeeping backlog {metrics.get('bookkeeping_backlog', 0)} | "
+            f"ETA {eta_text} | "
+            f"Left today {metrics.get('daily_remaining', '--')}"
+        )
+    
+    def update_outbox_status(self):
+        """Offer to resume when an earlier batch left emails in the outbox"""
+        try:
+            pending = self.bulk_service.outbox.pending_count(scheduled=False)
+            scheduled = self.bulk_service.outbox.scheduled_summary()
+        except Exception as e:
+            logger.error(f"Error reading outbox: {e}")
+            pending = 0
+            scheduled = {"pending": 0}
+        self.resume_outbox_btn.setText(f"▶️ Resume Outbox ({pending})")
+        self.resume_outbox_btn.setVisible(pending > 0)
+        self.resume_outbox_btn.setEnabled(pending > 0)
+        
+        if scheduled["pending"]:
+            self.schedule_status_label.setText(
+                f"🕘 {scheduled['pending']} scheduled - next {scheduled['next_send']:%a %I:%M %p}, "
+                f"last {scheduled['last_send']:%a %m/%d %I:%M %p}"
+            )
+        else:
+            self.schedule_status_label.setText("")
+    
     def export_batch(self):
         """Export batch to Excel"""
         try:
@@ -2039,15 +2349,23 @@ class AcknowledgedCasesWidget(QWidget):
         
         layout.addLayout(toolbar_layout)
         
-        # Table for acknowledged cases
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "PV#", "Name", "DOI", "Law Firm", "Status", 
-            "Acknowledged Date", "Reason", "Actions"
-        ])
+        # Table for acknowledged cases - actions live in the context menu
+        self.model = DictTableModel([
+            ("PV#", "PV"), ("Name", "Name"), ("DOI", "DOI"), ("Law Firm", "Law Firm"),
+            ("Status", "Status"), ("Acknowledged Date", "ack_date"), ("Reason", "reason")
+        ], self)
+        self.proxy = CaseFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_context_menu)
+        self.table.doubleClicked.connect(lambda index: self.view_case(self.proxy.row_data(index.row()).get('PV')))
         layout.addWidget(self.table)
         
         # Summary text area
@@ -2066,71 +2384,18 @@ class AcknowledgedCasesWidget(QWidget):
             # Get all acknowledged cases
             all_ack = self.ack_service.get_all_acknowledged()
             
-            # Clear table
-            self.table.setRowCount(0)
+            # Look up every acknowledged case in one pass
+            case_rows = {str(case.get('PV', '')).strip(): case
+                         for case in self.case_manager.get_cases_by_pvs(list(all_ack.keys()))}
             
-            # Populate table with acknowledged cases
+            rows = []
             for pv, info in all_ack.items():
-                # Get case details from case manager
-                case_data = self.get_case_details(pv)
+                case_data = case_rows.get(str(pv).strip())
                 if not case_data:
                     continue
-                
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                
-                # PV#
-                self.table.setItem(row, 0, QTableWidgetItem(str(pv)))
-                
-                # Name
-                self.table.setItem(row, 1, QTableWidgetItem(case_data.get('Name', '')))
-                
-                # DOI
-                doi = case_data.get('DOI', '')
-                if hasattr(doi, 'strftime'):
-                    doi = doi.strftime("%m/%d/%Y")
-                self.table.setItem(row, 2, QTableWidgetItem(str(doi)))
-                
-                # Law Firm
-                self.table.setItem(row, 3, QTableWidgetItem(case_data.get('Law Firm', '')))
-                
-                # Status
-                self.table.setItem(row, 4, QTableWidgetItem(case_data.get('Status', '')))
-                
-                # Acknowledged Date
-                ack_date = info.get('acknowledged_date', '')
-                self.table.setItem(row, 5, QTableWidgetItem(ack_date))
-                
-                # Reason
-                reason = info.get('reason', '')
-                self.table.setItem(row, 6, QTableWidgetItem(reason))
-                
-                # Actions
-                action_widget = QWidget()
-                action_layout = QHBoxLayout()
-                action_layout.setContentsMargins(2, 2, 2, 2)
-                
-                # View button
-                view_btn = QPushButton("👁️")
-                view_btn.setToolTip("View case details")
-                view_btn.clicked.connect(lambda checked, p=pv: self.view_case(p))
-                action_layout.addWidget(view_btn)
-                
-                # Unacknowledge button
-                unack_btn = QPushButton("❌")
-                unack_btn.setToolTip("Remove acknowledgment")
-                unack_btn.clicked.connect(lambda checked, p=pv: self.unacknowledge_case(p))
-                action_layout.addWidget(unack_btn)
-                
-                # Email button
-                email_btn = QPushButton("📧")
-                email_btn.setToolTip("Draft email")
-                email_btn.clicked.connect(lambda checked, cd=case_data: self.draft_email(cd))
-                action_layout.addWidget(email_btn)
-                
-                action_widget.setLayout(action_layout)
-                self.table.setCellWidget(row, 7, action_widget)
+                rows.append(self._build_row(pv, case_data, info.get('acknowledged_date', ''), info.get('reason', '')))
             
+            self.model.set_rows(rows)
             self.table.resizeColumnsToContents()
             
             # Update stats
@@ -2147,68 +2412,25 @@ class AcknowledgedCasesWidget(QWidget):
             QApplication.restoreOverrideCursor()
             QMessageBox.critical(self, "Error", f"Failed to load acknowledged cases: {str(e)}")
     
+    def _build_row(self, pv, case_data, ack_date, reason):
+        """Row dict for the acknowledged table"""
+        row = dict(case_data)
+        doi = row.get('DOI', '')
+        if hasattr(doi, 'strftime'):
+            row['DOI'] = doi.strftime("%m/%d/%Y")
+        row['PV'] = str(pv)
+        row['ack_date'] = ack_date
+        row['reason'] = reason
+        return row
+    
     def add_acknowledged_case(self, pv, case_data, acknowledgment_data):
         """Add a newly acknowledged case to the display without refreshing"""
         try:
-            # Add to the table
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            # PV#
-            self.table.setItem(row, 0, QTableWidgetItem(str(pv)))
-            
-            # Name
-            self.table.setItem(row, 1, QTableWidgetItem(case_data.get('Name', '')))
-            
-            # DOI
-            doi = case_data.get('DOI', '')
-            if hasattr(doi, 'strftime'):
-                doi = doi.strftime("%m/%d/%Y")
-            self.table.setItem(row, 2, QTableWidgetItem(str(doi)))
-            
-            # Law Firm
-            self.table.setItem(row, 3, QTableWidgetItem(case_data.get('Law Firm', '')))
-            
-            # Status
-            self.table.setItem(row, 4, QTableWidgetItem(case_data.get('Status', '')))
-            
-            # Acknowledged Date
-            from datetime import datetime
             ack_date = datetime.now().strftime("%m/%d/%Y")
-            self.table.setItem(row, 5, QTableWidgetItem(ack_date))
-            
-            # Reason
-            self.table.setItem(row, 6, QTableWidgetItem(acknowledgment_data.get('reason', '')))
-            
-            # Actions
-            action_widget = QWidget()
-            action_layout = QHBoxLayout()
-            action_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # View button
-            view_btn = QPushButton("👁️")
-            view_btn.setToolTip("View details")
-            view_btn.clicked.connect(lambda checked, p=pv: self.view_details(p))
-            action_layout.addWidget(view_btn)
-            
-            # Unacknowledge button
-            unack_btn = QPushButton("❌")
-            unack_btn.setToolTip("Remove acknowledgment")
-            unack_btn.clicked.connect(lambda checked, p=pv: self.unacknowledge_case(p))
-            action_layout.addWidget(unack_btn)
-            
-            # Email button
-            email_btn = QPushButton("📧")
-            email_btn.setToolTip("Draft email")
-            email_btn.clicked.connect(lambda checked, cd=case_data: self.draft_email(cd))
-            action_layout.addWidget(email_btn)
-            
-            action_widget.setLayout(action_layout)
-            self.table.setCellWidget(row, 7, action_widget)
+            self.model.append_row(self._build_row(pv, case_data, ack_date, acknowledgment_data.get('reason', '')))
             
             # Update stats
-            current_count = self.table.rowCount()
-            self.stats_label.setText(f"Total: {current_count} cases")
+            self.stats_label.setText(f"Total: {self.model.rowCount()} cases")
             
             # Sort table to show newest at top
             self.table.sortByColumn(5, Qt.DescendingOrder)
@@ -2216,6 +2438,23 @@ class AcknowledgedCasesWidget(QWidget):
         except Exception as e:
             print(f"Error adding acknowledged case to display: {e}")
     
+    def show_context_menu(self, pos):
+        """Actions menu for the acknowledged case under the cursor"""
+        index = self.table.indexAt(pos)
+        if not index.isValid():
+            return
+        
+        case_data = self.proxy.row_data(index.row())
+        if not case_data:
+            return
+        pv = case_data.get('PV')
+        
+        menu = QMenu(self)
+        menu.addAction("👁️ View Case").triggered.connect(lambda checked=False: self.view_case(pv))
+        menu.addAction("❌ Remove Acknowledgment").triggered.connect(lambda checked=False: self.unacknowledge_case(pv))
+        menu.addAction("📧 Draft Email").triggered.connect(lambda checked=False: self.draft_email(case_data))
+        menu.exec_(self.table.viewport().mapToGlobal(pos))
+    
     def get_case_details(self, pv):
         """Get case details from case manager"""
         try:
@@ -2231,26 +2470,20 @@ class AcknowledgedCasesWidget(QWidget):
         """Filter displayed cases based on search text"""
         search_text = self.filter_input.text().lower()
         
-        for row in range(self.table.rowCount()):
-            should_show = False
-            
-            if not search_text:
-                should_show = True
-            else:
-                # Check all columns for match
-                for col in range(self.table.columnCount() - 1):  # Skip actions column
-                    item = self.table.item(row, col)
-                    if item and search_text in item.text().lower():
-                        should_show = True
-                        break
-            
-            self.table.setRowHidden(row, not should_show)
+        if not search_text:
+            self.proxy.set_predicate("text", None)
+            return
+        
+        keys = [key for _, key, _ in self.model.columns]
+        self.proxy.set_predicate(
+            "text", lambda row: any(search_text in str(row.get(key, '')).lower() for key in keys)
+        )
     
     def view_case(self, pv):
         """View case details in main tab"""
         if self.parent_window:
-            # Switch to Cases tab (index 1)
-            self.parent_window.tabs.setCurrentIndex(1)
+            # Switch to Cases tab
+            self.parent_window.show_tab('case_tab')
             
             # Load case
             self.parent_window.case_search_input.setText(str(pv))
@@ -2260,15 +2493,10 @@ class AcknowledgedCasesWidget(QWidget):
         """Remove a case from the acknowledged display instantly"""
         try:
             # Find and remove the row with this PV
-            for row in range(self.table.rowCount()):
-                item = self.table.item(row, 0)  # PV# is in column 0
-                if item and item.text() == str(pv):
-                    self.table.removeRow(row)
-                    break
+            self.model.remove_rows(lambda row: str(row.get('PV')) == str(pv))
             
             # Update stats
-            current_count = self.table.rowCount()
-            self.stats_label.setText(f"Total: {current_count} cases")
+            self.stats_label.setText(f"Total: {self.model.rowCount()} cases")
             
         except Exception as e:
             print(f"Error removing case from acknowledged display: {e}")
@@ -2374,18 +2602,12 @@ class AcknowledgedCasesWidget(QWidget):
                     writer = csv.writer(csvfile)
                     
                     # Write headers
-                    headers = []
-                    for col in range(self.table.columnCount() - 1):  # Skip actions column
-                        headers.append(self.table.horizontalHeaderItem(col).text())
-                    writer.writerow(headers)
+                    writer.writerow([header for header, _, _ in self.model.columns])
                     
-                    # Write data
-                    for row in range(self.table.rowCount()):
-                        row_data = []
-                        for col in range(self.table.columnCount() - 1):
-                            item = self.table.item(row, col)
-                            row_data.append(item.text() if item else '')
-                        writer.writerow(row_data)
+                    # Write the rows currently shown (respects the filter and sort)
+                    for row in range(self.proxy.rowCount()):
+                        writer.writerow([self.proxy.index(row, col).data() or ''
+                                         for col in range(self.proxy.columnCount())])
                 
                 QMessageBox.information(self, "Success", f"Data exported to {filepath}")
                 
@@ -2420,12 +2642,104 @@ class EnhancedMainWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
+        self.startup_started = time.perf_counter()
+        self.startup_timings = []  # (step, seconds, built on demand)
         self.settings = QSettings("Prohealth", "AIAssistantEnhanced")
         self.dark_mode = False
-        self.init_services()
-        self.init_ui()
+        self.timed_startup_step("Core services", self.init_services)
+        self.timed_startup_step("Main window", self.init_ui)
         self.load_settings()
         self.apply_theme()
+        
+        # Fires once the event loop has painted the first window
+        QTimer.singleShot(0, self.report_startup_timings)
+        
+        # Pick up scheduled emails left from a previous session
+        self.scheduled_sender = None
+        QTimer.singleShot(2000, self.start_scheduled_sender)
+        self.cms_consumer = None
+    
+    def timed_startup_step(self, step, func, on_demand=False):
+        """Run one construction step and record how long it took"""
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        self.startup_timings.append((step, elapsed, on_demand))
+        logger.info(f"{'Built' if on_demand else 'Startup'} {step}: {elapsed * 1000:.0f} ms")
+        return result
+    
+    def report_startup_timings(self):
+        """Log how long the window took to appear and what each step contributed"""
+        total = time.perf_counter() - self.startup_started
+        lines = [f"Window shown after {total * 1000:.0f} ms"]
+        for step, elapsed, on_demand in self.startup_timings:
+            if not on_demand:
+                lines.append(f"  {step}: {elapsed * 1000:.0f} ms")
+        lines.append(f"  Deferred tabs: {', '.join(label for _, label, _, _ in self.lazy_tabs.values()) or 'none'}")
+        
+        for line in lines:
+            logger.info(line)
+        self.log_activity(f"⏱️ Startup: window shown in {total:.2f}s ({len(self.lazy_tabs)} tabs deferred)")
+    
+    def add_lazy_tab(self, attr, label, factory, on_built=None):
+        """Add a placeholder tab that is replaced by factory() on first activation"""
+        placeholder = QWidget()
+        placeholder_layout = QVBoxLayout(placeholder)
+        loading_label = QLabel(f"Loading {label}...")
+        loading_label.setAlignment(Qt.AlignCenter)
+        placeholder_layout.addWidget(loading_label)
+        
+        self.tabs.addTab(placeholder, label)
+        self.lazy_tabs[attr] = (placeholder, label, factory, on_built)
+    
+    def ensure_tab(self, attr):
+        """Build a deferred tab now if needed and return it (None if the tab does not exist)"""
+        if attr not in self.lazy_tabs:
+            return getattr(self, attr, None)
+        
+        placeholder, label, factory, on_built = self.lazy_tabs.pop(attr)
+        index = self.tabs.indexOf(placeholder)
+        was_current = self.tabs.currentIndex() == index
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            widget = self.timed_startup_step(f"{label} tab", factory, on_demand=True)
+            setattr(self, attr, widget)
+            
+            # Swap the placeholder out without re-triggering on_tab_changed
+            self.tabs.blockSignals(True)
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, label)
+            if was_current:
+                self.tabs.setCurrentIndex(index)
+            self.tabs.blockSignals(False)
+            placeholder.deleteLater()
+            
+            if on_built:
+                on_built()
+        except Exception as e:
+            logger.error(f"Error building {label} tab: {e}")
+            self.lazy_tabs[attr] = (placeholder, label, factory, on_built)
+            QMessageBox.critical(self, "Error", f"Failed to open {label}: {str(e)}")
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        return getattr(self, attr, None)
+    
+    def show_tab(self, attr):
+        """Build (if needed) and switch to a tab"""
+        widget = self.ensure_tab(attr)
+        if widget is not None:
+            self.tabs.setCurrentWidget(widget)
+        return widget
+    
+    def on_tab_changed(self, index):
+        """Build a deferred tab when its placeholder is opened"""
+        current = self.tabs.widget(index)
+        for attr, (placeholder, _, _, _) in list(self.lazy_tabs.items()):
+            if placeholder is current:
+                self.ensure_tab(attr)
+                break
     
     def init_services(self):
         """Initialize backend services"""
@@ -2508,6 +2822,9 @@ class EnhancedMainWindow(QMainWindow):
             else:
                 self.bulk_email_service = None
             
+            # Propagate spreadsheet reloads to dependent caches and tables
+            self.case_manager.add_change_listener(self.on_cases_changed)
+            
         except Exception as e:
             QMessageBox.critical(None, "Initialization Error", 
                                f"Failed to initialize core services: {str(e)}\n\n"
@@ -2540,39 +2857,25 @@ class EnhancedMainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.tabs.setTabPosition(QTabWidget.North)
         
-        # Dashboard tab
-        self.dashboard_tab = self.create_dashboard_tab()
+        # Dashboard is the first thing shown, so it is the only tab built up front.
+        # Every other tab gets a placeholder and is built the first time it is opened.
+        self.dashboard_tab = self.timed_startup_step("Dashboard tab", self.create_dashboard_tab)
         self.tabs.addTab(self.dashboard_tab, "📊 Dashboard")
         
-        # Case Management tab
-        self.case_tab = self.create_case_management_tab()
-        self.tabs.addTab(self.case_tab, "📁 Cases")
-        
-        # Email Analysis tab
-        self.email_tab = self.create_email_analysis_tab()
-        self.tabs.addTab(self.email_tab, "📧 Email Analysis")
-        
-        # Categories tab - use enhanced tracker if available, otherwise standard
-        tracker_to_use = self.collections_tracker
-        self.categories_tab = CategoriesWidget(tracker_to_use, self.case_manager, self)
-        self.tabs.addTab(self.categories_tab, "📂 Categories")
-        
-        # Acknowledged Cases tab
-        self.acknowledged_cases_tab = AcknowledgedCasesWidget(self.case_manager, self)
-        self.tabs.addTab(self.acknowledged_cases_tab, "✅ Acknowledged")
-        
-        # Bulk Email tab
+        self.lazy_tabs = {}
+        self.add_lazy_tab("case_tab", "📁 Cases", self.create_case_management_tab)
+        self.add_lazy_tab("email_tab", "📧 Email Analysis", self.create_email_analysis_tab)
+        self.add_lazy_tab("categories_tab", "📂 Categories",
+                          lambda: CategoriesWidget(self.collections_tracker, self.case_manager, self))
+        self.add_lazy_tab("acknowledged_cases_tab", "✅ Acknowledged",
+                          lambda: AcknowledgedCasesWidget(self.case_manager, self))
         if self.bulk_email_service:
-            self.bulk_email_tab = BulkEmailWidget(self.bulk_email_service, self.case_manager, self)
-            self.tabs.addTab(self.bulk_email_tab, "📨 Bulk Email")
-        
-        # Collections Tracker tab
-        self.collections_tab = self.create_collections_tab()
-        self.tabs.addTab(self.collections_tab, "💰 Collections")
-        
-        # Settings tab
-        self.settings_tab = self.create_settings_tab()
-        self.tabs.addTab(self.settings_tab, "⚙️ Settings")
+            self.add_lazy_tab("bulk_email_tab", "📨 Bulk Email",
+                              lambda: BulkEmailWidget(self.bulk_email_service, self.case_manager, self))
+        self.add_lazy_tab("collections_tab", "💰 Collections", self.create_collections_tab)
+        self.add_lazy_tab("settings_tab", "⚙️ Settings", self.create_settings_tab,
+                          on_built=self.load_settings_widgets)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         layout.addWidget(self.tabs)
         central_widget.setLayout(layout)
@@ -2796,10 +3099,10 @@ class EnhancedMainWindow(QMainWindow):
         btn_followup.clicked.connect(self.quick_followup)
         
         btn_bulk = QPushButton("📨 Bulk Email")
-        btn_bulk.clicked.connect(lambda: self.tabs.setCurrentWidget(self.bulk_email_tab) if hasattr(self, 'bulk_email_tab') else None)
+        btn_bulk.clicked.connect(lambda: self.show_tab('bulk_email_tab'))
         
         btn_stale = QPushButton("📂 View Categories")
-        btn_stale.clicked.connect(lambda: self.tabs.setCurrentWidget(self.categories_tab) if hasattr(self, 'categories_tab') else None)
+        btn_stale.clicked.connect(lambda: self.show_tab('categories_tab'))
         
         actions_layout.addWidget(btn_summarize, 0, 0)
         actions_layout.addWidget(btn_followup, 0, 1)
@@ -2894,6 +3197,23 @@ class EnhancedMainWindow(QMainWindow):
             if pending_count == "N/A" or pending_count == 0:
                 process_btn.setEnabled(False)
             layout.addWidget(process_btn)
+            
+            # Background consumer: status line plus start/pause/resume and stop
+            self.cms_consumer_label = QLabel("Background consumer off")
+            self.cms_consumer_label.setStyleSheet("font-size: 10px; color: gray;")
+            self.cms_consumer_label.setWordWrap(True)
+            layout.addWidget(self.cms_consumer_label)
+            
+            consumer_layout = QHBoxLayout()
+            self.cms_consumer_btn = QPushButton("▶ Start Consumer")
+            self.cms_consumer_btn.setToolTip("Add queued CMS notes in the background on the persistent CMS session")
+            self.cms_consumer_btn.clicked.connect(self.toggle_background_cms_consumer)
+            consumer_layout.addWidget(self.cms_consumer_btn)
+            self.cms_consumer_stop_btn = QPushButton("⏹ Stop")
+            self.cms_consumer_stop_btn.setEnabled(False)
+            self.cms_consumer_stop_btn.clicked.connect(self.stop_background_cms_consumer)
+            consumer_layout.addWidget(self.cms_consumer_stop_btn)
+            layout.addLayout(consumer_layout)
         else:
             na_label = QLabel("CMS not available")
             na_label.setStyleSheet("font-size: 10px; color: gray;")
@@ -2910,23 +3230,45 @@ class EnhancedMainWindow(QMainWindow):
         # Search bar
         search_layout = QHBoxLayout()
         self.case_search_input = QLineEdit()
-        self.case_search_input.setPlaceholderText("Search by PV#, Name, or CMS#...")
+        self.case_search_input.setPlaceholderText("Search by PV#, CMS#, name, law firm or attorney email...")
         self.case_search_button = QPushButton("🔍 Search")
         self.case_search_button.clicked.connect(self.search_cases)
+        self.case_search_input.returnPressed.connect(self.search_cases)
+        
+        # Search as you type - debounce keystrokes before querying the index
+        self.case_search_timer = QTimer(self)
+        self.case_search_timer.setSingleShot(True)
+        self.case_search_timer.setInterval(150)
+        self.case_search_timer.timeout.connect(self.filter_cases_live)
+        self.case_search_input.textChanged.connect(self.case_search_timer.start)
+        self._live_search_term = ""
+        self._live_search_pvs = None
         
         search_layout.addWidget(QLabel("Search:"))
         search_layout.addWidget(self.case_search_input)
         search_layout.addWidget(self.case_search_button)
         
-        # Case table
-        self.case_table = QTableWidget()
-        self.case_table.setColumnCount(8)
-        self.case_table.setHorizontalHeaderLabels([
-            "PV #", "Name", "CMS #", "DOI", 
-            "Attorney Email", "Law Firm", "Status", "Actions"
-        ])
+        # Case table - model/proxy so filtering never recreates rows
+        self.case_model = DictTableModel([
+            ("PV #", "PV"), ("Name", "Name"), ("CMS #", "CMS"), ("DOI", "DOI"),
+            ("Attorney Email", "Attorney Email"), ("Law Firm", "Law Firm"), ("Status", "Status")
+        ], self)
+        self.case_proxy = CaseFilterProxyModel(self)
+        self.case_proxy.setSourceModel(self.case_model)
+        
+        self.case_table = QTableView()
+        self.case_table.setModel(self.case_proxy)
         self.case_table.setAlternatingRowColors(True)
         self.case_table.setSortingEnabled(True)
+        self.case_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.case_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.case_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.case_table.customContextMenuRequested.connect(self.show_case_context_menu)
+        self.case_table.doubleClicked.connect(
+            lambda index: self.summarize_case_by_pv(self.case_proxy.row_data(index.row()).get('PV'))
+        )
+        
+        self.case_count_label = QLabel("")
         
         # Load cases on startup (wrapped in try-except for initialization safety)
         # Defer loading to after UI is shown to prevent blocking
@@ -2938,6 +3280,7 @@ class EnhancedMainWindow(QMainWindow):
         
         layout.addLayout(search_layout)
         layout.addWidget(self.case_table)
+        layout.addWidget(self.case_count_label)
         
         widget.setLayout(layout)
         return widget
@@ -3098,6 +3441,27 @@ class EnhancedMainWindow(QMainWindow):
         self.auto_cms_check = QCheckBox("Auto-add CMS notes")
         auto_layout.addRow("CMS Integration:", self.auto_cms_check)
         
+        self.cms_workers_spin = QSpinBox()
+        self.cms_workers_spin.setMinimum(1)
+        self.cms_workers_spin.setMaximum(8)
+        self.cms_workers_spin.setValue(Config.CMS_NOTE_WORKERS)
+        self.cms_workers_spin.setSuffix(" tabs")
+        self.cms_workers_spin.setToolTip("Browser tabs adding CMS notes at once - keep low for the CMS server")
+        auto_layout.addRow("CMS Note Workers:", self.cms_workers_spin)
+        
+        self.cms_driver_combo = QComboBox()
+        self.cms_driver_combo.addItem("Browser (Playwright)", "browser")
+        if Config.CMS_HTTP_DRIVER_ENABLED:
+            # Opt-in only: the HTTP form posts are verified against the mock CMS, not production
+            self.cms_driver_combo.addItem("Direct HTTP (experimental)", "http")
+            self.cms_driver_combo.setToolTip("Direct HTTP logs in once and posts the note forms; "
+                                             "falls back to the browser if it cannot log in")
+        auto_layout.addRow("CMS Note Driver:", self.cms_driver_combo)
+        
+        self.cms_consumer_check = QCheckBox("Add CMS notes in the background while sending")
+        self.cms_consumer_check.setToolTip("Starts the background CMS note consumer with each bulk send")
+        auto_layout.addRow("CMS Consumer:", self.cms_consumer_check)
+        
         auto_group.setLayout(auto_layout)
         
         # Email Cadence Settings
@@ -3513,6 +3877,10 @@ Detailed Report:
     
     def load_all_cases(self):
         """Load all cases into the table"""
+        # The Cases tab loads itself when it is first opened
+        if not hasattr(self, 'case_model'):
+            return
+        
         try:
             # Check if case_manager and df exist and have data
             if not hasattr(self, 'case_manager'):
@@ -3524,37 +3892,17 @@ Detailed Report:
                 print(f"DataFrame shape: {self.case_manager.df.shape}")
                 return
             
-            cases = []
-            for _, row in self.case_manager.df.iterrows():
-                case = self.case_manager.format_case(row)
-                cases.append(case)
-            
-            self.case_table.setRowCount(len(cases))
-            
-            for row, case in enumerate(cases):
-                self.case_table.setItem(row, 0, QTableWidgetItem(str(case.get('PV', ''))))
-                self.case_table.setItem(row, 1, QTableWidgetItem(str(case.get('Name', ''))))
-                self.case_table.setItem(row, 2, QTableWidgetItem(str(case.get('CMS', ''))))
-                self.case_table.setItem(row, 3, QTableWidgetItem(str(case.get('DOI', ''))))
-                self.case_table.setItem(row, 4, QTableWidgetItem(str(case.get('Attorney Email', ''))))
-                self.case_table.setItem(row, 5, QTableWidgetItem(str(case.get('Law Firm', ''))))
-                self.case_table.setItem(row, 6, QTableWidgetItem(str(case.get('Status', ''))))
-                
-                # Actions button
-                action_btn = QPushButton("Actions")
-                action_menu = QMenu()
-                
-                summarize_action = action_menu.addAction("📄 Summarize")
-                summarize_action.triggered.connect(lambda checked, pv=case.get('PV'): self.summarize_case_by_pv(pv))
-                
-                followup_action = action_menu.addAction("✉️ Draft Follow-up")
-                followup_action.triggered.connect(lambda checked, pv=case.get('PV'): self.draft_followup_by_pv(pv))
-                
-                status_action = action_menu.addAction("📮 Draft Status Request")
-                status_action.triggered.connect(lambda checked, pv=case.get('PV'): self.draft_status_request_by_pv(pv))
-                
-                action_btn.setMenu(action_menu)
-                self.case_table.setCellWidget(row, 7, action_btn)
+            cases = self.case_manager.get_all_cases()
+            self.case_model.set_rows(cases)
+            self._live_search_term = ""
+            self._live_search_pvs = None
+            
+            # Re-apply whatever is in the search box to the new rows
+            if self.case_search_input.text().strip():
+                self.filter_cases_live()
+            else:
+                self.case_proxy.set_allowed_pvs(None)
+                self.update_case_count()
             
             self.case_table.resizeColumnsToContents()
             self.log_activity(f"Loaded {len(cases)} cases")
@@ -3565,45 +3913,60 @@ Detailed Report:
             print(f"Full traceback:\n{traceback.format_exc()}")
             QMessageBox.critical(self, "Error", f"Failed to load cases: {str(e)}\n\nCheck console for details.")
     
+    def filter_cases_live(self):
+        """Filter the case table as the user types (debounced)"""
+        search_term = self.case_search_input.text().strip()
+        
+        try:
+            if not search_term:
+                self._live_search_term = ""
+                self._live_search_pvs = None
+                self.case_proxy.set_allowed_pvs(None)
+                self.update_case_count()
+                return
+            
+            start = time.perf_counter()
+            pvs = self.case_manager.live_search(
+                search_term,
+                previous_term=self._live_search_term,
+                previous_pvs=self._live_search_pvs
+            )
+            self._live_search_term = search_term
+            self._live_search_pvs = pvs
+            self.case_proxy.set_allowed_pvs(pvs)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            logger.debug(f"Live search '{search_term}': {len(pvs)} matches in {elapsed_ms:.1f} ms")
+            self.update_case_count(f"{elapsed_ms:.0f} ms")
+            
+        except Exception as e:
+            logger.error(f"Live search error: {e}")
+    
+    def update_case_count(self, timing=None):
+        """Show how many cases the table is displaying"""
+        shown = self.case_proxy.rowCount()
+        total = self.case_model.rowCount()
+        text = f"Showing {shown} of {total} cases"
+        if timing:
+            text += f" ({timing})"
+        self.case_count_label.setText(text)
+    
     def search_cases(self):
         """Search for cases"""
+        self.case_search_timer.stop()
         search_term = self.case_search_input.text().strip()
         if not search_term:
-            self.load_all_cases()
+            self.filter_cases_live()
             return
         
         try:
             results = self.case_manager.search_case(search_term)
             if results:
                 cases = [results] if isinstance(results, dict) else results
-                self.case_table.setRowCount(len(cases))
-                
-                for row, case in enumerate(cases):
-                    self.case_table.setItem(row, 0, QTableWidgetItem(str(case.get('PV', ''))))
-                    self.case_table.setItem(row, 1, QTableWidgetItem(str(case.get('Name', ''))))
-                    self.case_table.setItem(row, 2, QTableWidgetItem(str(case.get('CMS', ''))))
-                    self.case_table.setItem(row, 3, QTableWidgetItem(str(case.get('DOI', ''))))
-                    self.case_table.setItem(row, 4, QTableWidgetItem(str(case.get('Attorney Email', ''))))
-                    self.case_table.setItem(row, 5, QTableWidgetItem(str(case.get('Law Firm', ''))))
-                    self.case_table.setItem(row, 6, QTableWidgetItem(str(case.get('Status', ''))))
-                    
-                    # Actions button
-                    action_btn = QPushButton("Actions")
-                    action_menu = QMenu()
-                    
-                    summarize_action = action_menu.addAction("📄 Summarize")
-                    summarize_action.triggered.connect(lambda checked, pv=case.get('PV'): self.summarize_case_by_pv(pv))
-                    
-                    followup_action = action_menu.addAction("✉️ Draft Follow-up")
-                    followup_action.triggered.connect(lambda checked, pv=case.get('PV'): self.draft_followup_by_pv(pv))
-                    
-                    status_action = action_menu.addAction("📮 Draft Status Request")
-                    status_action.triggered.connect(lambda checked, pv=case.get('PV'): self.draft_status_request_by_pv(pv))
-                    
-                    action_btn.setMenu(action_menu)
-                    self.case_table.setCellWidget(row, 7, action_btn)
-                
-                self.case_table.resizeColumnsToContents()
+                self._live_search_term = search_term
+                self._live_search_pvs = [str(case.get('PV', '')) for case in cases]
+                self.case_proxy.set_allowed_pvs(self._live_search_pvs)
+                self.update_case_count()
                 self.log_activity(f"Found {len(cases)} cases for '{search_term}'")
             else:
                 QMessageBox.information(self, "No Results", "No cases found matching your search.")
@@ -3611,6 +3974,29 @@ Detailed Report:
         except Exception as e:
             QMessageBox.critical(self, "Search Error", f"Error searching cases: {str(e)}")
     
+    def show_case_context_menu(self, pos):
+        """Actions menu for the case under the cursor"""
+        index = self.case_table.indexAt(pos)
+        if not index.isValid():
+            return
+        
+        case = self.case_proxy.row_data(index.row())
+        if not case:
+            return
+        pv = case.get('PV')
+        
+        menu = QMenu(self)
+        summarize_action = menu.addAction("📄 Summarize")
+        summarize_action.triggered.connect(lambda checked=False: self.summarize_case_by_pv(pv))
+        
+        followup_action = menu.addAction("✉️ Draft Follow-up")
+        followup_action.triggered.connect(lambda checked=False: self.draft_followup_by_pv(pv))
+        
+        status_action = menu.addAction("📮 Draft Status Request")
+        status_action.triggered.connect(lambda checked=False: self.draft_status_request_by_pv(pv))
+        
+        menu.exec_(self.case_table.viewport().mapToGlobal(pos))
+    
     def analyze_case_emails(self):
         """Analyze emails for a case"""
         pv = self.email_case_input.text().strip()
@@ -4074,8 +4460,7 @@ Case Aging:
     
     def process_bulk_category(self, category):
         """Process bulk emails for a category"""
-        if self.bulk_email_tab:
-            self.tabs.setCurrentWidget(self.bulk_email_tab)
+        if self.show_tab('bulk_email_tab'):
             # Set the category in bulk email widget
             if hasattr(self.bulk_email_tab, 'process_category'):
                 self.bulk_email_tab.process_category(category)
@@ -4108,7 +4493,10 @@ Case Aging:
         
         if filepath:
             try:
-                self.case_manager = CaseManager(filepath)
+                changes = self.case_manager.reload_cases(filepath)
+                if changes is None:
+                    QMessageBox.warning(self, "Error", "Could not load cases from that file. Previous data is unchanged.")
+                    return
                 self.load_all_cases()
                 QMessageBox.information(self, "Success", f"Loaded {len(self.case_manager.df)} cases.")
                 self.log_activity(f"Loaded cases from {filepath}")
@@ -4185,46 +4573,27 @@ Case Aging:
                     progress.set_message("Saving settings...")
                     self.save_user_spreadsheet_path(dest_path)
                     
-                    # Reload case manager with new spreadsheet
+                    # Reload case data in place - listeners update only the changed cases
                     progress.set_message("Loading case data...")
-                    self.case_manager = CaseManager(dest_path)
-                self.user_spreadsheet_path = dest_path
+                    changes = self.case_manager.reload_cases(dest_path)
                 
-                # Reload all dependent services
-                if hasattr(self, 'bulk_service'):
-                    self.bulk_service.case_manager = self.case_manager
-                    # Clear the categorization cache to force re-analysis
-                    self.bulk_service.categorized_cases = {}
-                    self.bulk_service.categorization_timestamp = None
-                    self.bulk_service.force_recategorization()
-                    logger.info("Cleared bulk service cache after spreadsheet upload")
-                    
-                if hasattr(self, 'bulk_email_tab'):
-                    self.bulk_email_tab.case_manager = self.case_manager
-                    # Trigger refresh of categories
-                    if hasattr(self.bulk_email_tab, 'refresh_categories'):
-                        QTimer.singleShot(100, self.bulk_email_tab.refresh_categories)
-                    
-                if hasattr(self, 'stale_widget'):
-                    self.stale_widget.case_manager = self.case_manager
-                    # Trigger refresh of stale cases
-                    if hasattr(self.stale_widget, 'refresh_analysis'):
-                        QTimer.singleShot(100, self.stale_widget.refresh_analysis)
+                if changes is None:
+                    QMessageBox.warning(self, "Upload Failed",
+                                        "The new spreadsheet could not be loaded. Your previous case data is unchanged.")
+                    return
+                
+                self.user_spreadsheet_path = dest_path
                 
-                # Update collections tracker with new case data
-                if hasattr(self, 'collections_tracker'):
-                    # Re-analyze with new spreadsheet data
-                    logger.info("Re-analyzing collections with new spreadsheet")
-                    # Clear cache to force fresh analysis on next refresh
-                    QTimer.singleShot(200, lambda: self.collections_tracker.clear_stale_cache())
-                    
                 # Refresh displays
-                self.load_all_cases()
+                if changes["added"] or changes["removed"] or changes["changed"]:
+                    self.load_all_cases()
                 
                 QMessageBox.information(
                     self, "Success", 
                     f"Spreadsheet uploaded successfully!\n\n"
                     f"Loaded {len(self.case_manager.df)} cases from:\n{os.path.basename(filepath)}\n\n"
+                    f"Added: {len(changes['added'])}  Removed: {len(changes['removed'])}  "
+                    f"Changed: {len(changes['changed'])}  Unchanged: {changes['unchanged']}\n\n"
                     f"This spreadsheet will be used for all your sessions."
                 )
                 
@@ -4233,6 +4602,129 @@ Case Aging:
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to upload spreadsheet: {str(e)}")
     
+    def on_cases_changed(self, changes):
+        """Push a spreadsheet change set to the tracker, bulk categorization and category tables"""
+        if hasattr(self, 'collections_tracker'):
+            self.collections_tracker.apply_case_changes(self.case_manager, changes)
+        
+        if getattr(self, 'bulk_email_service', None):
+            self.bulk_email_service.apply_case_changes(changes)
+        
+        if hasattr(self, 'categories_tab'):
+            self.categories_tab.apply_case_changes(changes)
+        
+        # The bulk tab reads the patched categorization; only its firm list is cached in the widget
+        bulk_tab = getattr(self, 'bulk_email_tab', None)
+        if bulk_tab is not None and hasattr(bulk_tab, 'by_firm_radio') and bulk_tab.by_firm_radio.isChecked():
+            bulk_tab.update_selection_combo()
+    
+    def start_scheduled_sender(self):
+        """Run the scheduled sender while scheduled emails are waiting (catches up missed slots)"""
+        if not getattr(self, 'bulk_email_service', None):
+            return
+        if self.scheduled_sender and self.scheduled_sender.isRunning():
+            return
+        try:
+            if not self.bulk_email_service.outbox.pending_count(scheduled=True):
+                return
+        except Exception as e:
+            logger.error(f"Error reading scheduled emails: {e}")
+            return
+        
+        self.scheduled_sender = ScheduledSendWorker(self.bulk_email_service)
+        self.scheduled_sender.log_message.connect(self.log_activity)
+        self.scheduled_sender.sent_update.connect(self.on_scheduled_sent)
+        self.scheduled_sender.error.connect(lambda err: self.log_activity(f"❌ Scheduled send error: {err}"))
+        self.scheduled_sender.start()
+        self.start_background_cms_consumer(auto=True)
+    
+    def on_scheduled_sent(self, results):
+        """Refresh the bulk tab and CMS card after the scheduled sender delivered emails"""
+        if hasattr(self, 'bulk_email_tab'):
+            self.bulk_email_tab.update_statistics()
+            self.bulk_email_tab.update_outbox_status()
+        self.update_cms_card()
+    
+    def closeEvent(self, event):
+        """Stop background analysis and sending before the window goes away"""
+        if hasattr(self, 'categories_tab'):
+            self.categories_tab.stop_analysis()
+        if self.scheduled_sender and self.scheduled_sender.isRunning():
+            # Unsent emails stay scheduled and are caught up on the next start
+            self.scheduled_sender.stop()
+            self.scheduled_sender.wait(5000)
+        if self.cms_consumer and self.cms_consumer.isRunning():
+            # Notes not yet added stay queued; the interrupted run resumes next time
+            self.cms_consumer.stop()
+            self.cms_consumer.wait(30000)
+        super().closeEvent(event)
+    
+    def start_background_cms_consumer(self, auto=False):
+        """Start the background CMS note consumer (auto: only if enabled in settings)"""
+        if not CMS_AVAILABLE or CMSNoteConsumer is None:
+            return
+        if auto and not self.settings.value("cms_background_consumer", Config.CMS_BACKGROUND_CONSUMER, type=bool):
+            return
+        if self.cms_consumer and self.cms_consumer.isRunning():
+            return
+        
+        workers = self.settings.value("cms_note_workers", Config.CMS_NOTE_WORKERS, type=int)
+        driver = self.settings.value("cms_note_driver", Config.CMS_NOTE_DRIVER)
+        self.cms_consumer = CMSNoteConsumerWorker(CMSNoteConsumer(max_tabs=workers, driver=driver))
+        self.cms_consumer.log_message.connect(self.log_activity)
+        self.cms_consumer.status_update.connect(self.on_cms_consumer_status)
+        self.cms_consumer.finished.connect(self.on_cms_consumer_finished)
+        self.cms_consumer.start()
+        if hasattr(self, 'cms_consumer_btn'):
+            self.cms_consumer_btn.setText("⏸ Pause")
+            self.cms_consumer_stop_btn.setEnabled(True)
+    
+    def toggle_background_cms_consumer(self):
+        """Start the consumer, or pause/resume the running one"""
+        if not (self.cms_consumer and self.cms_consumer.isRunning()):
+            self.start_background_cms_consumer()
+        elif self.cms_consumer.consumer.paused:
+            self.cms_consumer.resume()
+            self.cms_consumer_btn.setText("⏸ Pause")
+        else:
+            self.cms_consumer.pause()
+            self.cms_consumer_btn.setText("▶ Resume")
+    
+    def stop_background_cms_consumer(self):
+        if self.cms_consumer and self.cms_consumer.isRunning():
+            self.cms_consumer.stop()
+            self.cms_consumer_stop_btn.setEnabled(False)
+            self.cms_consumer_label.setText("Stopping after the current case...")
+    
+    def on_cms_consumer_status(self, status):
+        """Show backlog, backpressure and throughput of the background consumer on the CMS card"""
+        if not hasattr(self, 'cms_consumer_label'):
+            return
+        text = f"🚚 {status['state'].capitalize()} · {status['tabs']} tab(s) · {status['notes_per_minute']}/min"
+        if status['eta_seconds']:
+            text += f" · ~{max(1, status['eta_seconds'] // 60)} min to clear"
+        if status['held']:
+            text += f"\n⏭️ {status['held']} case(s) held for Process Notes"
+        color = "gray"
+        if status['backpressure']:
+            text += f"\n⚠️ Backlog {status['backlog']} ≥ {status['high_water']} - catching up"
+            color = "orange"
+        elif status['state'] == "reconnecting" or (status['state'] == "paused" and status['last_error']):
+            text += f"\n❌ {status['last_error']}"
+            color = "red"
+        self.cms_consumer_label.setText(text)
+        self.cms_consumer_label.setStyleSheet(f"font-size: 10px; color: {color};")
+        self.cms_consumer_btn.setText("▶ Resume" if status['state'] == "paused" else "⏸ Pause")
+        self.update_cms_card()
+    
+    def on_cms_consumer_finished(self):
+        if hasattr(self, 'cms_consumer_label'):
+            self.cms_consumer_label.setText("Background consumer off")
+            self.cms_consumer_label.setStyleSheet("font-size: 10px; color: gray;")
+            self.cms_consumer_btn.setText("▶ Start Consumer")
+            self.cms_consumer_stop_btn.setEnabled(False)
+        self.update_cms_card()
+    
     def show_current_spreadsheet(self):
         """Show information about the current spreadsheet"""
         try:
@@ -4585,6 +5077,12 @@ Case Aging:
                               "Please install playwright: pip install playwright")
             return
         
+        if self.cms_consumer and self.cms_consumer.isRunning():
+            QMessageBox.information(self, "Consumer Running",
+                                    "The background CMS note consumer is adding these notes.\n"
+                                    "Stop it first to process the notes in one batch.")
+            return
+        
         # Get current session stats
         try:
             stats = get_session_stats()
@@ -4618,6 +5116,8 @@ Case Aging:
             )
             
             if reply == QMessageBox.Yes:
+                workers = self.settings.value("cms_note_workers", Config.CMS_NOTE_WORKERS, type=int)
+                driver = self.settings.value("cms_note_driver", Config.CMS_NOTE_DRIVER)
                 try:
                     with ProgressContext(self, "Processing CMS Notes", 
                                        f"Processing {pending_count} CMS notes...", 
@@ -4627,7 +5127,7 @@ Case Aging:
                         async def process_with_progress():
                             # Update progress periodically while processing
                             progress.update(0, f"Processing {pending_count} CMS notes...")
-                            result = await process_session_cms_notes()
+                            result = await process_session_cms_notes(workers=workers, driver=driver)
                             progress.update(pending_count, f"Completed processing {pending_count} notes")
                             return result
                         
@@ -4654,8 +5154,19 @@ Case Aging:
                         self.update_quick_stats()
                         self.update_cms_card()
                     else:
-                        QMessageBox.warning(self, "Processing Failed", 
-                                          "Failed to process CMS notes. Check the logs for details.")
+                        run = get_last_run_summary() if get_last_run_summary else None
+                        message = "Failed to process CMS notes. Check the logs for details."
+                        if run:
+                            items = run.get('items', {})
+                            message = (f"CMS run {run['run_id']} {run['state']}: "
+                                       f"{items.get('done', 0)} done, {items.get('failed', 0)} failed, "
+                                       f"{items.get('pending', 0)} not yet processed.\n\n")
+                            if run['state'] == 'interrupted':
+                                message += "Progress was saved - processing CMS notes again resumes this run."
+                            else:
+                                message += "Failed notes stay pending and will be retried next time."
+                        QMessageBox.warning(self, "Processing Incomplete", message)
+                        self.update_cms_card()
                         
                 except Exception as e:
                     QApplication.restoreOverrideCursor()
@@ -4682,24 +5193,24 @@ Case Aging:
             self.update_quick_stats()
             self.update_cms_card()
             self.log_activity("Refreshed dashboard")
-        elif current_widget == self.categories_tab:
+        elif current_widget is getattr(self, 'categories_tab', None):
             self.categories_tab.refresh_analysis()
-        elif current_widget == self.collections_tab:
+        elif current_widget is getattr(self, 'collections_tab', None):
             self.refresh_collections_dashboard()
         else:
             self.log_activity("Refreshed current tab")
     
     def quick_search(self):
         """Quick search dialog"""
-        text, ok = QInputDialog.getText(self, "Quick Search", "Enter PV# or Name:")
+        text, ok = QInputDialog.getText(self, "Quick Search", "Enter PV#, CMS#, name, law firm or attorney email:")
         if ok and text:
-            self.tabs.setCurrentIndex(1)  # Switch to Cases tab
+            self.show_tab('case_tab')
             self.case_search_input.setText(text)
             self.search_cases()
     
     def quick_compose(self):
         """Quick compose email"""
-        self.tabs.setCurrentIndex(2)  # Switch to Email tab
+        self.show_tab('email_tab')
     
     def quick_summarize(self):
         """Quick summarize case"""
@@ -4854,6 +5365,7 @@ Case Aging:
     
     def save_settings(self):
         """Save application settings"""
+        self.ensure_tab('settings_tab')
         self.settings.setValue("openai_key", self.openai_key_input.text())
         self.settings.setValue("gmail_creds", self.gmail_creds_path.text())
         self.settings.setValue("theme", self.theme_combo.currentText())
@@ -4861,6 +5373,9 @@ Case Aging:
         self.settings.setValue("auto_refresh", self.auto_refresh_check.isChecked())
         self.settings.setValue("refresh_interval", self.refresh_interval_spin.value())
         self.settings.setValue("auto_cms", self.auto_cms_check.isChecked())
+        self.settings.setValue("cms_note_workers", self.cms_workers_spin.value())
+        self.settings.setValue("cms_background_consumer", self.cms_consumer_check.isChecked())
+        self.settings.setValue("cms_note_driver", self.cms_driver_combo.currentData())
         self.settings.setValue("dark_mode", self.dark_mode)
         
         QMessageBox.information(self, "Settings Saved", "Settings have been saved successfully.")
@@ -4868,6 +5383,18 @@ Case Aging:
     
     def load_settings(self):
         """Load application settings"""
+        self.dark_mode = self.settings.value("dark_mode", False, type=bool)
+        
+        # Apply loaded dark mode setting
+        if self.dark_mode:
+            self.dark_mode_action.setChecked(True)
+            self.dark_mode_btn.setChecked(True)
+        
+        if hasattr(self, 'settings_tab'):
+            self.load_settings_widgets()
+    
+    def load_settings_widgets(self):
+        """Fill the Settings tab controls from the saved settings"""
         self.openai_key_input.setText(self.settings.value("openai_key", ""))
         self.gmail_creds_path.setText(self.settings.value("gmail_creds", ""))
         
@@ -4880,12 +5407,12 @@ Case Aging:
         self.auto_refresh_check.setChecked(self.settings.value("auto_refresh", False, type=bool))
         self.refresh_interval_spin.setValue(self.settings.value("refresh_interval", 5, type=int))
         self.auto_cms_check.setChecked(self.settings.value("auto_cms", False, type=bool))
-        self.dark_mode = self.settings.value("dark_mode", False, type=bool)
-        
-        # Apply loaded dark mode setting
-        if self.dark_mode:
-            self.dark_mode_action.setChecked(True)
-            self.dark_mode_btn.setChecked(True)
+        self.cms_workers_spin.setValue(self.settings.value("cms_note_workers", Config.CMS_NOTE_WORKERS, type=int))
+        self.cms_consumer_check.setChecked(
+            self.settings.value("cms_background_consumer", Config.CMS_BACKGROUND_CONSUMER, type=bool)
+        )
+        driver_index = self.cms_driver_combo.findData(self.settings.value("cms_note_driver", Config.CMS_NOTE_DRIVER))
+        self.cms_driver_combo.setCurrentIndex(max(0, driver_index))
     
     def log_activity(self, message):
         """Log activity to the activity log"""
@@ -5,17 +5,37 @@ Handles batch email processing with approval workflow and test mode
 
 import pandas as pd
 import json
+import hashlib
 import os
 import re
 import time
+import queue
 import random
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-import pytz
+from config import Config
+from services.email_outbox import EmailOutbox, QUEUED as OUTBOX_QUEUED
+from utils.rate_limiter import TokenBucketLimiter, ThroughputMeter
+from services.priority_scoring import PriorityScorer
+from services.send_scheduler import SendScheduler
 
 logger = logging.getLogger(__name__)
 
+# Bump when the generated email wording changes so cached emails are rebuilt
+EMAIL_TEMPLATE_VERSION = 1
+
+# Prepared batches kept for flipping between categories in the bulk tab
+BATCH_CACHE_SIZE = 32
+
+# Generated emails kept by case fingerprint so unchanged cases are not rebuilt
+EMAIL_CACHE_SIZE = 5000
+
+# Status keywords that mean litigation is pending, which excludes a case from CCP 335.1
+LITIGATION_KEYWORDS = ['pending', 'litigation', 'prelitigation', 'pre-litigation',
+                       'settled', 'settlement', 'litigating', 'suit', 'lawsuit']
 
 class BulkEmailService:
     """Service for bulk email processing with approval workflow"""
@@ -34,6 +54,7 @@ class BulkEmailService:
         # Initialize priority scoring
         self.firm_scores_file = "data/firm_intelligence.json"
         self.firm_scores = self.load_firm_scores()
+        self.priority_scorer = PriorityScorer(case_manager, collections_tracker, self.firm_scores)
         
         # Email generation templates
         self.greetings = [
@@ -57,15 +78,45 @@ class BulkEmailService:
             "We can send over any billing or medical records you might need."
         ]
         
-        # Track sent PIDs in this session
+        # Track sent PIDs in this session (added to by the send bookkeeping thread)
         self.session_sent_pids = set()
+        self.sent_pids_lock = threading.Lock()
         self.load_sent_pids()
         
+        # Durable outbox - every send goes through it
+        self.outbox = EmailOutbox()
+        # Once per start - draining must not fail rows another sender is sending right now
+        self.outbox.recover_interrupted()
+        # Held by whichever sender is draining; the scheduled sender skips a round while a batch sends
+        self.send_lock = threading.Lock()
+        
+        # Send pacing - seeded with what already went out today
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.rate_limiter = TokenBucketLimiter(
+            Config.SEND_RATE_PER_MINUTE,
+            Config.SEND_RATE_PER_DAY,
+            sent_today=self.outbox.sent_since(midnight)
+        )
+        
+        # Delivery windows for scheduled batches
+        self.scheduler = SendScheduler(self.outbox)
+        
         # Email queue for batch processing
         self.email_queue = []
+        self.last_number_report = {}
+        
+        # Prepared batches by category and data revision; generated emails by case inputs
+        self._batch_cache = OrderedDict()
+        self._email_cache = OrderedDict()
         self.categorized_cases = {}
         self.categorization_timestamp = None
         self.categorization_cache_duration = 300  # Cache for 5 minutes
+        self.categorization_options = {"active_only": True, "check_ccp_335_1": False}
+    
+    def all_sent_pids(self) -> set:
+        """Copy of the PIDs sent before and during this session"""
+        with self.sent_pids_lock:
+            return self.sent_pids | self.session_sent_pids
     
     def load_sent_pids(self):
         """Load already sent PIDs from log file"""
@@ -96,76 +147,12 @@ class BulkEmailService:
     
     def calculate_case_priority(self, case_data: Dict) -> int:
         """
-        Calculate priority score (0-100) for a case based on collection likelihood
+        Priority score (0-100) for a case based on collection likelihood
         
-        Scoring factors:
-        - Firm responsiveness history (0-40 points)
-        - Case age sweet spot (0-30 points)
-        - Days since last contact (0-20 points)
-        - Case value if available (0-10 points)
+        Scores for all cases are computed in one pass and cached by PriorityScorer;
+        see that class for the scoring factors.
         """
-        score = 0
-        
-        # 1. Firm responsiveness (0-40 points)
-        firm_email = case_data.get('attorney_email', '').lower()
-        if firm_email and firm_email in self.firm_scores:
-            firm_data = self.firm_scores[firm_email]
-            response_rate = firm_data.get('response_rate', 0.5)
-            score += int(response_rate * 40)
-        else:
-            score += 20  # Default middle score for unknown firms
-        
-        # 2. Case age sweet spot (0-30 points) - Best: 6-18 months old
-        doi_raw = case_data.get('doi')
-        if doi_raw and str(doi_raw) != "nan" and str(doi_raw) != "NaT":
-            try:
-                if hasattr(doi_raw, 'date'):
-                    doi_date = doi_raw
-                else:
-                    doi_date = pd.to_datetime(str(doi_raw))
-                
-                months_old = (datetime.now() - doi_date).days / 30
-                
-                if 6 <= months_old <= 18:
-                    score += 30  # Perfect age
-                elif 3 <= months_old < 6:
-                    score += 20  # Good but young
-                elif 18 < months_old <= 24:
-                    score += 20  # Good but aging
-                elif 24 < months_old <= 36:
-                    score += 10  # Getting old
-                # Too young (<3 months) or too old (>36 months) get 0
-            except:
-                score += 15  # Default for problematic dates
-        
-        # 3. Days since last contact (0-20 points)
-        # Use collections tracker if available
-        if self.collections_tracker:
-            try:
-                activity = self.collections_tracker.get_case_activity(case_data.get('pv'))
-                if activity:
-                    days_since = activity.get('days_since_last_contact')
-                    if days_since:
-                        if 20 <= days_since <= 40:
-                            score += 20  # Perfect follow-up window
-                        elif 40 < days_since <= 60:
-                            score += 15  # Good follow-up window
-                        elif 60 < days_since <= 90:
-                            score += 10  # Needs attention
-                        elif days_since > 90:
-                            score += 5   # Long overdue
-                        # Too recent (<20 days) gets 0 - don't pester
-                    else:
-                        score += 20  # Never contacted - high priority
-            except:
-                score += 10  # Default if tracker fails
-        else:
-            score += 10  # Default without tracker
-        
-        # 4. Case value (0-10 points) - if available
-        # Could be added if billing amount is in the spreadsheet
-        
-        return min(score, 100)  # Cap at 100
+        return self.priority_scorer.score(case_data.get('pv', ''))
     
     def update_firm_score(self, firm_email: str, responded: bool = False, paid: bool = False):
         """Update firm intelligence based on interactions"""
@@ -196,6 +183,8 @@ class BulkEmailService:
         
         firm_data['last_updated'] = datetime.now().isoformat()
         
+        self.priority_scorer.invalidate()
+        
         # Save updated scores
         os.makedirs(os.path.dirname(self.firm_scores_file), exist_ok=True)
         with open(self.firm_scores_file, 'w') as f:
@@ -232,6 +221,38 @@ class BulkEmailService:
         self.categorized_cases = {}
         logger.info("Categorization cache cleared - will recategorize on next request")
     
+    def apply_case_changes(self, changes: Dict):
+        """Patch the cached categorization for only the PVs a spreadsheet reload touched"""
+        if not self.categorized_cases:
+            return
+        
+        affected = set(changes.get("added", [])) | set(changes.get("removed", [])) | set(changes.get("changed", []))
+        if not affected:
+            return
+        
+        # Drop affected PVs from every list and firm group
+        for category, cases in self.categorized_cases.items():
+            if category == "by_firm":
+                for firm_name in list(cases.keys()):
+                    kept = [c for c in cases[firm_name] if str(c.get("pv")) not in affected]
+                    if kept:
+                        cases[firm_name] = kept
+                    else:
+                        del cases[firm_name]
+            elif isinstance(cases, list):
+                self.categorized_cases[category] = [c for c in cases if str(c.get("pv")) not in affected]
+        
+        # Re-add added and changed PVs using the same rules as categorize_cases
+        to_categorize = set(changes.get("added", [])) | set(changes.get("changed", []))
+        if to_categorize:
+            table = self.case_manager.get_case_table()
+            rows = table[table["PV"].isin(to_categorize)].drop_duplicates(subset="PV", keep="first")
+            self._categorize_table(rows, self.categorized_cases, self._acknowledged_snapshot(),
+                                   self.categorization_options.get("active_only", True),
+                                   self.categorization_options.get("check_ccp_335_1", False))
+        
+        logger.info(f"Applied spreadsheet changes for {len(affected)} cases to cached categorization")
+    
     def set_cache_duration(self, seconds: int):
         """Set cache duration in seconds"""
         self.categorization_cache_duration = seconds
@@ -293,14 +314,7 @@ class BulkEmailService:
         logger.info("Starting case categorization...")
         start_time = time.time()
         
-        # Import acknowledgment service to filter out acknowledged cases
-        from services.case_acknowledgment_service import CaseAcknowledgmentService
-        ack_service = CaseAcknowledgmentService()
-        
         try:
-            df = self.case_manager.df
-            total_cases = len(df)
-            
             if progress:
                 progress.set_message("Initializing categories...")
                 progress.update(0)
@@ -308,127 +322,34 @@ class BulkEmailService:
             elif progress_callback:
                 progress_callback("Initializing categories...", 0)
             
-            categories = {
-                "critical": [],  # 90+ days no response
-                "high_priority": [],  # 60+ days no response
-                "needs_follow_up": [],  # 30+ days no response
-                "no_response": [],  # Sent but no response (under 30 days)
-                "never_contacted": [],  # Never sent any emails
-                "missing_doi": [],  # Cases with missing DOI
-                "ccp_335_1": [],  # Cases needing CCP 335.1 statute inquiry
-                "by_firm": {},  # Organized by law firm
-                "high_value": [],  # Cases with high balance
-                "ready_to_close": []  # Cases that might be ready for settlement
-            }
+            table = self.case_manager.get_case_table()
+            acknowledged = self._acknowledged_snapshot()
             
-            for idx, row in df.iterrows():
-                # Update progress
-                if progress and idx % 10 == 0:  # Update every 10 cases
-                    percentage = int((idx / total_cases) * 100)
-                    progress.update(percentage, f"Processing case {idx+1} of {total_cases}")
-                    progress.log(f"Analyzing PV {row.get('pv', 'Unknown')}...")
-                    progress.process_events()  # Keep UI responsive
-                elif progress_callback and idx % 10 == 0:  # Update every 10 cases
-                    percentage = int((idx / total_cases) * 100)
-                    progress_callback(f"Processing case {idx}/{total_cases}...", percentage)
-                
-                case_info = self.case_manager.format_case(row)
-                
-                # Skip if not active (if filtering)
-                if active_only:
-                    status = str(case_info.get("Status", "")).lower()
-                    if status != "active":
-                        continue
-                
-                pv = str(case_info.get("PV", ""))
-                
-                # Skip already sent cases
-                if pv in self.sent_pids or pv in self.session_sent_pids:
-                    continue
-                
-                # Skip acknowledged cases - they should only appear in Acknowledged tab
-                if ack_service.is_acknowledged(pv):
-                    logger.debug(f"Skipping acknowledged case {pv} from categorization")
-                    continue
-                
-                # Create case data object
-                case_data = {
-                    "pv": pv,
-                    "name": case_info.get("Name", ""),
-                    "doi": case_info.get("DOI", ""),
-                    "cms": case_info.get("CMS", ""),
-                    "attorney_email": case_info.get("Attorney Email", ""),
-                    "law_firm": case_info.get("Law Firm", ""),
-                    "status": case_info.get("Status", ""),
-                    "full_case": case_info
-                }
-                
-                # Categorize by missing DOI - ONLY 2099 dates should be considered missing
-                doi_raw = case_data["doi"]
-                doi_str = str(doi_raw).strip() if doi_raw else ""
-                
-                # Only consider 2099 dates as truly missing DOI
-                if "2099" in doi_str:
-                    categories["missing_doi"].append(case_data)
-                # Empty or invalid dates go to a different category if needed
-                elif not doi_raw or doi_str in ["nan", "NaT", ""]:
-                    # These have blank DOI fields but aren't the 2099 placeholder
-                    # Still add to missing_doi but could be separated if needed
-                    pass  # Don't add to missing_doi unless it's specifically 2099
-                
-                # Categorize by firm NAME (not email)
-                firm_name = case_data["law_firm"]
-                if firm_name and firm_name.strip():
-                    if firm_name not in categories["by_firm"]:
-                        categories["by_firm"][firm_name] = []
-                    categories["by_firm"][firm_name].append(case_data)
-                
-                # Check for old cases (>2 years) and CCP 335.1 eligibility
-                if doi_raw and doi_str != "2099" and doi_str != "nan" and doi_str != "NaT":
-                    try:
-                        # Handle datetime object or string
-                        if hasattr(doi_raw, 'year'):
-                            # It's already a datetime object
-                            doi_date = doi_raw
-                        else:
-                            # Parse string to datetime
-                            doi_str_clean = doi_str.split()[0] if ' ' in doi_str else doi_str
-                            doi_date = pd.to_datetime(doi_str_clean)
-                        
-                        years_old = (datetime.now() - doi_date).days / 365
-                        if years_old > 2:
-                            categories["old_cases"].append(case_data)
-                            
-                            # Only check CCP 335.1 eligibility if explicitly requested
-                            # This is a slow operation that checks email cache
-                            if check_ccp_335_1:
-                                # Check CCP 335.1 eligibility
-                                # CCP 335.1: DOI > 2 years old AND no pending litigation
-                                status = str(case_data.get("status", "")).lower()
-                                
-                                # Check for litigation keywords that would EXCLUDE from CCP 335.1
-                                litigation_keywords = ['pending', 'litigation', 'prelitigation', 'pre-litigation', 
-                                                     'settled', 'settlement', 'litigating', 'suit', 'lawsuit']
-                                has_litigation_keyword = any(keyword in status for keyword in litigation_keywords)
-                                
-                                # Check if we have NOT heard from firm (would need collections tracker data)
-                                # For now, just check DOI age and status keywords
-                                if not has_litigation_keyword:
-                                    categories["ccp_335_1"].append(case_data)
-                                    logger.debug(f"Case {pv} added to CCP 335.1 category - DOI: {years_old:.1f} years old")
-                    except Exception as e:
-                        logger.debug(f"Error processing DOI for case {pv}: {e}")
-                
-                # Note: Time-based categories (critical, high_priority, needs_follow_up, no_response)
-                # are handled by the collections tracker and pulled in prepare_batch()
+            if progress:
+                progress.update(40, f"Categorizing {len(table)} cases...")
+                progress.process_events()
+            elif progress_callback:
+                progress_callback(f"Categorizing {len(table)} cases...", 40)
+            
+            categories = self._empty_categories()
+            self._categorize_table(table, categories, acknowledged, active_only, check_ccp_335_1)
+            # Note: Time-based categories (critical, high_priority, needs_follow_up, no_response)
+            # are handled by the collections tracker and pulled in prepare_batch()
             
             # Cache the results
             self.categorized_cases = categories
             self.categorization_timestamp = time.time()
+            self.categorization_options = {"active_only": active_only, "check_ccp_335_1": check_ccp_335_1}
+            
+            if progress:
+                progress.update(100, "Categorization complete")
+            elif progress_callback:
+                progress_callback("Categorization complete", 100)
             
             # Log category statistics
             elapsed_time = time.time() - start_time
             logger.info(f"Case categorization complete in {elapsed_time:.2f} seconds:")
+            logger.info(f"  📅 Old cases (>2yr): {len(categories['old_cases'])}")
             logger.info(f"  ⚖️ CCP 335.1 (>2yr statute): {len(categories['ccp_335_1'])}")
             logger.info(f"  ❓ Missing DOI: {len(categories['missing_doi'])}")
             logger.info(f"  💰 High value cases: {len(categories['high_value'])}")
@@ -440,6 +361,82 @@ class BulkEmailService:
             logger.error(f"Error categorizing cases: {e}")
             raise
     
+    @staticmethod
+    def _empty_categories() -> Dict:
+        """Category buckets filled by categorize_cases"""
+        return {
+            "critical": [],  # 90+ days no response
+            "high_priority": [],  # 60+ days no response
+            "needs_follow_up": [],  # 30+ days no response
+            "no_response": [],  # Sent but no response (under 30 days)
+            "never_contacted": [],  # Never sent any emails
+            "missing_doi": [],  # Cases with missing DOI (2099 placeholder)
+            "old_cases": [],  # DOI more than 2 years ago
+            "ccp_335_1": [],  # Cases needing CCP 335.1 statute inquiry
+            "by_firm": {},  # Organized by law firm
+            "high_value": [],  # Cases with high balance
+            "ready_to_close": []  # Cases that might be ready for settlement
+        }
+    
+    def _categorize_table(self, table, categories: Dict, acknowledged: set, active_only: bool, check_ccp_335_1: bool):
+        """
+        Add cases from the typed case table to the bulk categories
+        
+        Filtering (status, already sent, acknowledged), DOI age and firm grouping
+        are column operations; only the selected rows are turned into dicts.
+        """
+        if table.empty:
+            return
+        
+        pvs = table["PV"]
+        keep = ~pvs.isin(self.all_sent_pids())
+        # Acknowledged cases should only appear in the Acknowledged tab
+        keep &= ~pvs.isin(acknowledged)
+        if active_only:
+            keep &= table["Status"].str.lower() == "active"
+        cases = table[keep]
+        if cases.empty:
+            return
+        
+        # Only 2099 dates count as a missing DOI; blank DOIs are left uncategorized
+        missing_doi = cases["DOI"].str.contains("2099", regex=False)
+        years_old = (pd.Timestamp.now() - cases["DOI Date"]).dt.days / 365
+        old = years_old > 2
+        
+        ccp = pd.Series(False, index=cases.index)
+        if check_ccp_335_1:
+            # CCP 335.1: DOI > 2 years old AND no pending litigation in the status
+            litigation = cases["Status"].str.lower().str.contains(
+                "|".join(LITIGATION_KEYWORDS), regex=True
+            )
+            ccp = old & ~litigation
+        
+        records = cases.drop(columns=["DOI Date"]).to_dict("records")
+        case_data = dict(zip(cases.index, (self._case_data(record) for record in records)))
+        
+        categories["missing_doi"].extend(case_data[idx] for idx in missing_doi[missing_doi].index)
+        categories["old_cases"].extend(case_data[idx] for idx in old[old].index)
+        categories["ccp_335_1"].extend(case_data[idx] for idx in ccp[ccp].index)
+        
+        # Categorize by firm NAME (not email)
+        with_firm = cases[cases["Law Firm"] != ""]
+        for firm_name, indices in with_firm.groupby("Law Firm", sort=False).groups.items():
+            categories["by_firm"].setdefault(firm_name, []).extend(case_data[idx] for idx in indices)
+    
+    @staticmethod
+    def _case_data(case_info: Dict) -> Dict:
+        """Bulk case entry for a formatted case"""
+        return {
+            "pv": str(case_info.get("PV", "")),
+            "name": case_info.get("Name", ""),
+            "doi": case_info.get("DOI", ""),
+            "cms": case_info.get("CMS", ""),
+            "attorney_email": case_info.get("Attorney Email", ""),
+            "law_firm": case_info.get("Law Firm", ""),
+            "status": case_info.get("Status", ""),
+            "full_case": case_info
+        }
+    
     def generate_email_content(self, case_data: Dict, email_type: str = "standard") -> Dict:
         """Generate email content for a case"""
         try:
@@ -572,10 +569,30 @@ Reference #: {pv}"""
             logger.error(f"Error generating email for case {case_data.get('pv')}: {e}")
             raise
     
-    def prepare_batch(self, category: str, subcategory: str = None, limit: int = None) -> List[Dict]:
-        """Prepare a batch of emails for review and approval"""
+    def prepare_batch(self, category: str, subcategory: str = None, limit: int = None, on_email=None,
+                      by_priority: bool = False) -> List[Dict]:
+        """
+        Prepare a batch of emails for review and approval
+        
+        Args:
+            on_email: Optional callback receiving each email as soon as it is generated
+            by_priority: Order cases by cached priority score before applying the limit
+        """
         try:
-            emails = []
+            # One acknowledgment snapshot for the whole batch
+            acknowledged = self._acknowledged_snapshot()
+            
+            cache_key = self._batch_cache_key(category, subcategory, limit, by_priority, acknowledged)
+            cached = self._batch_cache.get(cache_key)
+            if cached is not None:
+                self._batch_cache.move_to_end(cache_key)
+                emails = [dict(email) for email in cached]
+                if on_email:
+                    for email in emails:
+                        on_email(email)
+                logger.info(f"Prepared batch for {category} served from cache ({len(emails)} emails)")
+                self.email_queue = emails
+                return emails
             
             # If CCP 335.1 category is requested, ensure we run the check
             if category == "ccp_335_1":
@@ -588,55 +605,14 @@ Reference #: {pv}"""
             
             # CCP 335.1 can come from either collections tracker or bulk email categorization
             if category == "ccp_335_1":
+                cases = []
                 # Try to get from collections tracker first
                 if self.collections_tracker:
                     logger.info(f"Getting CCP 335.1 cases from collections tracker...")
                     stale_data = self.collections_tracker.get_stale_cases_by_category(
                         self.case_manager, "ccp_335_1", limit=limit or 100
                     )
-                    cases = stale_data.get("cases", [])
-                    
-                    # Format cases from collections tracker
-                    if cases:
-                        from services.case_acknowledgment_service import CaseAcknowledgmentService
-                        ack_service = CaseAcknowledgmentService()
-                        
-                        formatted_cases = []
-                        for stale_case in cases:
-                            pv = stale_case.get("pv")
-                            
-                            # Skip acknowledged cases
-                            if ack_service.is_acknowledged(pv):
-                                logger.info(f"Skipping acknowledged CCP 335.1 case {pv}")
-                                continue
-                            
-                            formatted_case = {
-                                "pv": pv,
-                                "name": stale_case.get("name"),
-                                "doi": stale_case.get("doi", ""),
-                                "cms": "",  # Will be fetched from case manager
-                                "attorney_email": stale_case.get("attorney_email"),
-                                "law_firm": stale_case.get("law_firm"),
-                                "status": stale_case.get("status", ""),
-                                "days_since_sent": stale_case.get("days_since_sent"),
-                                "response_count": stale_case.get("response_count", 0)
-                            }
-                            
-                            # Fetch full case details from case manager
-                            try:
-                                df = self.case_manager.df
-                                case_row = df[df[1].astype(str) == str(pv)]
-                                if not case_row.empty:
-                                    full_case = self.case_manager.format_case(case_row.iloc[0])
-                                    formatted_case["doi"] = full_case.get("DOI", "")
-                                    formatted_case["cms"] = full_case.get("CMS", "")
-                                    formatted_case["full_case"] = full_case
-                            except:
-                                pass
-                            
-                            formatted_cases.append(formatted_case)
-                        
-                        cases = formatted_cases
+                    cases = self._format_stale_cases(stale_data.get("cases", []), acknowledged, keep_details=True)
                     
                 # If no cases from tracker, use bulk email categorization
                 if not cases:
@@ -651,50 +627,11 @@ Reference #: {pv}"""
                     stale_data = self.collections_tracker.get_stale_cases_by_category(
                         self.case_manager, category, limit=limit or 100
                     )
-                    cases = stale_data.get("cases", [])
-                    logger.info(f"Found {len(cases)} cases in {category} category")
+                    stale_cases = stale_data.get("cases", [])
+                    logger.info(f"Found {len(stale_cases)} cases in {category} category")
                     
                     # Convert stale case format to standard format and filter acknowledged
-                    from services.case_acknowledgment_service import CaseAcknowledgmentService
-                    ack_service = CaseAcknowledgmentService()
-                    
-                    formatted_cases = []
-                    for stale_case in cases:
-                        pv = stale_case.get("pv")
-                        
-                        # Skip acknowledged cases
-                        if ack_service.is_acknowledged(pv):
-                            logger.info(f"Skipping acknowledged case {pv}")
-                            continue
-                        
-                        formatted_case = {
-                            "pv": pv,
-                            "name": stale_case.get("name"),
-                            "doi": "",  # Will be fetched from case manager
-                            "cms": "",  # Will be fetched from case manager
-                            "attorney_email": stale_case.get("attorney_email"),
-                            "law_firm": stale_case.get("law_firm"),
-                            "status": "",
-                            "days_since_contact": stale_case.get("days_since_contact"),
-                            "response_count": stale_case.get("response_count", 0)
-                        }
-                        
-                        # Fetch full case details from case manager
-                        try:
-                            pv = stale_case.get("pv")
-                            df = self.case_manager.df
-                            case_row = df[df[1].astype(str) == str(pv)]
-                            if not case_row.empty:
-                                full_case = self.case_manager.format_case(case_row.iloc[0])
-                                formatted_case["doi"] = full_case.get("DOI", "")
-                                formatted_case["cms"] = full_case.get("CMS", "")
-                                formatted_case["full_case"] = full_case
-                        except:
-                            pass
-                        
-                        formatted_cases.append(formatted_case)
-                    
-                    cases = formatted_cases
+                    cases = self._format_stale_cases(stale_cases, acknowledged)
                 else:
                     logger.warning("Collections tracker not available for stale case categories")
                     cases = []
@@ -705,36 +642,24 @@ Reference #: {pv}"""
                 # Get cases for category
                 cases = self.categorized_cases.get(category, [])
             
-            # Filter out acknowledged cases for non-stale categories
+            # Filter out acknowledged cases (stale cases were filtered while formatting)
             if category not in stale_categories:
-                from services.case_acknowledgment_service import CaseAcknowledgmentService
-                ack_service = CaseAcknowledgmentService()
-                
-                filtered_cases = []
-                for case in cases:
-                    pv = case.get("pv")
-                    if ack_service.is_acknowledged(pv):
-                        logger.info(f"Skipping acknowledged case {pv}")
-                        continue
-                    filtered_cases.append(case)
-                cases = filtered_cases
+                cases = [case for case in cases if str(case.get("pv")) not in acknowledged]
+            
+            if by_priority:
+                cases = self.priority_scorer.sort_cases(cases)
             
             # Apply limit if specified
             if limit:
                 cases = cases[:limit]
             
             # Generate email content for each case
-            for case in cases:
-                try:
-                    # Check if this is CCP 335.1 category
-                    if category == "ccp_335_1":
-                        email = self.generate_email_content(case, email_type="ccp_335_1")
-                    else:
-                        email = self.generate_email_content(case)
-                    emails.append(email)
-                except Exception as e:
-                    logger.error(f"Error generating email for case {case.get('pv')}: {e}")
-                    continue
+            email_type = "ccp_335_1" if category == "ccp_335_1" else "standard"
+            emails = self.generate_emails(cases, email_type=email_type, on_email=on_email)
+            
+            self._batch_cache[cache_key] = [dict(email) for email in emails]
+            while len(self._batch_cache) > BATCH_CACHE_SIZE:
+                self._batch_cache.popitem(last=False)
             
             self.email_queue = emails
             return emails
@@ -743,6 +668,117 @@ Reference #: {pv}"""
             logger.error(f"Error preparing batch: {e}")
             raise
     
+    def _batch_cache_key(self, category: str, subcategory: str, limit: int, by_priority: bool,
+                         acknowledged: set) -> Tuple:
+        """
+        Key for a prepared batch: the selection plus a revision of every input it reads
+        
+        Case-table, tracker and firm-score revisions cover spreadsheet reloads, new
+        sends/responses and score updates; the acknowledgment snapshot, sent PID counts
+        and the date cover snoozes, this session's sends and day-based staleness.
+        """
+        return (
+            category, subcategory, limit, by_priority,
+            getattr(self.case_manager, "revision", None),
+            getattr(self.collections_tracker, "revision", None),
+            hash(frozenset(acknowledged)),
+            len(self.sent_pids), len(self.session_sent_pids),
+            self.priority_scorer.firm_revision if by_priority else None,
+            tuple(sorted(self.categorization_options.items())),
+            EMAIL_TEMPLATE_VERSION, self.test_mode, self.test_email,
+            datetime.now().date(),
+        )
+    
+    def invalidate_batch_cache(self):
+        """Forget prepared batches (emails already generated are still reused if their case is unchanged)"""
+        self._batch_cache.clear()
+    
+    def _email_fingerprint(self, case: Dict, email_type: str) -> Tuple:
+        """Everything generate_email_content reads from a case"""
+        return (email_type, str(case.get("pv", "")), case.get("name"), str(case.get("doi", "")),
+                case.get("attorney_email"), self.test_mode, self.test_email, EMAIL_TEMPLATE_VERSION)
+    
+    def _acknowledged_snapshot(self) -> set:
+        """PVs acknowledged right now, loaded once per batch"""
+        from services.case_acknowledgment_service import CaseAcknowledgmentService
+        return CaseAcknowledgmentService().get_acknowledged_pvs()
+    
+    def _format_stale_cases(self, stale_cases: List[Dict], acknowledged: set, keep_details: bool = False) -> List[Dict]:
+        """Convert tracker stale cases to the standard case format, joining spreadsheet details in one lookup"""
+        pending = []
+        for stale_case in stale_cases:
+            pv = stale_case.get("pv")
+            
+            # Skip acknowledged cases
+            if str(pv) in acknowledged:
+                logger.info(f"Skipping acknowledged case {pv}")
+                continue
+            
+            formatted_case = {
+                "pv": pv,
+                "name": stale_case.get("name"),
+                "doi": stale_case.get("doi", "") if keep_details else "",  # Filled from case manager
+                "cms": "",  # Filled from case manager
+                "attorney_email": stale_case.get("attorney_email"),
+                "law_firm": stale_case.get("law_firm"),
+                "status": stale_case.get("status", "") if keep_details else "",
+                "response_count": stale_case.get("response_count", 0)
+            }
+            if keep_details:
+                formatted_case["days_since_sent"] = stale_case.get("days_since_sent")
+            else:
+                formatted_case["days_since_contact"] = stale_case.get("days_since_contact")
+            pending.append(formatted_case)
+        
+        # Fetch full case details for every case at once
+        try:
+            full_cases = self.case_manager.get_cases_by_pvs([case["pv"] for case in pending])
+            by_pv = {str(case.get("PV", "")).strip(): case for case in full_cases}
+            for formatted_case in pending:
+                full_case = by_pv.get(str(formatted_case["pv"]).strip())
+                if full_case:
+                    formatted_case["doi"] = full_case.get("DOI", "")
+                    formatted_case["cms"] = full_case.get("CMS", "")
+                    formatted_case["full_case"] = full_case
+        except Exception as e:
+            logger.warning(f"Could not join case details: {e}")
+        
+        return pending
+    
+    def generate_emails(self, cases: List[Dict], email_type: str = "standard", on_email=None) -> List[Dict]:
+        """
+        Generate emails for many cases, reusing cached ones whose inputs are unchanged
+        
+        Emails are passed to on_email as they are ready; the returned list keeps the case order.
+        Runs in the caller's thread: generation is template formatting only, so a thread pool
+        gains nothing under the GIL - the cache is what skips the work.
+        """
+        emails = []
+        generated = 0
+        for case in cases:
+            fingerprint = self._email_fingerprint(case, email_type)
+            cached = self._email_cache.get(fingerprint)
+            if cached is not None:
+                self._email_cache.move_to_end(fingerprint)
+                email = dict(cached, case_data=case)
+            else:
+                try:
+                    email = self.generate_email_content(case, email_type=email_type)
+                except Exception as e:
+                    logger.error(f"Error generating email for case {case.get('pv')}: {e}")
+                    continue
+                generated += 1
+                self._email_cache[fingerprint] = email
+                while len(self._email_cache) > EMAIL_CACHE_SIZE:
+                    self._email_cache.popitem(last=False)
+            emails.append(email)
+            if on_email:
+                on_email(email)
+        
+        if generated < len(cases):
+            logger.info(f"Reused {len(cases) - generated} cached emails, generated {generated}")
+        return emails
+    
     def display_batch_preview(self, emails: List[Dict]) -> str:
         """Display preview of email batch"""
         output = []
@@ -827,90 +863,243 @@ Reference #: {pv}"""
         
         return approved, action
     
-    def send_batch(self, emails: List[Dict], add_cms_notes: bool = True) -> Dict:
-        """Send approved batch of emails"""
+    def build_firm_digests(self, emails: List[Dict], min_cases: int = None) -> List[Dict]:
+        """
+        Combine prepared emails going to the same firm address into one digest each
+        
+        Addresses with fewer than min_cases emails keep their individual emails.
+        Each digest carries the per-case emails in "digest_cases" so sending it
+        still logs, tracks and notes every case.
+        """
+        min_cases = min_cases or Config.DIGEST_MIN_CASES
+        groups = {}
+        for email in emails:
+            address = str(email.get("original_to") or email.get("to", "")).strip().lower()
+            groups.setdefault(address, []).append(email)
+        
+        combined = []
+        for address, group in groups.items():
+            if not address or len(group) < min_cases:
+                combined.extend(group)
+            else:
+                combined.append(self.generate_digest_content(group))
+        return combined
+    
+    def generate_digest_content(self, emails: List[Dict]) -> Dict:
+        """One status request listing every outstanding patient and DOI for a firm address"""
+        first = emails[0]
+        original_to = first.get("original_to") or first["to"]
+        firm_name = first.get("case_data", {}).get("law_firm", "") or original_to
+        
+        lines = []
+        for email in sorted(emails, key=lambda e: str(e.get("name", ""))):
+            doi = email.get("doi") or "UNKNOWN"
+            lines.append(f"  - {email.get('name', 'UNKNOWN')} - DOI {doi} - Reference #: {email['pv']}")
+        
+        subject = f"Case Status Request - {len(emails)} Patients // Prohealth Advanced Imaging"
+        to_email = original_to
+        if self.test_mode:
+            to_email = self.test_email
+            subject = f"[TEST MODE - Original To: {original_to}] {subject}"
+        
+        # Email body - NO SIGNATURE as Gmail adds it automatically
+        body = f"""{random.choice(self.greetings)}
+
+In regards to Prohealth Advanced Imaging billing and liens for the following patients:
+
+{chr(10).join(lines)}
+
+Could you please let me know which of these cases have settled and which are still pending? {random.choice(self.followups)}
+
+Thank you for your time"""
+        
+        # Keyed by the cases it covers: another digest to the firm the same day is not a duplicate
+        case_pvs = sorted(str(email["pv"]) for email in emails)
+        cases_hash = hashlib.sha1(",".join(case_pvs).encode("utf-8")).hexdigest()[:12]
+        
+        return {
+            "pv": f"digest:{original_to.lower()}:{cases_hash}",
+            "to": to_email,
+            "original_to": original_to,
+            "subject": subject,
+            "body": body,
+            "name": f"{firm_name} ({len(emails)} cases)",
+            "doi": "",
+            "case_data": {"law_firm": firm_name, "attorney_email": original_to},
+            "email_type": "firm_digest",
+            "digest_cases": [
+                {key: email.get(key)
+                 for key in ("pv", "to", "original_to", "subject", "name", "doi", "case_data", "email_type")}
+                for email in emails
+            ]
+        }
+    
+    def _build_digest_batch(self, emails: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Digests for the cases not yet emailed today, plus the already-claimed cases left out"""
+        claimed = self.outbox.claimed_cases(emails, test_mode=self.test_mode)
+        claimed_pvs = {str(duplicate["pv"]) for duplicate in claimed}
+        remaining = [email for email in emails if str(email["pv"]) not in claimed_pvs]
+        return self.build_firm_digests(remaining), claimed
+    
+    def send_batch(self, emails: List[Dict], add_cms_notes: bool = True, progress_callback=None, should_stop=None,
+                   metrics_callback=None, digest: bool = False) -> Dict:
+        """
+        Send approved batch of emails through the durable outbox
+        
+        Emails are queued first, so an interrupted batch can be finished with
+        drain_outbox() without re-sending anything that already went out.
+        
+        Args:
+            digest: Combine cases going to the same firm address into one digest email
+        """
+        batch_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
+        total_cases = len(emails)
+        claimed = []
+        if digest:
+            emails, claimed = self._build_digest_batch(emails)
+            print(f"\n📑 Digest mode: {total_cases} cases combined into {len(emails)} emails")
+        
+        print(f"\n🚀 Sending {len(emails)} emails...")
+        if self.test_mode:
+            print(f"⚠️  TEST MODE: All emails going to {self.test_email}")
+        
+        enqueued = self.outbox.enqueue(emails, batch_id, test_mode=self.test_mode, add_cms_notes=add_cms_notes)
+        enqueued["duplicates"] = claimed + enqueued["duplicates"]
+        for duplicate in enqueued["duplicates"]:
+            print(f"⏭️  Skipping PV {duplicate['pv']} - already {duplicate['state']} today")
+        
+        results = self.drain_outbox(batch_id=batch_id, progress_callback=progress_callback,
+                                    should_stop=should_stop, metrics_callback=metrics_callback)
+        results["total"] = len(emails)
+        results["total_cases"] = total_cases
+        results["skipped"] = enqueued["duplicates"]
+        return results
+    
+    def drain_outbox(self, batch_id: str = None, progress_callback=None, should_stop=None, metrics_callback=None,
+                     scheduled: bool = False, wait: bool = True) -> Dict:
+        """Drain the outbox while holding the send lock (one sender at a time - see _drain_outbox)"""
+        with self.send_lock:
+            return self._drain_outbox(batch_id, progress_callback, should_stop, metrics_callback, scheduled, wait)
+    
+    def _drain_outbox(self, batch_id: str = None, progress_callback=None, should_stop=None, metrics_callback=None,
+                      scheduled: bool = False, wait: bool = True) -> Dict:
+        """
+        Send queued outbox emails until the queue (or the given batch) is empty
+        
+        Sends are paced by the token-bucket rate limiter. Logs, tracker updates and
+        CMS notes run in a separate bookkeeping thread so they never delay the next send.
+        
+        Args:
+            batch_id: Only drain this batch (None drains everything, e.g. after a restart)
+            progress_callback: Optional callback (message, percentage)
+            should_stop: Optional callable returning True to stop after the current email
+            metrics_callback: Optional callback receiving live throughput metrics (dict)
+            scheduled: Drain scheduled (delivery window) emails instead of immediate ones
+            wait: Wait for emails that are not due yet; False returns once nothing is ready
+        """
         results = {
             "sent": [],
             "failed": [],
-            "total": len(emails)
+            "retrying": 0,
+            "batch_id": batch_id,
+            "daily_limit_reached": False
         }
         
         try:
-            print(f"\n🚀 Sending {len(emails)} emails...")
-            if self.test_mode:
-                print(f"⚠️  TEST MODE: All emails going to {self.test_email}")
+            total = self.outbox.stats(batch_id, scheduled)[OUTBOX_QUEUED]
+            results["total"] = total
+            meter = ThroughputMeter(total)
+            stopped = lambda: bool(should_stop and should_stop())
             
-            for i, email in enumerate(emails, 1):
-                try:
-                    # Send email using Gmail service
-                    msg_id = self.gmail_service.send_email(
-                        email["to"],
-                        email["subject"],
-                        email["body"]
-                    )
+            def report(message):
+                if progress_callback:
+                    progress_callback(message, int((meter.sent + meter.failed) / max(total, 1) * 100))
+                if metrics_callback:
+                    metrics_callback(meter.snapshot(self.rate_limiter))
+            
+            # Bookkeeping stage - consumes sent emails off the critical path
+            bookkeeping = queue.Queue()
+            bookkeeper = threading.Thread(
+                target=self._bookkeeping_stage, args=(bookkeeping, meter),
+                name="bulk-email-bookkeeping", daemon=True
+            )
+            bookkeeper.start()
+            
+            try:
+                while not stopped():
+                    if not self.rate_limiter.acquire(should_stop):
+                        if not stopped():
+                            results["daily_limit_reached"] = True
+                            print(f"⏸️  Daily limit of {self.rate_limiter.per_day} emails reached - the rest stay queued")
+                        break
                     
-                    if self.test_mode:
-                        print(f"✅ [{i}/{len(emails)}] TEST SENT to {email['to']} (PV: {email['pv']})")
+                    row = self.outbox.claim_next(batch_id, scheduled)
+                    
+                    if row is None:
+                        self.rate_limiter.refund()
+                        # Nothing ready - wait for the next scheduled retry, if any
+                        delay = self.outbox.next_retry_delay(batch_id, scheduled)
+                        if delay is None or not wait:
+                            break
+                        report(f"Waiting {int(delay)}s to retry failed sends...")
+                        waited = 0.0
+                        while waited < delay and not stopped():
+                            time.sleep(min(1.0, delay - waited))
+                            waited += 1.0
+                        continue
+                    
+                    email = row["email"]
+                    test_mode = bool(row["test_mode"])
+                    
+                    try:
+                        msg_id = self.gmail_service.send_email(
+                            row["to_addr"],
+                            email["subject"],
+                            email["body"]
+                        )
+                    except Exception as e:
+                        state = self.outbox.mark_failed(row["id"], str(e), retryable=self._is_retryable_send_error(e))
+                        if state == OUTBOX_QUEUED:
+                            meter.record_retry()
+                            results["retrying"] += 1
+                            logger.warning(f"Send failed for PV {email['pv']} (attempt {row['attempts']}), will retry: {e}")
+                        else:
+                            meter.record_failed()
+                            print(f"❌ [{meter.sent + meter.failed}/{total}] Failed PV {email['pv']}: {e}")
+                            logger.error(f"Failed to send email for PV {email['pv']}: {e}")
+                            results["failed"].append({"pv": email["pv"], "error": str(e)})
+                        report(f"Failed PV {email['pv']}: {e}")
+                        continue
+                    
+                    # Record the send before any bookkeeping so a crash there can't cause a re-send
+                    self.outbox.mark_sent(row["id"], msg_id)
+                    meter.record_sent()
+                    
+                    if test_mode:
+                        print(f"✅ [{meter.sent + meter.failed}/{total}] TEST SENT to {row['to_addr']} (PV: {email['pv']})")
                         print(f"    (Original recipient: {email.get('original_to', 'N/A')})")
                     else:
-                        print(f"✅ [{i}/{len(emails)}] Sent to {email['to']} (PV: {email['pv']})")
+                        print(f"✅ [{meter.sent + meter.failed}/{total}] Sent to {row['to_addr']} (PV: {email['pv']})")
                     
-                    # Only update tracking if NOT in test mode
-                    if not self.test_mode:
-                        # Log success to permanent logs
-                        self.log_sent_email(email, msg_id)
-                        
-                        # Track in session
-                        self.session_sent_pids.add(email['pv'])
-                        
-                        # Update collections tracker IMMEDIATELY
-                        if self.collections_tracker and hasattr(self.collections_tracker, 'mark_case_as_contacted'):
-                            try:
-                                pv = email['pv']
-                                # This updates last_sent date and moves case to appropriate category
-                                self.collections_tracker.mark_case_as_contacted(pv, is_sent=True, is_response=False)
-                                logger.info(f"Collections tracker updated immediately for PV {pv}")
-                            except Exception as e:
-                                logger.warning(f"Failed to update collections tracker for PV {pv}: {e}")
-                        
-                        # Add CMS note for production
-                        if add_cms_notes:
-                            try:
-                                self.add_cms_note(email["case_data"], "bulk_status_request", email["to"])
-                            except Exception as e:
-                                logger.error(f"Failed to add CMS note for PV {email['pv']}: {e}")
-                    else:
-                        # In test mode, log to test log (doesn't affect tracking)
-                        self.log_test_email(email, msg_id)
-                        
-                        # Add CMS note for test mode (marked as TEST)
-                        if add_cms_notes:
-                            try:
-                                # Add test CMS note with special marker
-                                # Pass the original recipient, not the test email
-                                original_recipient = email.get("original_to", email["to"])
-                                self.add_cms_test_note(email["case_data"], original_recipient)
-                            except Exception as e:
-                                logger.error(f"Failed to add TEST CMS note for PV {email['pv']}: {e}")
+                    bookkeeping.put((email, msg_id, test_mode, bool(row["add_cms_notes"])))
                     
-                    # Add to results (for both test and production)
                     results["sent"].append({
                         "pv": email["pv"],
-                        "to": email["to"],
+                        "to": row["to_addr"],
                         "msg_id": msg_id,
-                        "test_mode": self.test_mode
-                    })
-                    
-                    # Brief delay between sends
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    print(f"❌ [{i}/{len(emails)}] Failed PV {email['pv']}: {e}")
-                    logger.error(f"Failed to send email for PV {email['pv']}: {e}")
-                    results["failed"].append({
-                        "pv": email["pv"],
-                        "error": str(e)
+                        "test_mode": test_mode
                     })
+                    report(f"Sent PV {email['pv']} - {email.get('name', '')}")
+            finally:
+                # Let the bookkeeping stage finish what it has before returning
+                bookkeeping.put(None)
+                if meter.sent > meter.bookkept and progress_callback:
+                    progress_callback("Finishing logs, tracker updates and CMS notes...", 100)
+                bookkeeper.join()
+            
+            results["metrics"] = meter.snapshot(self.rate_limiter)
+            if metrics_callback:
+                metrics_callback(results["metrics"])
             
             # Summary
             print(f"\n📊 Batch Complete:")
@@ -919,15 +1108,16 @@ Reference #: {pv}"""
                 print(f"   📝 TEST CMS notes queued for processing")
             print(f"   ✅ Sent: {len(results['sent'])}")
             print(f"   ❌ Failed: {len(results['failed'])}")
+            print(f"   📈 Throughput: {results['metrics']['average_per_minute']}/min")
             
             # Remind about CMS notes if any were added
-            if len(results['sent']) > 0 and add_cms_notes:
+            if len(results['sent']) > 0:
                 print("\n⚠️  REMINDER: CMS notes are queued for batch processing")
                 print("   Run 'add session cms notes' command to add them to CMS")
             
-            # Only invalidate stale cache if NOT in test mode
+            # Only invalidate stale cache for production sends
             # This preserves categories for test runs
-            if self.collections_tracker and len(results["sent"]) > 0 and not self.test_mode:
+            if self.collections_tracker and any(not sent["test_mode"] for sent in results["sent"]):
                 self.collections_tracker.invalidate_stale_case_cache()
                 print("🔄 Case categories refreshed")
             
@@ -937,6 +1127,163 @@ Reference #: {pv}"""
             logger.error(f"Error sending batch: {e}")
             raise
     
+    def schedule_batch(self, emails: List[Dict], add_cms_notes: bool = True, digest: bool = False) -> Dict:
+        """
+        Queue approved emails for the recipient firms' business hours instead of sending now
+        
+        Send times are spread evenly across each timezone's window within the current
+        rate ceilings; the scheduled send worker delivers them while the app is open.
+        """
+        batch_id = f"sched_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
+        total_cases = len(emails)
+        claimed = []
+        if digest:
+            emails, claimed = self._build_digest_batch(emails)
+        
+        schedule = self.scheduler.plan(emails, self.rate_limiter.per_minute, self.rate_limiter.per_day)
+        enqueued = self.outbox.enqueue(emails, batch_id, test_mode=self.test_mode,
+                                       add_cms_notes=add_cms_notes, schedule=schedule)
+        enqueued["duplicates"] = claimed + enqueued["duplicates"]
+        
+        duplicate_pvs = {str(duplicate["pv"]) for duplicate in enqueued["duplicates"]}
+        queued_times = [send_at for (send_at, _), email in zip(schedule, emails)
+                        if str(email["pv"]) not in duplicate_pvs]
+        timezones = {}
+        for _, tz_name in schedule:
+            timezones[tz_name] = timezones.get(tz_name, 0) + 1
+        
+        result = {
+            "batch_id": batch_id,
+            "total": len(emails),
+            "total_cases": total_cases,
+            "queued": len(enqueued["queued"]),
+            "skipped": enqueued["duplicates"],
+            "first_send": datetime.fromtimestamp(min(queued_times)) if queued_times else None,
+            "last_send": datetime.fromtimestamp(max(queued_times)) if queued_times else None,
+            "timezones": timezones
+        }
+        
+        print(f"\n🕘 Scheduled {result['queued']} emails for business hours")
+        if result["first_send"]:
+            print(f"   First: {result['first_send']:%a %m/%d %I:%M %p} | Last: {result['last_send']:%a %m/%d %I:%M %p}")
+        for duplicate in enqueued["duplicates"]:
+            print(f"⏭️  Skipping PV {duplicate['pv']} - already {duplicate['state']} today")
+        return result
+    
+    def send_due_scheduled(self, should_stop=None, metrics_callback=None) -> Dict:
+        """Re-plan missed slots, then send every scheduled email that is due now (skipped while a batch sends)"""
+        if not self.send_lock.acquire(blocking=False):
+            return {"sent": [], "failed": [], "busy": True}
+        try:
+            self.scheduler.catch_up(self.rate_limiter.per_minute, self.rate_limiter.per_day)
+            return self._drain_outbox(should_stop=should_stop, metrics_callback=metrics_callback,
+                                      scheduled=True, wait=False)
+        finally:
+            self.send_lock.release()
+    
+    def _bookkeeping_stage(self, work_queue: "queue.Queue", meter: ThroughputMeter):
+        """Consume sent emails and do their logging/tracking until a None sentinel arrives"""
+        done = False
+        while not done:
+            items = [work_queue.get()]
+            # Take whatever else is waiting so the tracker file is written once per group
+            while True:
+                try:
+                    items.append(work_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if None in items:
+                done = True
+                items = [item for item in items if item is not None]
+            if not items:
+                continue
+            
+            try:
+                contacted = []
+                for email, msg_id, test_mode, add_cms_notes in items:
+                    self._record_sent(email, msg_id, test_mode, add_cms_notes, update_tracker=False)
+                    if not test_mode:
+                        contacted.extend(case['pv'] for case in self._fan_out(email))
+                
+                if contacted and self.collections_tracker and hasattr(self.collections_tracker, 'mark_cases_contacted'):
+                    self.collections_tracker.mark_cases_contacted(contacted, contact_type="bulk_status_request")
+            except Exception as e:
+                logger.error(f"Error in send bookkeeping: {e}")
+            finally:
+                for _ in items:
+                    meter.record_bookkept()
+    
+    def set_rate_limits(self, per_minute: int = None, per_day: int = None):
+        """Adjust the send ceilings (applies immediately, even to a running batch)"""
+        self.rate_limiter.set_limits(per_minute=per_minute, per_day=per_day)
+    
+    @staticmethod
+    def _fan_out(email: Dict) -> List[Dict]:
+        """Per-case emails behind a sent email (a digest covers several cases)"""
+        cases = email.get("digest_cases")
+        if not cases:
+            return [email]
+        # Per-case entries record the digest's actual recipient and subject
+        return [dict(case, to=email["to"], subject=email["subject"]) for case in cases]
+    
+    def _record_sent(self, email: Dict, msg_id: str, test_mode: bool, add_cms_notes: bool, update_tracker: bool = True):
+        """Logs, tracker update and CMS note for one sent email (each case of a digest)"""
+        if email.get("digest_cases"):
+            for case_email in self._fan_out(email):
+                self._record_sent(case_email, msg_id, test_mode, add_cms_notes, update_tracker)
+            return
+        
+        if not test_mode:
+            # Log success to permanent logs
+            self.log_sent_email(email, msg_id)
+            
+            # Track in session
+            with self.sent_pids_lock:
+                self.session_sent_pids.add(email['pv'])
+            
+            # Update collections tracker IMMEDIATELY
+            if update_tracker and self.collections_tracker and hasattr(self.collections_tracker, 'mark_case_contacted'):
+                pv = email['pv']
+                try:
+                    # This logs the send and moves the case out of the stale categories
+                    self.collections_tracker.mark_case_contacted(pv, contact_type="bulk_status_request")
+                    logger.info(f"Collections tracker updated immediately for PV {pv}")
+                except Exception as e:
+                    logger.warning(f"Failed to update collections tracker for PV {pv}: {e}")
+            
+            # Add CMS note for production
+            if add_cms_notes:
+                try:
+                    self.add_cms_note(email["case_data"], "bulk_status_request", email["to"])
+                except Exception as e:
+                    logger.error(f"Failed to add CMS note for PV {email['pv']}: {e}")
+        else:
+            # In test mode, log to test log (doesn't affect tracking)
+            self.log_test_email(email, msg_id)
+            
+            # Add CMS note for test mode (marked as TEST)
+            if add_cms_notes:
+                try:
+                    # Pass the original recipient, not the test email
+                    original_recipient = email.get("original_to", email["to"])
+                    self.add_cms_test_note(email["case_data"], original_recipient)
+                except Exception as e:
+                    logger.error(f"Failed to add TEST CMS note for PV {email['pv']}: {e}")
+    
+    def _is_retryable_send_error(self, error: Exception) -> bool:
+        """Rate limits, server errors and network problems are retried; bad requests are not"""
+        cause = error.__cause__ or error
+        status = getattr(getattr(cause, 'resp', None), 'status', None)
+        if status is not None:
+            status = int(status)
+            if status == 429 or status >= 500:
+                return True
+            if status == 403:
+                return "rateLimitExceeded" in str(cause) or "quota" in str(cause).lower()
+            return False
+        return True
+    
     def log_sent_email(self, email: Dict, msg_id: str):
         """Log sent email to file (production only)"""
         try:
@@ -1061,88 +1408,102 @@ Reference #: {pv}"""
         
         return stats
     
-    def prepare_batch_from_numbers(self, numbers: List[str]) -> List[Dict]:
-        """Prepare batch of emails from a list of PV or CMS numbers"""
+    def resolve_numbers(self, numbers: List[str]) -> Dict:
+        """
+        Resolve pasted PV / CMS numbers against the case table in one merge
+        
+        A number matching a PV resolves to that case (PV wins over CMS, as before);
+        otherwise a CMS match resolves if it names exactly one PV. Returns
+        {"found": [...], "already_sent": [...], "not_found": [...], "ambiguous": [...],
+        "duplicates": [...]} plus the case data for found numbers, in pasted order.
+        """
+        started = time.perf_counter()
+        cleaned = [str(num).strip() for num in numbers if str(num).strip()]
+        if not cleaned:
+            return {"found": [], "already_sent": [], "not_found": [], "ambiguous": [], "duplicates": [],
+                    "elapsed_ms": 0.0}
+        wanted = pd.DataFrame({"input": cleaned})
+        duplicates = wanted.loc[wanted["input"].duplicated(), "input"].unique().tolist()
+        wanted = wanted.drop_duplicates("input").reset_index(drop=True)
+        wanted["order"] = wanted.index
+        
+        table = self.case_manager.get_case_table().rename_axis("row").reset_index()
+        pv_hits = wanted.merge(table[["row", "PV"]], left_on="input", right_on="PV").assign(matched_on="PV")
+        cms_hits = wanted.merge(table[["row", "CMS", "PV"]], left_on="input", right_on="CMS").assign(matched_on="CMS")
+        # CMS matches only count for numbers that did not match a PV
+        cms_hits = cms_hits[~cms_hits["input"].isin(pv_hits["input"])]
+        hits = pd.concat([pv_hits, cms_hits], ignore_index=True)
+        # Duplicate sheet rows for the same PV are one case
+        hits = hits.drop_duplicates(["input", "PV"]).sort_values(["order", "row"])
+        
+        pv_counts = hits.groupby("input")["PV"].transform("size")
+        ambiguous_hits = hits[pv_counts > 1]
+        unique_hits = hits[pv_counts == 1]
+        sent = {str(pv) for pv in self.all_sent_pids()}
+        is_sent = unique_hits["PV"].isin(sent)
+        
+        found_hits = unique_hits[~is_sent]
+        rows = table.set_index("row").loc[found_hits["row"]].drop(columns=["DOI Date"])
+        found = [
+            {"input": num, "pv": pv, "matched_on": matched_on, "case": self._case_data(record)}
+            for num, pv, matched_on, record in zip(found_hits["input"], found_hits["PV"],
+                                                   found_hits["matched_on"], rows.to_dict("records"))
+        ]
+        
+        report = {
+            "found": found,
+            "already_sent": [
+                {"input": num, "pv": pv}
+                for num, pv in zip(unique_hits.loc[is_sent, "input"], unique_hits.loc[is_sent, "PV"])
+            ],
+            "not_found": wanted.loc[~wanted["input"].isin(hits["input"]), "input"].tolist(),
+            "ambiguous": [
+                {"input": num, "pvs": group["PV"].tolist()}
+                for num, group in ambiguous_hits.groupby("input", sort=False)
+            ],
+            "duplicates": duplicates,
+        }
+        report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return report
+    
+    def prepare_batch_from_numbers(self, numbers: List[str], on_email=None) -> List[Dict]:
+        """Prepare batch of emails from a list of PV or CMS numbers (report in self.last_number_report)"""
         try:
-            emails = []
-            not_found = []
-            already_sent = []
+            report = self.resolve_numbers(numbers)
+            priority_scores = self.priority_scorer.get_scores()
             
-            df = self.case_manager.df
+            found_cases = []
+            for item in report["found"]:
+                case_data = item.pop("case")
+                # Scores come from one cached pass over all cases
+                case_data["priority_score"] = int(priority_scores.get(item["pv"], 0))
+                found_cases.append(case_data)
             
-            for num in numbers:
-                num = num.strip()
-                if not num:
-                    continue
-                
-                # Search for matching case by PV or CMS
-                case_found = False
-                
-                # Try PV match first
-                pv_match = df[df[1].astype(str) == num]
-                if not pv_match.empty:
-                    case_found = True
-                    row = pv_match.iloc[0]
-                else:
-                    # Try CMS match
-                    cms_match = df[df['CMS'].astype(str) == num]
-                    if not cms_match.empty:
-                        case_found = True
-                        row = cms_match.iloc[0]
-                
-                if case_found:
-                    case_info = self.case_manager.format_case(row)
-                    pv = str(case_info.get("PV", ""))
-                    
-                    # Check if already sent
-                    if pv in self.sent_pids or pv in self.session_sent_pids:
-                        already_sent.append(f"{num} (PV: {pv})")
-                        continue
-                    
-                    # Create case data object
-                    case_data = {
-                        "pv": pv,
-                        "name": case_info.get("Name", ""),
-                        "doi": case_info.get("DOI", ""),
-                        "cms": case_info.get("CMS", ""),
-                        "attorney_email": case_info.get("Attorney Email", ""),
-                        "law_firm": case_info.get("Law Firm", ""),
-                        "status": case_info.get("Status", ""),
-                        "full_case": case_info
-                    }
-                    
-                    # Calculate priority score
-                    priority_score = self.calculate_case_priority(case_data)
-                    case_data["priority_score"] = priority_score
-                    
-                    # Generate email content
-                    try:
-                        email = self.generate_email_content(case_data)
-                        emails.append(email)
-                    except Exception as e:
-                        logger.error(f"Error generating email for {num}: {e}")
-                        not_found.append(f"{num} (error generating email)")
-                else:
-                    not_found.append(num)
+            # Generate email content (cached emails are reused)
+            emails = self.generate_emails(found_cases, on_email=on_email)
+            generated = {str(email["pv"]) for email in emails}
+            report["failed"] = [item for item in report["found"] if item["pv"] not in generated]
             
             # Sort emails by priority score
             emails.sort(key=lambda x: x.get("case_data", {}).get("priority_score", 0), reverse=True)
+            self.last_number_report = report
             
             # Report results
-            print(f"\n📊 Batch preparation results:")
+            print(f"\n📊 Batch preparation results ({len(numbers)} numbers resolved in {report['elapsed_ms']} ms):")
             print(f"   ✅ Found and prepared: {len(emails)} emails")
-            if already_sent:
-                print(f"   ⏭️  Already sent (skipped): {len(already_sent)}")
-                for item in already_sent[:5]:  # Show first 5
-                    print(f"      - {item}")
-                if len(already_sent) > 5:
-                    print(f"      ... and {len(already_sent) - 5} more")
-            if not_found:
-                print(f"   ❌ Not found: {len(not_found)}")
-                for item in not_found[:5]:  # Show first 5
-                    print(f"      - {item}")
-                if len(not_found) > 5:
-                    print(f"      ... and {len(not_found) - 5} more")
+            sections = [
+                ("⏭️  Already sent (skipped)", [f"{i['input']} (PV: {i['pv']})" for i in report["already_sent"]]),
+                ("❓ Ambiguous (CMS matches several PVs)", [f"{i['input']} (PVs: {', '.join(i['pvs'])})" for i in report["ambiguous"]]),
+                ("❌ Not found", report["not_found"]),
+                ("⚠️  Error generating email", [f"{i['input']} (PV: {i['pv']})" for i in report["failed"]]),
+            ]
+            for label, items in sections:
+                if items:
+                    print(f"   {label}: {len(items)}")
+                    for item in items[:5]:  # Show first 5
+                        print(f"      - {item}")
+                    if len(items) > 5:
+                        print(f"      ... and {len(items) - 5} more")
             
             self.email_queue = emails
             return emails
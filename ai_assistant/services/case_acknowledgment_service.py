@@ -135,6 +135,21 @@ class CaseAcknowledgmentService:
         
         return True
     
+    def get_acknowledged_pvs(self) -> set:
+        """Snapshot of every currently acknowledged PV (expired snoozes excluded)"""
+        now = datetime.now()
+        acknowledged = set()
+        for pv, ack_data in self.acknowledged_cases.items():
+            review_after = ack_data.get("review_after")
+            if review_after:
+                try:
+                    if now > datetime.fromisoformat(review_after):
+                        continue
+                except Exception:
+                    pass
+            acknowledged.add(str(pv))
+        return acknowledged
+    
     def get_acknowledgment_info(self, pv: str) -> Optional[Dict]:
         """Get acknowledgment details for a case"""
         pv = str(pv)
@@ -0,0 +1,252 @@
+"""
+CMS HTTP Driver - Adds CMS notes by replaying the Collectors page form posts
+Logs in once with a persistent HTTP session (cookie jar) instead of driving a browser
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import time
+from urllib.parse import urljoin
+
+from config import Config
+from services.cms_integration import CMSIntegrationService, CMSCaseUpdateError, collectors_url
+
+try:
+    import requests
+    from urllib3.exceptions import InsecureRequestWarning
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    requests = None
+    REQUESTS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TOKEN_FIELD = "__RequestVerificationToken"
+TOKEN_PATTERNS = [
+    re.compile(r'name="%s"[^>]*value="([^"]+)"' % TOKEN_FIELD),
+    re.compile(r'value="([^"]+)"[^>]*name="%s"' % TOKEN_FIELD),
+]
+FORM_ACTION_PATTERN = re.compile(r'<form[^>]*action="([^"]+)"', re.IGNORECASE)
+
+
+class CMSSessionExpired(Exception):
+    """The CMS answered with its login form or a 401 - log in again"""
+
+
+class CMSHttpDriver(CMSIntegrationService):
+    """
+    Same interface as the browser service (add_notes, reset_page, open_worker_page, ...) over plain HTTP
+
+    The anti-forgery token is scraped from the login and Collectors pages and sent with
+    each post, the way the page's own script does. The endpoint paths and form fields
+    match utils/mock_cms_server.py and have not been checked against the production CMS,
+    so the driver is only used with CMS_HTTP_DRIVER_ENABLED; the browser service stays
+    the default and the fallback.
+    """
+
+    driver = "http"
+
+    def __init__(self, base_url=None, verify_tls=None):
+        super().__init__(use_persistent_session=False)
+        if base_url:
+            self.login_url = base_url.rstrip("/")
+        self.collectors_url = collectors_url(self.login_url)
+        self.search_url = f"{self.login_url.rstrip('/')}/Collecter/Search"
+        self.add_note_url = f"{self.login_url.rstrip('/')}/Collecter/AddNote"
+        self.update_case_url = f"{self.login_url.rstrip('/')}/Collecter/UpdateCase"
+        self.verify_tls = Config.CMS_VERIFY_TLS if verify_tls is None else verify_tls
+        self.timeout = Config.CMS_STEP_TIMEOUT_MS / 1000
+        self.session = None
+        self.token = None
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking requests call off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    def _new_session(self):
+        session = requests.Session()
+        session.verify = self.verify_tls
+        session.headers.update({"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"})
+        return session
+
+    @staticmethod
+    def _scrape_token(page_html):
+        for pattern in TOKEN_PATTERNS:
+            match = pattern.search(page_html)
+            if match:
+                return match.group(1)
+        return None
+
+    @staticmethod
+    def _is_login_page(page_html):
+        return 'name="UserName"' in page_html
+
+    def _login(self):
+        """Post the login form, then load the Collectors page for its token"""
+        response = self.session.get(self.login_url, timeout=self.timeout)
+        response.raise_for_status()
+        if not self._is_login_page(response.text):
+            # Cookie jar still holds a valid session
+            self._refresh_token()
+            return
+
+        token = self._scrape_token(response.text)
+        action = FORM_ACTION_PATTERN.search(response.text)
+        if not token or not action:
+            raise Exception("CMS login page has no login form/token - use the browser driver")
+
+        form = {"UserName": self.username, "Password": self.password, TOKEN_FIELD: token}
+        response = self.session.post(urljoin(response.url, action.group(1)), data=form, timeout=self.timeout)
+        response.raise_for_status()
+        if self._is_login_page(response.text):
+            raise Exception("CMS login failed - check CMS_USERNAME/CMS_PASSWORD")
+        self._refresh_token()
+
+    def _refresh_token(self):
+        """Load the Collectors page and keep its anti-forgery token"""
+        response = self.session.get(self.collectors_url, timeout=self.timeout)
+        response.raise_for_status()
+        if self._is_login_page(response.text):
+            raise CMSSessionExpired("CMS shows the login form - session expired")
+        token = self._scrape_token(response.text)
+        if not token:
+            raise Exception("Collectors page has no request token - use the browser driver")
+        self.token = token
+
+    def _post(self, url, data):
+        """Form post with the token; JSON answer or CMSSessionExpired"""
+        response = self.session.post(url, data=dict(data, **{TOKEN_FIELD: self.token}), timeout=self.timeout)
+        if response.status_code == 401 or self._is_login_page(response.text):
+            raise CMSSessionExpired(f"CMS session expired ({url})")
+        response.raise_for_status()
+        result = response.json()
+        if isinstance(result, dict) and result.get("success") is False:
+            raise Exception(result.get("error") or f"CMS rejected the post to {url}")
+        return result
+
+    async def start_session(self):
+        """Log into CMS once; later requests reuse the session cookie"""
+        if not REQUESTS_AVAILABLE:
+            raise Exception("requests is not installed - pip install requests")
+        try:
+            logger.info("Logging into CMS over HTTP...")
+            self.session = self._new_session()
+            if not self.verify_tls:
+                # CMS_VERIFY_TLS=false is an explicit opt-out - only its warning is silenced
+                logger.warning("⚠️ CMS certificate verification is off (CMS_VERIFY_TLS=false)")
+                requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+            await self._call(self._login)
+            self.logged_in = True
+            logger.info("✅ CMS HTTP session started and logged in")
+        except Exception as e:
+            logger.error(f"Error starting CMS HTTP session: {e}")
+            await self.cleanup()
+            raise
+
+    async def cleanup(self):
+        """Close this driver's connections (worker drivers share only the cookies)"""
+        try:
+            if self.session:
+                self.session.close()
+        finally:
+            self.session = None
+            self.token = None
+            self.logged_in = False
+
+    async def open_worker_page(self):
+        """Another driver with its own connection pool and token on the same logged-in cookies"""
+        if not self.logged_in or not self.session:
+            raise Exception("CMS session not started. Call start_session() first.")
+        worker = CMSHttpDriver(base_url=self.login_url, verify_tls=self.verify_tls)
+        worker.session = worker._new_session()
+        worker.session.cookies.update(self.session.cookies)
+        await worker._call(worker._refresh_token)
+        worker.logged_in = True
+        worker.owns_browser = False
+        return worker
+
+    async def reset_page(self):
+        """Fresh token from the Collectors page, logging in again if the session expired"""
+        try:
+            await self._call(self._refresh_token)
+        except CMSSessionExpired:
+            logger.warning("🔐 CMS HTTP session expired - logging in again")
+            await self._call(self._login)
+
+    async def is_session_healthy(self):
+        if not self.logged_in or self.session is None:
+            return False
+        try:
+            await self.reset_page()
+            return True
+        except Exception as e:
+            logger.warning(f"❌ CMS HTTP session check failed: {e}")
+            return False
+
+    def _add_notes(self, cms_number, notes, timings):
+        """(notes posted, case update error or None) - a failed note stops the visit before the update"""
+        added = 0
+        step_started = time.perf_counter()
+
+        def mark(step):
+            nonlocal step_started
+            now = time.perf_counter()
+            timings[step] = timings.get(step, 0) + round((now - step_started) * 1000)
+            step_started = now
+
+        try:
+            response = self.session.get(self.search_url, params={"pid": str(cms_number)}, timeout=self.timeout)
+            if response.status_code == 401:
+                raise CMSSessionExpired("CMS session expired (search)")
+            response.raise_for_status()
+            if not response.json().get("found"):
+                raise Exception(f"CMS case {cms_number} not found")
+            mark("search")
+
+            for note_text, note_type in notes:
+                self._post(self.add_note_url, {
+                    "PID": str(cms_number),
+                    "NoteType": note_type or self.default_note_type,
+                    "AddNote": note_text,
+                    "NextCntDate": self.next_contact_date,
+                })
+                added += 1
+                mark("add_note")
+
+        except Exception as e:
+            logger.error(f"Error adding notes to CMS case {cms_number} over HTTP ({added}/{len(notes)} added): {e}")
+            return added, None
+
+        try:
+            self._post(self.update_case_url, {"PID": str(cms_number)})
+            mark("update_case")
+        except Exception as e:
+            logger.error(f"Error updating CMS case {cms_number} over HTTP after {added} note(s): {e}")
+            return added, e
+        return added, None
+
+    async def add_notes(self, cms_number, notes):
+        """
+        Add several notes to one case: one search, one post per note, one case update
+
+        Returns how many notes were posted; raises CMSCaseUpdateError if they all were
+        but the case update failed.
+        """
+        if not self.logged_in or not self.session:
+            raise Exception("CMS session not started. Call start_session() first.")
+
+        timings = {}
+        started = time.perf_counter()
+        added, update_error = await self._call(self._add_notes, cms_number, notes, timings)
+        timings["total"] = round((time.perf_counter() - started) * 1000)
+        if update_error is not None:
+            self.last_note_timings = timings
+            raise CMSCaseUpdateError(added, update_error)
+        if added == len(notes):
+            self._record_timings(timings)
+            logger.info(f"✅ {added} note(s) added to CMS case {cms_number} over HTTP in {timings['total']} ms")
+        else:
+            self.last_note_timings = timings
+        return added
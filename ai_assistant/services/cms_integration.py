@@ -6,37 +6,32 @@ CMS Integration Service - Adds notes to CMS system when emails are sent
 import logging
 import os
 import time
-import re
 from datetime import datetime, timedelta
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from config import Config
+from services.cms_note_queue import (
+    get_cms_note_queue, PENDING, IN_PROGRESS, DONE, FAILED, RUNNING, INTERRUPTED, COMPLETED
+)
 
 logger = logging.getLogger(__name__)
 
-# Session logging paths - these persist across program restarts
-SESSION_EMAILS_PENDING_LOG = "session_emails_pending.log"  # Emails waiting for CMS notes
-SESSION_EMAILS_PROCESSED_LOG = "session_emails_processed.log"  # Emails with CMS notes added
-SESSION_CMS_NOTES_LOG = "session_cms_notes.log"  # All CMS notes added
+class CMSCaseUpdateError(Exception):
+    """Every note of a visit was submitted but the case update afterwards failed"""
+    
+    def __init__(self, added, error):
+        super().__init__(f"{added} note(s) added but the case update failed: {error}")
+        self.added = added
+
+def collectors_url(base_url=None):
+    """Collectors page under a CMS base URL (production or utils/mock_cms_server.py)"""
+    return f"{(base_url or Config.CMS_BASE_URL).rstrip('/')}/Collecter/AddCollecter"
 
 def log_session_email(pid, recipient_email, email_type="FOLLOW-UP"):
     """Log email sent - goes to PENDING queue until CMS note is added"""
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] PID: {pid} | Email Type: {email_type} | Sent to: {recipient_email}\n"
-        
-        # Add to pending queue (these need CMS notes)
-        with open(SESSION_EMAILS_PENDING_LOG, "a", encoding="utf-8") as f:
-            f.write(log_entry)
-            f.flush()  # Force write to disk
-        
+        get_cms_note_queue().enqueue(pid, recipient_email, email_type)
         logger.info(f"📧 Email logged to pending queue: PID {pid} → {recipient_email}")
-        
-        # Verify it was written
-        if os.path.exists(SESSION_EMAILS_PENDING_LOG):
-            size = os.path.getsize(SESSION_EMAILS_PENDING_LOG)
-            logger.info(f"[DEBUG] Pending log file size after write: {size} bytes")
-        
     except Exception as e:
         logger.error(f"❌ Failed to log session email: {e}")
         import traceback
@@ -45,129 +40,78 @@ def log_session_email(pid, recipient_email, email_type="FOLLOW-UP"):
 def log_acknowledgment_note(pid, note_text):
     """Log acknowledgment note - goes to PENDING queue until CMS note is added"""
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Store acknowledgment notes with special type and the note text as the recipient field
-        log_entry = f"[{timestamp}] PID: {pid} | Email Type: ACKNOWLEDGMENT | Sent to: {note_text}\n"
-        
-        # Add to pending queue (these need CMS notes)
-        with open(SESSION_EMAILS_PENDING_LOG, "a", encoding="utf-8") as f:
-            f.write(log_entry)
-            f.flush()  # Force write to disk
-        
+        # Acknowledgment notes carry the note text in the recipient field
+        get_cms_note_queue().enqueue(pid, note_text, "ACKNOWLEDGMENT")
         logger.info(f"✅ Acknowledgment note logged to pending queue: PID {pid}")
-        
-        # Verify it was written
-        if os.path.exists(SESSION_EMAILS_PENDING_LOG):
-            size = os.path.getsize(SESSION_EMAILS_PENDING_LOG)
-            logger.info(f"[DEBUG] Pending log file size after write: {size} bytes")
-        
     except Exception as e:
         logger.error(f"❌ Failed to log acknowledgment note: {e}")
         import traceback
         traceback.print_exc()
 
-def log_cms_note_added(pid, recipient_email, email_type="FOLLOW-UP"):
-    """Log CMS note added and move email from pending to processed"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Add to CMS notes log
-    cms_log_entry = f"[{timestamp}] CMS NOTE ADDED - PID: {pid} | Email Type: {email_type} | Sent to: {recipient_email}\n"
-    with open(SESSION_CMS_NOTES_LOG, "a", encoding="utf-8") as f:
-        f.write(cms_log_entry)
-    
-    # Move from pending to processed
-    move_email_to_processed(pid, recipient_email, email_type, timestamp)
-    
+def log_cms_note_added(pid, recipient_email, email_type="FOLLOW-UP", item_id=None):
+    """Mark a pending note processed - by queue id, or every pending entry for this exact PID and recipient"""
+    queue = get_cms_note_queue()
+    if item_id is not None:
+        queue.ack([item_id])
+    else:
+        queue.ack_matching(pid, recipient_email)
     logger.info(f"✅ CMS note added and email moved to processed: PID {pid} → {recipient_email}")
 
-def move_email_to_processed(pid, recipient_email, email_type, timestamp):
-    """Move an email from pending to processed queue"""
-    # Read all pending emails
-    pending_emails = []
-    if os.path.exists(SESSION_EMAILS_PENDING_LOG):
-        with open(SESSION_EMAILS_PENDING_LOG, "r", encoding="utf-8") as f:
-            pending_emails = f.readlines()
-    
-    # Find and remove the processed email from pending
-    remaining_emails = []
-    processed_entry = None
-    
-    for line in pending_emails:
-        if f"PID: {pid}" in line and recipient_email in line:
-            # Found the email to move - save it for processed log
-            processed_entry = f"[{timestamp}] PROCESSED - PID: {pid} | Email Type: {email_type} | Sent to: {recipient_email}\n"
-        else:
-            # Keep this email in pending
-            remaining_emails.append(line)
-    
-    # Rewrite pending log without the processed email
-    with open(SESSION_EMAILS_PENDING_LOG, "w", encoding="utf-8") as f:
-        f.writelines(remaining_emails)
-    
-    # Add to processed log
-    if processed_entry:
-        with open(SESSION_EMAILS_PROCESSED_LOG, "a", encoding="utf-8") as f:
-            f.write(processed_entry)
-
 def load_pending_emails():
-    """Load emails that still need CMS notes added"""
-    if not os.path.exists(SESSION_EMAILS_PENDING_LOG):
-        return {}
-    
+    """Load emails that still need CMS notes added, grouped by PID (oldest first)"""
     pid_email_map = {}
-    pattern = r"PID:\s*(\d+)\s*\|\s*Email Type:\s*([^|]+)\s*\|\s*Sent to:\s*(.+)"
-    
-    with open(SESSION_EMAILS_PENDING_LOG, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            match = re.search(pattern, line)
-            if match:
-                pid = match.group(1).strip()
-                email_type = match.group(2).strip()
-                email = match.group(3).strip()
-                pid_email_map[pid] = {
-                    'email': email,
-                    'email_type': email_type
-                }
-    
+    for item in get_cms_note_queue().pending():
+        pid_email_map.setdefault(item['pid'], []).append({
+            'id': item['id'],
+            'email': item['recipient'],
+            'email_type': item['email_type']
+        })
     return pid_email_map
 
+def note_for_entry(email, email_type):
+    """(note text, note type) for a pending entry; None note type means the default"""
+    kind = email_type.lower()
+    if kind == "follow-up":
+        return f"FOLLOW UP EMAIL SENT TO {email.upper()}", "COR"
+    if kind == "status_request":
+        return f"STATUS REQUEST SENT TO {email.upper()}", "COR"
+    if kind == "acknowledgment":
+        # For acknowledgments, the 'email' field contains the note text ("NA" is the None note type)
+        return email, "NA"
+    if "test_" in kind:
+        if "TEST MODE" in email:
+            # Format: "TEST MODE - Email sent to test@email.com (intended for attorney@firm.com)"
+            return f"(TEST MODE) EMAIL SENT TO {email}", None
+        return f"(TEST MODE) {email_type.replace('test_', '').replace('_', ' ').upper()} - {email.upper()}", None
+    return f"{email_type.upper()} SENT TO {email.upper()}", "COR"
+
+def coalesce_notes(entries, mode=None):
+    """
+    Notes to add for one PID's pending entries, as [(note text, note type, [entry ids])]
+    
+    "separate" adds one note per entry; "combine" joins entries of the same note
+    type into a single note, one line each.
+    """
+    mode = (mode or Config.CMS_NOTE_COALESCE).lower()
+    notes = [(*note_for_entry(entry['email'], entry['email_type']), [entry['id']]) for entry in entries]
+    if mode != "combine":
+        return notes
+    
+    combined = {}
+    for text, note_type, ids in notes:
+        texts, all_ids = combined.setdefault(note_type, ([], []))
+        texts.append(text)
+        all_ids.extend(ids)
+    return [("\n".join(texts), note_type, ids) for note_type, (texts, ids) in combined.items()]
+
 def get_session_stats():
     """Get statistics about emails and CMS notes"""
-    pending_count = 0
-    processed_count = 0
-    notes_added_count = 0
-    
-    # Count pending emails
-    if os.path.exists(SESSION_EMAILS_PENDING_LOG):
-        with open(SESSION_EMAILS_PENDING_LOG, "r", encoding="utf-8") as f:
-            pending_count = len([line for line in f if "PID:" in line])
-    
-    # Count processed emails  
-    if os.path.exists(SESSION_EMAILS_PROCESSED_LOG):
-        with open(SESSION_EMAILS_PROCESSED_LOG, "r", encoding="utf-8") as f:
-            processed_count = len([line for line in f if "PROCESSED" in line])
-    
-    # Count CMS notes added
-    if os.path.exists(SESSION_CMS_NOTES_LOG):
-        with open(SESSION_CMS_NOTES_LOG, "r", encoding="utf-8") as f:
-            notes_added_count = len([line for line in f if "CMS NOTE ADDED" in line])
-    
-    total_emails = pending_count + processed_count
-    
-    # Return a dictionary instead of tuple for GUI compatibility
-    return {
-        'pending_count': pending_count,
-        'processed_count': processed_count,
-        'total_emails': total_emails,
-        'notes_added_count': notes_added_count
-    }
+    # Counters are maintained with each enqueue/ack, so this never scans the queue
+    return get_cms_note_queue().stats()
 
 def clear_session_logs():
     """Clear all session logs - use with caution!"""
-    for log_file in [SESSION_EMAILS_PENDING_LOG, SESSION_EMAILS_PROCESSED_LOG, SESSION_CMS_NOTES_LOG]:
-        if os.path.exists(log_file):
-            os.remove(log_file)
+    get_cms_note_queue().clear()
     logger.info("🗑️ All session logs cleared")
 
 class CMSIntegrationService:
@@ -180,11 +124,14 @@ class CMSIntegrationService:
     _persistent_logged_in = False
     _persistent_playwright = None
     
+    driver = "browser"  # CMS_NOTE_DRIVER name ("http" is services/cms_http_driver.py)
+    
     def __init__(self, use_persistent_session=True):
         # CMS credentials - should be in config.env
         self.username = os.getenv("CMS_USERNAME", "Dean")
         self.password = os.getenv("CMS_PASSWORD", "Dean3825")
-        self.login_url = "https://cms.transconfinancialinc.com/CMS"
+        self.login_url = Config.CMS_BASE_URL
+        self.headless = Config.CMS_HEADLESS
         
         # Note configuration - default to COR for emails, but can be overridden
         self.default_note_type = "COR"  # Correspondence for emails
@@ -198,6 +145,17 @@ class CMSIntegrationService:
         self.context = None
         self.page = None
         self.logged_in = False
+        self.owns_browser = True  # False for worker tabs sharing another service's browser
+        
+        # CMS pages and the row a PID search shows (adjustable for other CMS layouts).
+        # The PID cell must match exactly: the previous search's row stays in the table until the
+        # new results render, and a substring match could accept it and add notes to the wrong case.
+        self.collectors_url = collectors_url(self.login_url)
+        self.search_result_selector = "table tr:has(td:text-is('{pid}'))"
+        
+        # Per-step add_note times in milliseconds
+        self.last_note_timings = {}
+        self.step_timings = {}
     
     async def _handle_certificate_popup(self):
         """Comprehensive certificate popup handling with multiple approaches"""
@@ -451,7 +409,7 @@ class CMSIntegrationService:
             
             cls._persistent_playwright = await async_playwright().start()
             cls._persistent_browser = await cls._persistent_playwright.chromium.launch(
-                headless=False,  # Must be visible for manual certificate dismissal
+                headless=Config.CMS_HEADLESS,  # Keep visible for manual certificate dismissal on the real CMS
                 args=[
                     # Certificate and SSL handling
                     "--ignore-certificate-errors",
@@ -506,7 +464,7 @@ class CMSIntegrationService:
             logger.warning("⚠️  CERTIFICATE POPUP WILL APPEAR - PLEASE CLICK 'CANCEL' MANUALLY")
             logger.info("    (This is a one-time setup - popup won't appear again)")
             
-            await cls._persistent_page.goto("https://cms.transconfinancialinc.com/CMS", timeout=120000)
+            await cls._persistent_page.goto(Config.CMS_BASE_URL, timeout=120000)
             
             # Wait for user to manually dismiss certificate popup and login form to appear
             logger.info("⏳ Waiting for certificate popup dismissal and login form...")
@@ -557,6 +515,16 @@ class CMSIntegrationService:
                     pass
             cls._persistent_playwright = None
     
+    @staticmethod
+    async def _page_healthy(page):
+        """A page is usable if it is open and still shows the Collectors search field (not the login form)"""
+        if page is None or page.is_closed():
+            return False
+        if await page.locator('input[name="UserName"]').count() > 0:
+            logger.warning("❌ CMS shows the login form - session expired")
+            return False
+        return await page.locator('input#txtSearch').count() > 0
+    
     @classmethod
     async def is_persistent_session_healthy(cls):
         """Simplified check: can we use the search field?"""
@@ -568,12 +536,9 @@ class CMSIntegrationService:
                 logger.warning("❌ No persistent session available")
                 return False
             
-            # Quick test: can we find and count the search field?
+            # Quick test: can we find the search field?
             try:
-                search_field = cls._persistent_page.locator('input#txtSearch')
-                element_count = await search_field.count()
-                
-                if element_count > 0:
+                if await cls._page_healthy(cls._persistent_page):
                     logger.info("✅ Search field found - persistent session is healthy")
                     return True
                 else:
@@ -597,6 +562,17 @@ class CMSIntegrationService:
             logger.error(f"❌ Health check failed: {e}")
             return False
     
+    async def is_session_healthy(self):
+        """Same check as is_persistent_session_healthy for this service's own page (reloads it first)"""
+        if not self.logged_in or self.page is None:
+            return False
+        try:
+            await self.reset_page()
+            return await self._page_healthy(self.page)
+        except Exception as e:
+            logger.warning(f"❌ CMS session check failed: {e}")
+            return False
+    
     async def start_session(self):
         """Start browser session and log into CMS (or use persistent session)"""
         try:
@@ -628,7 +604,7 @@ class CMSIntegrationService:
             
             playwright = await async_playwright().start()
             self.browser = await playwright.chromium.launch(
-                headless=False,  # Set to True for production
+                headless=self.headless,  # CMS_HEADLESS (e.g. against the mock CMS)
                 args=[
                     # Certificate and SSL handling
                     "--ignore-certificate-errors",
@@ -692,12 +668,16 @@ class CMSIntegrationService:
                 # Handle certificate dialog that appears during navigation
                 await self._handle_client_certificate_dialog()
             
-            # Run navigation and certificate handling concurrently
-            logger.info("🚀 Starting concurrent navigation and certificate handling...")
-            await asyncio.gather(
-                navigate_to_cms(),
-                handle_cert_dialog_during_navigation()
-            )
+            if self.headless:
+                # No certificate dialog can be shown (or dismissed) without a window
+                await navigate_to_cms()
+            else:
+                # Run navigation and certificate handling concurrently
+                logger.info("🚀 Starting concurrent navigation and certificate handling...")
+                await asyncio.gather(
+                    navigate_to_cms(),
+                    handle_cert_dialog_during_navigation()
+                )
                 
             await self.page.fill('input[name="UserName"]', self.username)
             await self.page.fill('input[name="Password"]', self.password)
@@ -718,9 +698,12 @@ class CMSIntegrationService:
             raise
     
     async def cleanup(self):
-        """Close browser session"""
+        """Close browser session (worker tabs only close their own page)"""
         try:
-            if self.browser:
+            if not self.owns_browser:
+                if self.page:
+                    await self.page.close()
+            elif self.browser:
                 await self.browser.close()
                 logger.info("CMS browser session closed")
         except Exception as e:
@@ -731,6 +714,27 @@ class CMSIntegrationService:
             self.page = None
             self.logged_in = False
     
+    async def open_worker_page(self):
+        """Another service on a new tab of this logged-in browser context (for concurrent note entry)"""
+        if not self.logged_in or not self.context:
+            raise Exception("CMS session not started. Call start_session() first.")
+        
+        worker = CMSIntegrationService(use_persistent_session=False)
+        worker.browser = self.browser
+        worker.context = self.context
+        worker.page = await self.context.new_page()
+        worker.page.on("dialog", lambda dialog: dialog.dismiss())
+        worker.collectors_url = self.collectors_url
+        worker.search_result_selector = self.search_result_selector
+        await worker.page.goto(worker.collectors_url, wait_until="domcontentloaded", timeout=30000)
+        worker.logged_in = True
+        worker.owns_browser = False
+        return worker
+    
+    async def reset_page(self):
+        """Reload the Collectors page after a failed note"""
+        await self.page.goto(self.collectors_url, wait_until="domcontentloaded", timeout=30000)
+    
     async def add_note(self, cms_number, note_text, note_type=None):
         """Add a note to a specific case in CMS
         
@@ -739,24 +743,51 @@ class CMSIntegrationService:
             note_text: The text of the note to add
             note_type: The note type code (e.g., "COR", "NA"). If None, uses default
         """
+        try:
+            return await self.add_notes(cms_number, [(note_text, note_type)]) == 1
+        except CMSCaseUpdateError:
+            return False
+    
+    async def add_notes(self, cms_number, notes):
+        """Add several notes to one case in a single visit (one search, one case update)
+        
+        Each step waits for the page to be ready (search result row, note form,
+        server response to the submit) instead of sleeping a fixed time; the
+        per-step times of the last visit are kept in self.last_note_timings.
+        
+        Args:
+            cms_number: The CMS/PID number for the case
+            notes: [(note text, note type or None for the default)] in order
+        
+        Returns:
+            int: How many of the notes were submitted (they are always added in order)
+        
+        Raises:
+            CMSCaseUpdateError: All notes were submitted but the case update failed
+        """
         if not self.logged_in:
             raise Exception("CMS session not started. Call start_session() first.")
         
-        # Use provided note type or default
-        note_type_value = note_type if note_type else self.default_note_type
+        timeout = Config.CMS_STEP_TIMEOUT_MS
+        timings = {}
+        added = 0
+        started = step_started = time.perf_counter()
+        
+        def mark(step):
+            nonlocal step_started
+            now = time.perf_counter()
+            timings[step] = timings.get(step, 0) + round((now - step_started) * 1000)
+            step_started = now
         
         try:
-            logger.info(f"Adding note to CMS case {cms_number}")
+            logger.info(f"Adding {len(notes)} note(s) to CMS case {cms_number}")
             
-            # Check if page object is valid before using it
-            logger.info(f"Page object exists: {self.page is not None}")
             if self.page is None:
                 raise Exception("Page object is None - session corrupted")
             
             # Try to get URL to test if connection works
             try:
                 current_url = self.page.url
-                logger.info(f"Current URL: {current_url}")
             except Exception as url_error:
                 logger.error(f"Cannot access page URL: {url_error}")
                 raise Exception(f"Page connection broken: {url_error}")
@@ -764,102 +795,111 @@ class CMSIntegrationService:
             # Ensure we're on the correct page
             if "AddCollecter" not in current_url:
                 logger.info("Navigating to Collectors page...")
-                await self.page.goto("https://cms.transconfinancialinc.com/CMS/Collecter/AddCollecter", timeout=30000)
-                await asyncio.sleep(2)
+                await self.page.goto(self.collectors_url, wait_until="domcontentloaded", timeout=30000)
+            search_field = self.page.locator('input#txtSearch')
+            await search_field.wait_for(state="visible", timeout=timeout)
+            mark("ready")
             
-            # Search for the CMS number (PID) - try multiple methods
-            logger.info(f"Attempting to fill search field with: {cms_number}")
+            # Search for the CMS number (PID) and wait for its result row
+            await search_field.fill(str(cms_number))
+            await search_field.press('Enter')
+            await self._wait_for_search_result(cms_number, timeout)
+            mark("search")
             
-            search_filled = False
-            
-            # Method 1: Try using fill() directly
-            try:
-                logger.info("Method 1: Using fill() on search field...")
-                await self.page.fill('input#txtSearch', str(cms_number))
-                await asyncio.sleep(0.5)
-                search_filled = True
-            except Exception as e1:
-                logger.warning(f"Method 1 failed: {e1}")
+            for note_text, note_type in notes:
+                # Click "Add" button to add note and wait for the note form
+                await self.page.click("button:has-text('Add')", timeout=timeout)
+                await self.page.locator("#NoteType").wait_for(state="visible", timeout=timeout)
+                mark("open_form")
                 
-                # Method 2: Try clicking then typing
-                try:
-                    logger.info("Method 2: Click and type...")
-                    await self.page.click('input#txtSearch')
-                    await asyncio.sleep(0.5)
-                    await self.page.keyboard.press('Control+a')
-                    await self.page.keyboard.type(str(cms_number))
-                    await asyncio.sleep(0.5)
-                    search_filled = True
-                except Exception as e2:
-                    logger.warning(f"Method 2 failed: {e2}")
-                    
-                    # Method 3: Try using locator
-                    try:
-                        logger.info("Method 3: Using locator...")
-                        search_field = self.page.locator('input#txtSearch')
-                        await search_field.fill(str(cms_number))
-                        await asyncio.sleep(0.5)
-                        search_filled = True
-                    except Exception as e3:
-                        logger.error(f"Method 3 failed: {e3}")
-                        raise Exception(f"All search field methods failed. Last error: {e3}")
-            
-            logger.info("Search field filled, pressing Enter...")
-            await self.page.keyboard.press('Enter')
-            await asyncio.sleep(2)
-            
-            # Click "Add" button to add note
-            await self.page.click("button:has-text('Add')")
-            await asyncio.sleep(1)
-            
-            # Fill the note form
-            await self.page.select_option("#NoteType", note_type_value)
-            await self.page.fill("#AddNote", note_text)
-            await self.page.fill("#NextCntDate", self.next_contact_date)
+                # Fill the note form
+                await self.page.select_option("#NoteType", note_type or self.default_note_type)
+                await self.page.fill("#AddNote", note_text)
+                await self.page.fill("#NextCntDate", self.next_contact_date)
+                mark("fill")
+                
+                # Submit the note once the server has answered
+                await self._click_and_wait_for_response("#btnAddNote", timeout)
+                added += 1
+                mark("add_note")
             
-            # Submit note and update case
-            await self.page.click("#btnAddNote")
-            await asyncio.sleep(1)
-            await self.page.click("#btnUpdateCase")
+            # Update the case once for all notes
+            try:
+                await self._click_and_wait_for_response("#btnUpdateCase", timeout)
+            except Exception as e:
+                raise CMSCaseUpdateError(added, e) from e
+            mark("update_case")
             
-            logger.info(f"✅ Note added to CMS case {cms_number}")
-            return True
+            timings["total"] = round((time.perf_counter() - started) * 1000)
+            self._record_timings(timings)
+            logger.info(f"✅ {added} note(s) added to CMS case {cms_number} in {timings['total']} ms "
+                        f"({', '.join(f'{step} {ms}' for step, ms in timings.items() if step != 'total')})")
+            return added
             
+        except CMSCaseUpdateError as e:
+            timings["total"] = round((time.perf_counter() - started) * 1000)
+            self.last_note_timings = timings
+            logger.error(f"Error updating CMS case {cms_number}: {e}")
+            raise
         except Exception as e:
-            logger.error(f"Error adding note to CMS case {cms_number}: {e}")
-            return False
+            timings["total"] = round((time.perf_counter() - started) * 1000)
+            self.last_note_timings = timings
+            logger.error(f"Error adding notes to CMS case {cms_number} ({added}/{len(notes)} added): {e}")
+            return added
+    
+    async def _wait_for_search_result(self, cms_number, timeout):
+        """Wait for the row whose PID cell is exactly this case; the PID fails if it never shows up"""
+        try:
+            await self.page.locator(self.search_result_selector.format(pid=cms_number)).first.wait_for(
+                state="visible", timeout=timeout
+            )
+        except PlaywrightTimeoutError:
+            raise Exception(f"No search result row for {cms_number} within {timeout} ms")
+    
+    async def _click_and_wait_for_response(self, selector, timeout):
+        """Click a submit button and wait for the POST it triggers; raises unless the server answered OK"""
+        try:
+            async with self.page.expect_response(
+                lambda response: response.request.method == "POST", timeout=timeout
+            ) as response_info:
+                await self.page.click(selector, timeout=timeout)
+        except PlaywrightTimeoutError:
+            # Nothing reached the server - the caller must not count this submit
+            raise Exception(f"No server response after clicking {selector} within {timeout} ms")
+        response = await response_info.value
+        if response.status >= 400:  # redirects after a form post are fine
+            raise Exception(f"CMS answered {response.status} after clicking {selector}")
+    
+    def _record_timings(self, timings):
+        """Keep the last note's step times and running totals for timing_summary()"""
+        self.last_note_timings = timings
+        for step, ms in timings.items():
+            total, count = self.step_timings.get(step, (0, 0))
+            self.step_timings[step] = (total + ms, count + 1)
+    
+    def timing_summary(self):
+        """Average milliseconds per add_note step over this session"""
+        return {step: round(total / count) for step, (total, count) in self.step_timings.items() if count}
     
     async def add_follow_up_note(self, cms_number, recipient_email):
         """Add a follow-up email note"""
-        note_text = f"FOLLOW UP EMAIL SENT TO {recipient_email.upper()}"
-        return await self.add_note(cms_number, note_text, note_type="COR")
+        return await self.add_note(cms_number, *note_for_entry(recipient_email, "FOLLOW-UP"))
     
     async def add_status_request_note(self, cms_number, recipient_email):
         """Add a status request email note"""
-        note_text = f"STATUS REQUEST SENT TO {recipient_email.upper()}"
-        return await self.add_note(cms_number, note_text, note_type="COR")
+        return await self.add_note(cms_number, *note_for_entry(recipient_email, "STATUS_REQUEST"))
     
     async def add_general_email_note(self, cms_number, recipient_email, email_type="EMAIL"):
         """Add a general email note"""
-        note_text = f"{email_type.upper()} SENT TO {recipient_email.upper()}"
-        return await self.add_note(cms_number, note_text, note_type="COR")
+        return await self.add_note(cms_number, *note_for_entry(recipient_email, email_type))
     
     async def add_acknowledgment_note(self, cms_number, note_text):
         """Add an acknowledgment note with 'None' note type"""
-        # Use "NA" for None note type as per dropdown options
-        return await self.add_note(cms_number, note_text, note_type="NA")
+        return await self.add_note(cms_number, *note_for_entry(note_text, "ACKNOWLEDGMENT"))
     
     async def add_test_email_note(self, cms_number, recipient_info, email_type="test_bulk_status_request"):
         """Add a test email note with clear TEST MODE indication"""
-        # recipient_info contains the test mode details
-        if "TEST MODE" in recipient_info:
-            # Format: "TEST MODE - Email sent to test@email.com (intended for attorney@firm.com)"
-            note_text = f"(TEST MODE) EMAIL SENT TO {recipient_info}"
-        else:
-            # Fallback format for test emails
-            note_text = f"(TEST MODE) {email_type.replace('test_', '').replace('_', ' ').upper()} - {recipient_info.upper()}"
-        
-        return await self.add_note(cms_number, note_text)
+        return await self.add_note(cms_number, *note_for_entry(recipient_info, email_type))
 
 # Convenience functions for one-off notes (now just logs for batch processing)
 async def add_cms_note_for_email(case_info, email_type, recipient_email):
@@ -899,12 +939,160 @@ async def add_cms_note_for_email(case_info, email_type, recipient_email):
     
     return True
 
+async def _note_worker(name, cms_service, work, counts, retries, delay, run_id, session_lost):
+    """
+    Take PIDs off the shared work queue and add all their notes in one visit, retrying on that tab
+    
+    Every item is checkpointed on the run. If a PID still fails after its retries and the
+    session turns out to be dead (closed browser, expired login), its remaining notes go back
+    on the work queue and session_lost is set so the batch can log in again.
+    """
+    queue = get_cms_note_queue()
+    while not session_lost.is_set():
+        try:
+            pid, entries = work.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        
+        notes = coalesce_notes(entries)
+        queue.mark_run_items(run_id, [entry['id'] for entry in entries], IN_PROGRESS)
+        logger.info(f"🔄 [{name}] Processing PID {pid}: {len(entries)} pending → {len(notes)} note(s)")
+        
+        done = 0
+        updated = False
+        error = None
+        for attempt in range(1 + retries):
+            remaining_notes = notes[done:]
+            try:
+                # Notes are added in order, so a retry only needs the ones not yet submitted
+                # (with none left it only searches the case and updates it)
+                added = await cms_service.add_notes(pid, [(text, note_type) for text, note_type, _ in remaining_notes])
+                done += added
+                updated = added == len(remaining_notes)
+            except CMSCaseUpdateError as e:
+                done += e.added
+                error = e
+            except Exception as e:
+                error = e
+            if updated:
+                break
+            if attempt < retries:
+                logger.warning(f"⚠️ [{name}] Retrying PID {pid} (attempt {attempt + 2}/{retries + 1})")
+                try:
+                    await cms_service.reset_page()
+                except Exception as e:
+                    error = e
+        
+        # Mark every entry behind a submitted note processed together
+        acked = [item_id for _, _, ids in notes[:done] for item_id in ids]
+        if updated:
+            queue.ack(acked)
+            queue.mark_run_items(run_id, acked, DONE)
+            counts['success'] += len(acked)
+            logger.info(f"✅ [{name}] CMS notes added for PID {pid} ({len(acked)} entries)")
+        elif done == len(notes):
+            # The notes are in CMS (acked so they are never added twice) but the case was not updated
+            queue.ack(acked)
+            queue.mark_run_items(run_id, acked, FAILED, error or "case update did not finish")
+            counts['failed'] += len(acked)
+            logger.error(f"❌ [{name}] Notes added for PID {pid} but the case update failed - "
+                         f"update the case in CMS: {error}")
+            if not await cms_service.is_session_healthy():
+                logger.warning(f"🔌 [{name}] CMS session lost while processing PID {pid} - will log in again")
+                session_lost.set()
+                return
+        else:
+            if acked:
+                queue.ack(acked)
+                queue.mark_run_items(run_id, acked, DONE)
+                counts['success'] += len(acked)
+            remaining = {item_id for _, _, ids in notes[done:] for item_id in ids}
+            if not await cms_service.is_session_healthy():
+                logger.warning(f"🔌 [{name}] CMS session lost while processing PID {pid} - will log in again")
+                work.put_nowait((pid, [entry for entry in entries if entry['id'] in remaining]))
+                queue.mark_run_items(run_id, remaining, PENDING, error)
+                session_lost.set()
+                return
+            
+            counts['failed'] += len(remaining)
+            for item_id in remaining:
+                queue.record_failure(item_id, error or "add_notes did not finish")
+            queue.mark_run_items(run_id, remaining, FAILED, error or "add_notes did not finish")
+            logger.error(f"❌ [{name}] Failed to add {len(remaining)} CMS note(s) for PID {pid}: "
+                         f"{error or 'add_notes did not finish'}")
+        
+        if delay:
+            await asyncio.sleep(delay)
+
+def resolve_cms_driver(driver=None):
+    """Note driver to use - "http" only when CMS_HTTP_DRIVER_ENABLED opts in, otherwise the browser"""
+    driver = (driver or Config.CMS_NOTE_DRIVER).lower()
+    if driver == "http" and not Config.CMS_HTTP_DRIVER_ENABLED:
+        logger.warning("⚠️ HTTP CMS driver is not enabled (CMS_HTTP_DRIVER_ENABLED) - using the browser")
+        return "browser"
+    return driver if driver == "http" else "browser"
+
+def create_cms_service(driver=None):
+    """New (not yet started) CMS service for a note driver: "http" or "browser" (default CMS_NOTE_DRIVER)"""
+    driver = resolve_cms_driver(driver)
+    if driver == "http":
+        from services.cms_http_driver import CMSHttpDriver, REQUESTS_AVAILABLE
+        if REQUESTS_AVAILABLE:
+            return CMSHttpDriver()
+        logger.warning("⚠️ requests is not installed - using the browser CMS driver")
+    return CMSIntegrationService(use_persistent_session=False)
+
+async def _open_tabs(workers, driver=None):
+    """Fresh logged-in session plus worker tabs sharing its cookies (browser fallback for the HTTP driver)"""
+    cms_service = create_cms_service(driver)
+    logger.info(f"🌐 Starting new CMS {cms_service.driver} session...")
+    try:
+        await cms_service.start_session()
+    except Exception as e:
+        if cms_service.driver == "browser":
+            raise
+        logger.warning(f"⚠️ CMS {cms_service.driver} driver could not log in ({e}) - falling back to the browser")
+        cms_service = CMSIntegrationService(use_persistent_session=False)
+        await cms_service.start_session()
+    logger.info("✅ CMS session started successfully")
+    
+    tabs = [cms_service]
+    for _ in range(workers - 1):
+        try:
+            tabs.append(await cms_service.open_worker_page())
+        except Exception as e:
+            logger.warning(f"⚠️ Could not open another CMS tab ({e}) - continuing with {len(tabs)}")
+            break
+    return tabs
+
+async def _close_tabs(tabs):
+    logger.info("🗑️ Cleaning up browser session...")
+    for tab in tabs[1:]:
+        try:
+            await tab.cleanup()
+        except Exception as e:
+            logger.warning(f"Error closing CMS tab: {e}")
+    if tabs:
+        await tabs[0].cleanup()
+    logger.info("✅ Browser session closed")
+
 # Batch function to process all session emails
-async def process_session_cms_notes():
+async def process_session_cms_notes(workers=None, resume=True, driver=None):
     """
     Process all PENDING session emails and add CMS notes
     Creates a new browser session in the same process for reliability
     Emails are automatically moved from pending to processed queue
+    
+    The batch is a checkpointed run: each note's status is recorded as it goes, a
+    lost session (timeouts, expired login, crashed browser) is recreated up to
+    CMS_MAX_SESSION_RESTARTS times, and a run that still cannot finish is left
+    interrupted so the next call resumes it under the same run id.
+    
+    Args:
+        workers: Tabs adding notes concurrently in the one logged-in browser
+                 (defaults to CMS_NOTE_WORKERS; keep low enough for the CMS server)
+        resume: Continue the last unfinished run instead of starting a new one
+        driver: "http" (form posts over one HTTP session) or "browser" (default CMS_NOTE_DRIVER)
     """
     pending_emails = load_pending_emails()
     
@@ -912,65 +1100,301 @@ async def process_session_cms_notes():
         logger.info("📭 No pending emails found to process")
         return True
     
-    logger.info(f"🔄 Processing {len(pending_emails)} pending emails for CMS notes...")
+    queue = get_cms_note_queue()
+    workers = max(1, min(workers or Config.CMS_NOTE_WORKERS, len(pending_emails)))
+    if not resume:
+        previous = queue.run_summary()
+        if previous and previous["state"] in (RUNNING, INTERRUPTED):
+            queue.finish_run(previous["run_id"], COMPLETED, error="superseded by a new run")
+    run_id, resumed = queue.start_or_resume_run(workers)
     
-    # Always use non-persistent session for reliability (creates new browser in same process)
-    cms_service = CMSIntegrationService(use_persistent_session=False)
-    success_count = 0
-    fail_count = 0
+    entry_count = sum(len(entries) for entries in pending_emails.values())
+    logger.info(f"🔄 {'Resuming' if resumed else 'Starting'} CMS run {run_id}: {entry_count} pending emails "
+                f"for {len(pending_emails)} cases on {workers} tab(s)...")
     
-    try:
-        # Start a fresh browser session in this process
-        logger.info("🌐 Starting new CMS browser session...")
-        await cms_service.start_session()
-        logger.info("✅ CMS session started successfully")
+    counts = {'success': 0, 'failed': 0}
+    work = asyncio.Queue()
+    for item in pending_emails.items():
+        work.put_nowait(item)
+    
+    restarts = 0
+    last_error = None
+    while not work.empty():
+        session_lost = asyncio.Event()
+        tabs = []
+        try:
+            tabs = await _open_tabs(workers, driver)
+            await asyncio.gather(*[
+                _note_worker(f"tab {index + 1}", tab, work, counts, Config.CMS_NOTE_RETRIES,
+                             Config.CMS_NOTE_DELAY_SECONDS, run_id, session_lost)
+                for index, tab in enumerate(tabs)
+            ])
+            for index, tab in enumerate(tabs):
+                if tab.step_timings:
+                    logger.info(f"⏱️ Tab {index + 1} average ms per step: {tab.timing_summary()}")
+        except Exception as e:
+            last_error = e
+            session_lost.set()
+            logger.error(f"❌ CMS session failed: {e}")
+        finally:
+            await _close_tabs(tabs)
         
-        for pid, email_info in pending_emails.items():
-            email = email_info['email']
-            email_type = email_info['email_type']
-            
-            logger.info(f"🔄 Processing PID {pid} → {email}")
-            
+        if not session_lost.is_set() or work.empty():
+            break
+        restarts += 1
+        if restarts > Config.CMS_MAX_SESSION_RESTARTS:
+            logger.error(f"❌ CMS session lost {restarts} times - leaving run {run_id} to resume later")
+            break
+        backoff = min(60, 5 * restarts)
+        logger.warning(f"🔁 Recreating CMS session in {backoff}s (restart {restarts}/{Config.CMS_MAX_SESSION_RESTARTS})")
+        await asyncio.sleep(backoff)
+    
+    finished = work.empty()
+    queue.finish_run(run_id, COMPLETED if finished else INTERRUPTED, restarts, None if finished else last_error)
+    logger.info(f"🎉 CMS run {run_id} {'complete' if finished else 'interrupted'}: "
+                f"{counts['success']} success, {counts['failed']} failed, {work.qsize()} cases left, "
+                f"{restarts} session restart(s)")
+    return finished and counts['failed'] == 0
+
+class CMSNoteConsumer:
+    """
+    Drains the CMS note queue continuously on the persistent CMS session (e.g. while bulk sends run)
+    
+    Run it on one long-lived event loop (CMSNoteConsumerWorker): the persistent browser
+    belongs to the loop that opened it. Notes are taken a few PIDs per pass so pause and
+    stop apply quickly. While the backlog is above the high-water mark extra tabs are
+    opened (up to CMS_NOTE_WORKERS) until it falls back under half of it. An idle session
+    is reloaded every keepalive interval so the CMS login does not time out. With the
+    HTTP driver the consumer logs in over HTTP instead of using the persistent browser.
+    """
+    
+    def __init__(self, poll_seconds=None, high_water=None, max_tabs=None, keepalive_seconds=None, batch_pids=None,
+                 driver=None):
+        self.poll_seconds = poll_seconds or Config.CMS_CONSUMER_POLL_SECONDS
+        self.high_water = high_water or Config.CMS_CONSUMER_HIGH_WATER
+        self.max_tabs = max(1, max_tabs or Config.CMS_NOTE_WORKERS)
+        self.keepalive_seconds = keepalive_seconds or Config.CMS_CONSUMER_KEEPALIVE_SECONDS
+        self.batch_pids = batch_pids or Config.CMS_CONSUMER_BATCH_PIDS
+        self.driver = resolve_cms_driver(driver)
+        self.persistent = False  # tabs[0] is the class-level persistent browser session
+        self.paused = False
+        self.should_stop = False
+        self.state = "stopped"
+        self.tabs = []
+        self.run_id = None
+        self.counts = {'success': 0, 'failed': 0}
+        self.restarts = 0
+        self.last_error = None
+        self.held_pids = set()  # PIDs that failed here - left pending for Process Notes
+        self._recent = []  # (timestamp, notes added) for the throughput estimate
+        self._last_activity = time.monotonic()
+    
+    def pause(self):
+        """Finish the current PID, then hold the backlog (the session stays logged in)"""
+        self.paused = True
+    
+    def resume(self):
+        self.paused = False
+    
+    def stop(self):
+        """Finish the current PID and close the session"""
+        self.should_stop = True
+    
+    def notes_per_minute(self):
+        """Notes added per minute over the last five minutes"""
+        cutoff = time.monotonic() - 300
+        self._recent = [(stamp, added) for stamp, added in self._recent if stamp >= cutoff]
+        if not self._recent:
+            return 0.0
+        span = max(60.0, time.monotonic() - self._recent[0][0])
+        return round(sum(added for _, added in self._recent) * 60 / span, 1)
+    
+    def status(self):
+        """Backlog, backpressure and throughput for the CMS dashboard card"""
+        backlog = get_cms_note_queue().stats()['pending_count']
+        rate = self.notes_per_minute()
+        return {
+            'state': "paused" if self.paused and self.state != "stopped" else self.state,
+            'backlog': backlog,
+            'high_water': self.high_water,
+            'backpressure': backlog >= self.high_water,
+            'tabs': len(self.tabs),
+            'notes_per_minute': rate,
+            'eta_seconds': int(backlog / rate * 60) if rate and backlog else None,
+            'added': self.counts['success'],
+            'failed': self.counts['failed'],
+            'held': len(self.held_pids),
+            'restarts': self.restarts,
+            'run_id': self.run_id,
+            'last_error': str(self.last_error) if self.last_error else None,
+        }
+    
+    async def _connect(self):
+        """Reuse the persistent session if this loop can still drive it, otherwise open it again"""
+        if self.driver != "browser":
+            self.tabs = await _open_tabs(1, self.driver)
+            self.persistent = False
+            self._last_activity = time.monotonic()
+            return
+        if not await CMSIntegrationService.is_persistent_session_healthy():
+            # A session opened on another (finished) event loop cannot be used from this one
+            await CMSIntegrationService.cleanup_persistent_session()
+            if not await CMSIntegrationService.initialize_persistent_session():
+                raise Exception("Could not initialize the persistent CMS session")
+        service = CMSIntegrationService(use_persistent_session=True)
+        await service.start_session()
+        self.tabs = [service]
+        self.persistent = True
+        self._last_activity = time.monotonic()
+    
+    async def _close_extra_tabs(self):
+        # Only worker tabs - the first tab is the persistent session itself
+        for tab in self.tabs[1:]:
             try:
-                if email_type.lower() == "follow-up":
-                    success = await cms_service.add_follow_up_note(pid, email)
-                elif email_type.lower() == "status_request":
-                    success = await cms_service.add_status_request_note(pid, email)
-                elif email_type.lower() == "acknowledgment":
-                    # For acknowledgments, the 'email' field contains the note text
-                    success = await cms_service.add_acknowledgment_note(pid, email)
-                elif "test_" in email_type.lower():
-                    # Handle test emails specially
-                    success = await cms_service.add_test_email_note(pid, email, email_type)
-                else:
-                    success = await cms_service.add_general_email_note(pid, email, email_type)
-                
-                if success:
-                    log_cms_note_added(pid, email, email_type)
-                    success_count += 1
-                    logger.info(f"✅ CMS note added for PID {pid}")
-                else:
-                    fail_count += 1
-                    logger.error(f"❌ Failed to add CMS note for PID {pid}")
-                
-                # Small delay between notes
-                await asyncio.sleep(1)
-                
+                await tab.cleanup()
             except Exception as e:
-                fail_count += 1
-                logger.error(f"❌ Error processing PID {pid}: {e}")
+                logger.warning(f"Error closing CMS tab: {e}")
+        self.tabs = self.tabs[:1]
+    
+    async def _scale_tabs(self, backlog):
+        """Catch up with extra tabs above the high-water mark, drop them once back under half of it"""
+        if backlog >= self.high_water and len(self.tabs) < self.max_tabs:
+            logger.info(f"📈 CMS backlog {backlog} ≥ {self.high_water} - opening up to {self.max_tabs} tabs")
+            while len(self.tabs) < self.max_tabs:
+                try:
+                    self.tabs.append(await self.tabs[0].open_worker_page())
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not open another CMS tab ({e}) - continuing with {len(self.tabs)}")
+                    break
+        elif backlog <= self.high_water // 2 and len(self.tabs) > 1:
+            logger.info(f"📉 CMS backlog down to {backlog} - back to one tab")
+            await self._close_extra_tabs()
+    
+    async def _keep_alive(self):
+        """Reload the idle Collectors page so the CMS login does not expire"""
+        if time.monotonic() - self._last_activity < self.keepalive_seconds:
+            return
+        self._last_activity = time.monotonic()
+        if not await self.tabs[0].is_session_healthy():
+            raise Exception("CMS session expired while idle")
+    
+    async def _drain_pass(self, pending):
+        """Add the notes for up to batch_pids PIDs; returns False if the session was lost"""
+        queue = get_cms_note_queue()
+        if self.run_id is None:
+            self.run_id, resumed = queue.start_or_resume_run(len(self.tabs))
+            logger.info(f"🔄 Background CMS consumer {'resuming' if resumed else 'started'} run {self.run_id}")
+        else:
+            # Notes queued since the last pass join the open run
+            queue.start_or_resume_run(len(self.tabs))
         
-        logger.info(f"🎉 Batch processing complete: {success_count} success, {fail_count} failed")
-        return fail_count == 0
+        batch = list(pending.items())[:self.batch_pids]
+        work = asyncio.Queue()
+        for item in batch:
+            work.put_nowait(item)
         
-    except Exception as e:
-        logger.error(f"❌ Batch processing failed: {e}")
-        return False
+        added_before = self.counts['success']
+        session_lost = asyncio.Event()
+        await asyncio.gather(*[
+            _note_worker(f"consumer tab {index + 1}", tab, work, self.counts, Config.CMS_NOTE_RETRIES,
+                         Config.CMS_NOTE_DELAY_SECONDS, self.run_id, session_lost)
+            for index, tab in enumerate(self.tabs)
+        ])
+        self._recent.append((time.monotonic(), self.counts['success'] - added_before))
+        self._last_activity = time.monotonic()
+        if session_lost.is_set():
+            return False
+        
+        # Notes that failed after their retries are not picked up again by this consumer
+        still_pending = {item['id'] for item in queue.pending()}
+        for pid, entries in batch:
+            if any(entry['id'] in still_pending for entry in entries):
+                logger.warning(f"⏭️ Holding PID {pid} for Process Notes after failed attempts")
+                self.held_pids.add(pid)
+        return True
+    
+    async def _disconnect(self):
+        await self._close_extra_tabs()
+        if self.persistent:
+            await CMSIntegrationService.cleanup_persistent_session()
+        elif self.tabs:
+            await self.tabs[0].cleanup()
+        self.tabs = []
+    
+    async def _sleep(self, seconds):
+        """Sleep in short slices so pause/stop requests are picked up promptly"""
+        waited = 0.0
+        while waited < seconds and not self.should_stop:
+            await asyncio.sleep(0.5)
+            waited += 0.5
+    
+    async def run(self, status_callback=None):
+        """Consume until stop(); status_callback(dict) gets status() after every pass"""
+        queue = get_cms_note_queue()
+        self.should_stop = False
+        self.state = "connecting"
+        logger.info("🚚 Background CMS note consumer started")
         
-    finally:
-        logger.info("🗑️ Cleaning up browser session...")
-        await cms_service.cleanup()
-        logger.info("✅ Browser session closed")
+        def report():
+            if status_callback:
+                try:
+                    status_callback(self.status())
+                except Exception as e:
+                    logger.error(f"Error reporting CMS consumer status: {e}")
+        
+        while not self.should_stop:
+            try:
+                if not self.tabs:
+                    self.state = "connecting"
+                    report()
+                    await self._connect()
+                
+                pending = {} if self.paused else {
+                    pid: entries for pid, entries in load_pending_emails().items() if pid not in self.held_pids
+                }
+                if not pending:
+                    self.state = "idle" if not self.paused else self.state
+                    if self.run_id and not self.paused:
+                        queue.finish_run(self.run_id, COMPLETED, self.restarts)
+                        self.run_id = None
+                    await self._keep_alive()
+                    report()
+                    await self._sleep(self.poll_seconds)
+                    continue
+                
+                self.state = "draining"
+                await self._scale_tabs(sum(len(entries) for entries in pending.values()))
+                if not await self._drain_pass(pending):
+                    raise Exception("CMS session lost while adding notes")
+                self.restarts = 0
+                report()
+            except Exception as e:
+                self.last_error = e
+                self.restarts += 1
+                logger.error(f"❌ Background CMS consumer: {e}")
+                await self._disconnect()
+                if self.restarts > Config.CMS_MAX_SESSION_RESTARTS:
+                    logger.error(f"❌ CMS session lost {self.restarts} times - background consumer paused")
+                    self.paused = True
+                    self.restarts = 0
+                self.state = "reconnecting"
+                report()
+                await self._sleep(min(60, 5 * self.restarts))
+        
+        if self.run_id:
+            # Left interrupted when notes remain, so the next run (or Process Notes) resumes it
+            done = not load_pending_emails()
+            queue.finish_run(self.run_id, COMPLETED if done else INTERRUPTED, error=None if done else "consumer stopped")
+            self.run_id = None
+        await self._disconnect()
+        self.state = "stopped"
+        report()
+        logger.info(f"🚚 Background CMS note consumer stopped: {self.counts['success']} added, "
+                    f"{self.counts['failed']} failed")
+
+def get_last_run_summary():
+    """Latest CMS batch run with its per-status item counts (None before the first run)"""
+    return get_cms_note_queue().run_summary()
 
 # Function to get session statistics
 def show_session_status():
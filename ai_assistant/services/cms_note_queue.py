@@ -0,0 +1,321 @@
+"""
+CMS Note Queue
+Durable SQLite queue of CMS notes waiting to be added (pending -> processed)
+"""
+
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Note states
+PENDING = "pending"
+PROCESSED = "processed"
+
+# Batch run states and per-item statuses
+RUNNING = "running"
+INTERRUPTED = "interrupted"
+COMPLETED = "completed"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+# Running totals kept next to the rows so stats never scan the table
+COUNTERS = ("pending_count", "processed_count", "notes_added_count")
+
+# Text logs used before the queue existed (relative to the working directory)
+LEGACY_PENDING_LOG = "session_emails_pending.log"
+LEGACY_PROCESSED_LOG = "session_emails_processed.log"
+LEGACY_NOTES_LOG = "session_cms_notes.log"
+LEGACY_LINE = re.compile(r"^\[([^\]]+)\].*?PID:\s*(\d+)\s*\|\s*Email Type:\s*([^|]+?)\s*\|\s*Sent to:\s*(.+)$")
+
+
+class CMSNoteQueue:
+    """Pending CMS notes keyed by row id - enqueue, ack and stats are single indexed statements"""
+
+    def __init__(self, db_path: str = None, migrate_legacy: bool = True):
+        self.db_path = db_path or Config.get_file_path(Config.CMS_QUEUE_DB_PATH)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._init_db()
+        if migrate_legacy:
+            self._migrate_legacy_logs()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation so GUI and worker threads can share the queue"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the queue and counter tables if needed"""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cms_notes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pid TEXT NOT NULL,
+                    email_type TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    processed_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cms_notes_state ON cms_notes (state, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cms_notes_pid ON cms_notes (pid, state)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cms_note_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.executemany(
+                "INSERT OR IGNORE INTO cms_note_counters (name, value) VALUES (?, 0)",
+                [(name,) for name in COUNTERS]
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cms_runs (
+                    run_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    workers INTEGER,
+                    restarts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    started_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    finished_at TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cms_run_items (
+                    run_id TEXT NOT NULL,
+                    note_id INTEGER NOT NULL,
+                    pid TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (run_id, note_id)
+                )
+            """)
+
+    @staticmethod
+    def _bump(conn, name: str, delta: int):
+        conn.execute("UPDATE cms_note_counters SET value = value + ? WHERE name = ?", (delta, name))
+
+    def enqueue(self, pid, recipient: str, email_type: str = "FOLLOW-UP", created_at: str = None) -> int:
+        """Queue a note for a case; returns its row id"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                INSERT INTO cms_notes (pid, email_type, recipient, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (str(pid).strip(), email_type, recipient, created_at or now, now))
+            self._bump(conn, "pending_count", 1)
+            return cursor.lastrowid
+
+    def pending(self, limit: int = None) -> List[Dict]:
+        """Pending notes, oldest first"""
+        query = "SELECT * FROM cms_notes WHERE state = ? ORDER BY id"
+        params = [PENDING]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def ack(self, item_ids: Iterable[int]) -> int:
+        """Mark notes processed by id (one CMS note added per id); returns how many changed"""
+        now = datetime.now().isoformat()
+        changed = 0
+        with self._connect() as conn:
+            for item_id in item_ids:
+                changed += conn.execute("""
+                    UPDATE cms_notes SET state = ?, processed_at = ?, updated_at = ?, last_error = NULL
+                    WHERE id = ? AND state = ?
+                """, (PROCESSED, now, now, item_id, PENDING)).rowcount
+            if changed:
+                self._bump(conn, "pending_count", -changed)
+                self._bump(conn, "processed_count", changed)
+                self._bump(conn, "notes_added_count", changed)
+        return changed
+
+    def ack_matching(self, pid, recipient: str) -> int:
+        """Mark every pending note for exactly this PID and recipient processed"""
+        with self._connect() as conn:
+            ids = [row["id"] for row in conn.execute(
+                "SELECT id FROM cms_notes WHERE pid = ? AND recipient = ? AND state = ?",
+                (str(pid).strip(), recipient, PENDING)
+            )]
+        return self.ack(ids)
+
+    def record_failure(self, item_id: int, error: str):
+        """Keep a note pending but remember the attempt and why it failed"""
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE cms_notes SET attempts = attempts + 1, last_error = ?, updated_at = ?
+                WHERE id = ?
+            """, (str(error)[:500], datetime.now().isoformat(), item_id))
+
+    def start_or_resume_run(self, workers: int = 1) -> Tuple[str, bool]:
+        """
+        Checkpointed batch run covering every pending note; returns (run_id, resumed)
+        
+        An unfinished run (interrupted, or left running by a crash) is resumed: its
+        in-progress items go back to pending and notes queued since are added to it.
+        """
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT run_id FROM cms_runs WHERE state IN (?, ?) ORDER BY started_at DESC LIMIT 1",
+                (RUNNING, INTERRUPTED)
+            ).fetchone()
+            resumed = row is not None
+            if resumed:
+                run_id = row["run_id"]
+                conn.execute("UPDATE cms_runs SET state = ?, workers = ?, updated_at = ? WHERE run_id = ?",
+                             (RUNNING, workers, now, run_id))
+                conn.execute("UPDATE cms_run_items SET status = ?, updated_at = ? WHERE run_id = ? AND status = ?",
+                             (PENDING, now, run_id, IN_PROGRESS))
+            else:
+                run_id = f"cms_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(2)}"
+                conn.execute("""
+                    INSERT INTO cms_runs (run_id, state, workers, started_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (run_id, RUNNING, workers, now, now))
+            conn.execute("""
+                INSERT OR IGNORE INTO cms_run_items (run_id, note_id, pid, status, updated_at)
+                SELECT ?, id, pid, ?, ? FROM cms_notes WHERE state = ?
+            """, (run_id, PENDING, now, PENDING))
+        return run_id, resumed
+
+    def mark_run_items(self, run_id: str, note_ids: Iterable[int], status: str, error: str = None):
+        """Checkpoint the status of run items (attempts count each time an item is started)"""
+        now = datetime.now().isoformat()
+        started = int(status == IN_PROGRESS)
+        with self._connect() as conn:
+            conn.executemany("""
+                UPDATE cms_run_items SET status = ?, error = ?, attempts = attempts + ?, updated_at = ?
+                WHERE run_id = ? AND note_id = ?
+            """, [(status, str(error)[:500] if error else None, started, now, run_id, note_id) for note_id in note_ids])
+            conn.execute("UPDATE cms_runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def finish_run(self, run_id: str, state: str, restarts: int = 0, error: str = None):
+        """Close a run as completed, or leave it interrupted so the next run resumes it"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE cms_runs SET state = ?, restarts = restarts + ?, last_error = ?, updated_at = ?,
+                    finished_at = CASE WHEN ? = ? THEN ? ELSE finished_at END
+                WHERE run_id = ?
+            """, (state, restarts, str(error)[:500] if error else None, now, state, COMPLETED, now, run_id))
+
+    def run_summary(self, run_id: str = None) -> Optional[Dict]:
+        """A run (default: the latest) with item counts per status"""
+        with self._connect() as conn:
+            if run_id:
+                run = conn.execute("SELECT * FROM cms_runs WHERE run_id = ?", (run_id,)).fetchone()
+            else:
+                run = conn.execute("SELECT * FROM cms_runs ORDER BY started_at DESC LIMIT 1").fetchone()
+            if not run:
+                return None
+            summary = dict(run)
+            summary["items"] = {
+                row["status"]: row["count"] for row in conn.execute(
+                    "SELECT status, COUNT(*) AS count FROM cms_run_items WHERE run_id = ? GROUP BY status",
+                    (run["run_id"],)
+                )
+            }
+        return summary
+
+    def stats(self) -> Dict:
+        """Pending/processed/notes-added totals from the counter table"""
+        with self._connect() as conn:
+            counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM cms_note_counters")}
+        stats = {name: counters.get(name, 0) for name in COUNTERS}
+        stats["total_emails"] = stats["pending_count"] + stats["processed_count"]
+        return stats
+
+    def clear(self):
+        """Drop every note and run and reset the totals"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cms_notes")
+            conn.execute("DELETE FROM cms_run_items")
+            conn.execute("DELETE FROM cms_runs")
+            conn.execute("UPDATE cms_note_counters SET value = 0")
+
+    def _migrate_legacy_logs(self):
+        """Import the old text logs once, then rename them so they are not imported again"""
+        if not any(os.path.exists(path) for path in (LEGACY_PENDING_LOG, LEGACY_PROCESSED_LOG, LEGACY_NOTES_LOG)):
+            return
+        try:
+            now = datetime.now().isoformat()
+            with self._connect() as conn:
+                pending = 0
+                if os.path.exists(LEGACY_PENDING_LOG):
+                    with open(LEGACY_PENDING_LOG, "r", encoding="utf-8") as f:
+                        for line in f:
+                            match = LEGACY_LINE.match(line.strip())
+                            if match:
+                                conn.execute("""
+                                    INSERT INTO cms_notes (pid, email_type, recipient, created_at, updated_at)
+                                    VALUES (?, ?, ?, ?, ?)
+                                """, (match.group(2), match.group(3), match.group(4).strip(), match.group(1), now))
+                                pending += 1
+                self._bump(conn, "pending_count", pending)
+                self._bump(conn, "processed_count", self._count_lines(LEGACY_PROCESSED_LOG, "PROCESSED"))
+                self._bump(conn, "notes_added_count", self._count_lines(LEGACY_NOTES_LOG, "CMS NOTE ADDED"))
+
+            for path in (LEGACY_PENDING_LOG, LEGACY_PROCESSED_LOG, LEGACY_NOTES_LOG):
+                if os.path.exists(path):
+                    os.replace(path, path + ".migrated")
+            logger.info(f"Imported {pending} pending CMS notes from the session logs")
+        except Exception as e:
+            logger.error(f"Error importing CMS session logs: {e}")
+
+    @staticmethod
+    def _count_lines(path: str, marker: str) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            return sum(1 for line in f if marker in line)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_cms_note_queue() -> CMSNoteQueue:
+    """Shared queue instance"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = CMSNoteQueue()
+        return _queue
+
+
+def set_cms_note_queue(queue: CMSNoteQueue) -> CMSNoteQueue:
+    """Swap the shared queue (benchmarks use a scratch database); returns the previous one"""
+    global _queue
+    with _queue_lock:
+        previous, _queue = _queue, queue
+        return previous
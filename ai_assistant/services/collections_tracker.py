@@ -1,6 +1,7 @@
 import json
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
 import re
 from config import Config
@@ -72,56 +73,70 @@ class CollectionsTracker:
     
     def __init__(self):
         self.tracker_file = Config.get_file_path("data/collections_tracking.json")
+        # Bumped on every load and save so derived tables (e.g. priority scores) know when to rebuild
+        self.revision = 0
+        self._last_contact_map = None
+        self._last_contact_revision = None
+        # The send bookkeeping thread, the analysis worker and the GUI all touch data and the stale cache
+        self._lock = threading.RLock()
+        self._cached_stale_results = None
+        self._cache_timestamp = None
+        # Bumped whenever tracked data changes, so an analysis started before the change is not cached
+        self._stale_generation = 0
         self.data = self._load_tracking_data()
     
     def _load_tracking_data(self):
         """Load tracking data and stale cache from file"""
-        try:
-            if os.path.exists(self.tracker_file):
-                with open(self.tracker_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        with self._lock:
+            self.revision = getattr(self, "revision", 0) + 1
+            try:
+                if os.path.exists(self.tracker_file):
+                    with open(self.tracker_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                     
-                    # Load stale cache if it exists
-                    if 'stale_cache' in data:
-                        self._cached_stale_results = data['stale_cache']
-                        # Parse timestamp
-                        if data.get('stale_cache_timestamp'):
-                            try:
-                                self._cache_timestamp = datetime.fromisoformat(data['stale_cache_timestamp'])
-                                logger.info(f"Loaded stale cache from {self._cache_timestamp}")
-                            except:
-                                self._cache_timestamp = None
-                        # Remove cache from main data dict
-                        del data['stale_cache']
-                        if 'stale_cache_timestamp' in data:
-                            del data['stale_cache_timestamp']
+                        # Load stale cache if it exists
+                        if 'stale_cache' in data:
+                            self._cached_stale_results = data['stale_cache']
+                            # Parse timestamp
+                            if data.get('stale_cache_timestamp'):
+                                try:
+                                    self._cache_timestamp = datetime.fromisoformat(data['stale_cache_timestamp'])
+                                    logger.info(f"Loaded stale cache from {self._cache_timestamp}")
+                                except:
+                                    self._cache_timestamp = None
+                            # Remove cache from main data dict
+                            del data['stale_cache']
+                            if 'stale_cache_timestamp' in data:
+                                del data['stale_cache_timestamp']
                     
-                    # Ensure firm_stats exists even if not in file
-                    if "firm_stats" not in data:
-                        data["firm_stats"] = {}
-                    return data
-            return {"cases": {}, "firm_stats": {}}
-        except Exception as e:
-            logger.error(f"Error loading tracking data: {e}")
-            return {"cases": {}, "firm_stats": {}}
+                        # Ensure firm_stats exists even if not in file
+                        if "firm_stats" not in data:
+                            data["firm_stats"] = {}
+                        return data
+                return {"cases": {}, "firm_stats": {}}
+            except Exception as e:
+                logger.error(f"Error loading tracking data: {e}")
+                return {"cases": {}, "firm_stats": {}}
     
     def _save_tracking_data(self):
         """Save tracking data and stale cache to file"""
-        try:
-            os.makedirs(os.path.dirname(self.tracker_file), exist_ok=True)
+        with self._lock:
+            self.revision += 1
+            try:
+                os.makedirs(os.path.dirname(self.tracker_file), exist_ok=True)
             
-            # Include stale cache if it exists
-            save_data = self.data.copy()
-            if hasattr(self, '_cached_stale_results') and self._cached_stale_results:
-                save_data['stale_cache'] = self._cached_stale_results
-                save_data['stale_cache_timestamp'] = self._cache_timestamp.isoformat() if self._cache_timestamp else None
+                # Include stale cache if it exists
+                save_data = self.data.copy()
+                if self._cached_stale_results:
+                    save_data['stale_cache'] = self._cached_stale_results
+                    save_data['stale_cache_timestamp'] = self._cache_timestamp.isoformat() if self._cache_timestamp else None
             
-            with open(self.tracker_file, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Error saving tracking data: {e}")
+                with open(self.tracker_file, 'w', encoding='utf-8') as f:
+                    json.dump(save_data, f, indent=2, default=str)
+            except Exception as e:
+                logger.error(f"Error saving tracking data: {e}")
     
-    def log_case_activity(self, case_pv, activity_type, details=None):
+    def log_case_activity(self, case_pv, activity_type, details=None, save=True):
         """
         Log case activity
         
@@ -129,142 +144,163 @@ class CollectionsTracker:
             case_pv (str): Case PV number
             activity_type (str): 'email_sent', 'response_received', 'status_updated'
             details (dict): Additional details about the activity
+            save (bool): Write the tracking file now (False when logging many at once)
         """
-        if case_pv not in self.data["cases"]:
-            self.data["cases"][case_pv] = {
-                "activities": [],
-                "current_status": "unknown",
-                "last_contact": None,
-                "response_count": 0,
-                "firm_email": None
-            }
+        with self._lock:
+            if case_pv not in self.data["cases"]:
+                self.data["cases"][case_pv] = {
+                    "activities": [],
+                    "current_status": "unknown",
+                    "last_contact": None,
+                    "response_count": 0,
+                    "firm_email": None
+                }
         
-        activity = {
-            "timestamp": datetime.now().isoformat(),
-            "type": activity_type,
-            "details": details or {}
-        }
+            activity = {
+                "timestamp": datetime.now().isoformat(),
+                "type": activity_type,
+                "details": details or {}
+            }
         
-        self.data["cases"][case_pv]["activities"].append(activity)
+            self.data["cases"][case_pv]["activities"].append(activity)
         
-        # Update case metadata based on activity
-        if activity_type == "email_sent":
-            # Use the actual email date if provided, otherwise use current time
-            if details and details.get("sent_date"):
-                self.data["cases"][case_pv]["last_contact"] = details["sent_date"]
-            else:
-                self.data["cases"][case_pv]["last_contact"] = datetime.now().isoformat()
+            # Update case metadata based on activity
+            if activity_type == "email_sent":
+                # Use the actual email date if provided, otherwise use current time
+                if details and details.get("sent_date"):
+                    self.data["cases"][case_pv]["last_contact"] = details["sent_date"]
+                else:
+                    self.data["cases"][case_pv]["last_contact"] = datetime.now().isoformat()
                 
-            if details and details.get("recipient_email"):
-                self.data["cases"][case_pv]["firm_email"] = details["recipient_email"]
-        
-        elif activity_type == "email_received":
-            # Received emails also count as contact and increment response count
-            if details and details.get("received_date"):
-                # Update last_contact if this received email is more recent
-                current_last = self.data["cases"][case_pv].get("last_contact")
-                received_date = details["received_date"]
-                if not current_last or received_date > current_last:
-                    self.data["cases"][case_pv]["last_contact"] = received_date
+                if details and details.get("recipient_email"):
+                    self.data["cases"][case_pv]["firm_email"] = details["recipient_email"]
+        
+            elif activity_type == "email_received":
+                # Received emails also count as contact and increment response count
+                if details and details.get("received_date"):
+                    # Update last_contact if this received email is more recent
+                    current_last = self.data["cases"][case_pv].get("last_contact")
+                    received_date = details["received_date"]
+                    if not current_last or received_date > current_last:
+                        self.data["cases"][case_pv]["last_contact"] = received_date
             
-            self.data["cases"][case_pv]["response_count"] += 1
-            if details and details.get("sender_email"):
-                self.data["cases"][case_pv]["firm_email"] = details["sender_email"]
-        
-        elif activity_type == "response_received":
-            self.data["cases"][case_pv]["response_count"] += 1
-            if details and details.get("status"):
-                self.data["cases"][case_pv]["current_status"] = details["status"]
-        
-        self._save_tracking_data()
-        logger.info(f"Logged {activity_type} for case {case_pv}")
+                self.data["cases"][case_pv]["response_count"] += 1
+                if details and details.get("sender_email"):
+                    self.data["cases"][case_pv]["firm_email"] = details["sender_email"]
+        
+            elif activity_type == "response_received":
+                self.data["cases"][case_pv]["response_count"] += 1
+                if details and details.get("status"):
+                    self.data["cases"][case_pv]["current_status"] = details["status"]
+        
+            if save:
+                self._save_tracking_data()
+            logger.info(f"Logged {activity_type} for case {case_pv}")
     
     def get_case_status(self, case_pv):
         """Get current status and activity summary for a case"""
-        if case_pv not in self.data["cases"]:
-            return {
-                "status": "unknown",
-                "last_contact": None,
-                "days_since_contact": None,
-                "response_count": 0,
-                "activities": []
-            }
+        with self._lock:
+            if case_pv not in self.data["cases"]:
+                return {
+                    "status": "unknown",
+                    "last_contact": None,
+                    "days_since_contact": None,
+                    "response_count": 0,
+                    "activities": []
+                }
         
-        case_data = self.data["cases"][case_pv]
+            case_data = self.data["cases"][case_pv]
         
-        # Calculate days since last contact
-        days_since_contact = None
-        if case_data.get("last_contact"):
-            try:
-                last_contact = datetime.fromisoformat(case_data["last_contact"])
-                days_since_contact = (datetime.now() - last_contact).days
-            except:
-                pass
+            # Calculate days since last contact
+            days_since_contact = None
+            if case_data.get("last_contact"):
+                try:
+                    last_contact = datetime.fromisoformat(case_data["last_contact"])
+                    days_since_contact = (datetime.now() - last_contact).days
+                except:
+                    pass
         
-        return {
-            "status": case_data.get("current_status", "unknown"),
-            "last_contact": case_data.get("last_contact"),
-            "days_since_contact": days_since_contact,
-            "response_count": case_data.get("response_count", 0),
-            "activities": case_data.get("activities", [])[-5:],  # Last 5 activities
-            "firm_email": case_data.get("firm_email")
-        }
+            return {
+                "status": case_data.get("current_status", "unknown"),
+                "last_contact": case_data.get("last_contact"),
+                "days_since_contact": days_since_contact,
+                "response_count": case_data.get("response_count", 0),
+                "activities": case_data.get("activities", [])[-5:],  # Last 5 activities
+                "firm_email": case_data.get("firm_email")
+            }
+    
+    def get_last_contact_map(self):
+        """PV -> last contact (naive datetime) for every tracked case, rebuilt when the revision changes"""
+        with self._lock:
+            if self._last_contact_map is None or self._last_contact_revision != self.revision:
+                last_contacts = {}
+                for pv, case_data in self.data.get("cases", {}).items():
+                    last_contact = case_data.get("last_contact")
+                    if last_contact:
+                        parsed = parse_timezone_aware_date(str(last_contact))
+                        if parsed:
+                            last_contacts[str(pv)] = parsed
+                self._last_contact_map = last_contacts
+                self._last_contact_revision = self.revision
+            return self._last_contact_map
     
     def get_stale_cases(self, days_threshold=30):
         """Get cases that haven't been contacted in X days"""
-        stale_cases = []
+        with self._lock:
+            stale_cases = []
         
-        for case_pv, case_data in self.data["cases"].items():
-            if not case_data.get("last_contact"):
-                continue
+            for case_pv, case_data in self.data["cases"].items():
+                if not case_data.get("last_contact"):
+                    continue
             
-            try:
-                last_contact = datetime.fromisoformat(case_data["last_contact"])
-                days_since = (datetime.now() - last_contact).days
+                try:
+                    last_contact = datetime.fromisoformat(case_data["last_contact"])
+                    days_since = (datetime.now() - last_contact).days
                 
-                if days_since >= days_threshold:
-                    stale_cases.append({
-                        "pv": case_pv,
-                        "days_since_contact": days_since,
-                        "status": case_data.get("current_status", "unknown"),
-                        "firm_email": case_data.get("firm_email")
-                    })
-            except:
-                continue
+                    if days_since >= days_threshold:
+                        stale_cases.append({
+                            "pv": case_pv,
+                            "days_since_contact": days_since,
+                            "status": case_data.get("current_status", "unknown"),
+                            "firm_email": case_data.get("firm_email")
+                        })
+                except:
+                    continue
         
-        # Sort by days since contact (most stale first, handle None values)
-        stale_cases.sort(key=lambda x: x["days_since_contact"] or 0, reverse=True)
-        return stale_cases
+            # Sort by days since contact (most stale first, handle None values)
+            stale_cases.sort(key=lambda x: x["days_since_contact"] or 0, reverse=True)
+            return stale_cases
     
     def update_firm_stats(self, firm_email, response_time_days=None, response_type=None):
         """Update statistics for a law firm"""
-        # Ensure firm_stats exists
-        if "firm_stats" not in self.data:
-            self.data["firm_stats"] = {}
-        
-        if firm_email not in self.data["firm_stats"]:
-            self.data["firm_stats"][firm_email] = {
-                "total_contacts": 0,
-                "total_responses": 0,
-                "avg_response_time": 0,
-                "response_types": {},
-                "last_response": None
-            }
+        with self._lock:
+            # Ensure firm_stats exists
+            if "firm_stats" not in self.data:
+                self.data["firm_stats"] = {}
+        
+            if firm_email not in self.data["firm_stats"]:
+                self.data["firm_stats"][firm_email] = {
+                    "total_contacts": 0,
+                    "total_responses": 0,
+                    "avg_response_time": 0,
+                    "response_types": {},
+                    "last_response": None
+                }
         
-        firm_data = self.data["firm_stats"][firm_email]
+            firm_data = self.data["firm_stats"][firm_email]
         
-        if response_type:
-            firm_data["total_responses"] += 1
-            firm_data["response_types"][response_type] = firm_data["response_types"].get(response_type, 0) + 1
-            firm_data["last_response"] = datetime.now().isoformat()
+            if response_type:
+                firm_data["total_responses"] += 1
+                firm_data["response_types"][response_type] = firm_data["response_types"].get(response_type, 0) + 1
+                firm_data["last_response"] = datetime.now().isoformat()
             
-            # Update average response time
-            if response_time_days:
-                current_avg = firm_data.get("avg_response_time", 0)
-                total_responses = firm_data["total_responses"]
-                firm_data["avg_response_time"] = ((current_avg * (total_responses - 1)) + response_time_days) / total_responses
+                # Update average response time
+                if response_time_days:
+                    current_avg = firm_data.get("avg_response_time", 0)
+                    total_responses = firm_data["total_responses"]
+                    firm_data["avg_response_time"] = ((current_avg * (total_responses - 1)) + response_time_days) / total_responses
         
-        self._save_tracking_data()
+            self._save_tracking_data()
     
     def get_firm_performance(self, firm_email):
         """Get performance stats for a firm"""
@@ -314,52 +350,53 @@ class CollectionsTracker:
     
     def get_collections_dashboard(self):
         """Get dashboard summary of collections status"""
-        total_cases = len(self.data["cases"])
-        
-        # Case status breakdown
-        status_counts = {}
-        stale_30_days = 0
-        stale_60_days = 0
-        stale_90_days = 0
-        
-        for case_data in self.data["cases"].values():
-            status = case_data.get("current_status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+        with self._lock:
+            total_cases = len(self.data["cases"])
+        
+            # Case status breakdown
+            status_counts = {}
+            stale_30_days = 0
+            stale_60_days = 0
+            stale_90_days = 0
+        
+            for case_data in self.data["cases"].values():
+                status = case_data.get("current_status", "unknown")
+                status_counts[status] = status_counts.get(status, 0) + 1
             
-            # Check staleness
-            if case_data.get("last_contact"):
-                try:
-                    last_contact = datetime.fromisoformat(case_data["last_contact"])
-                    days_since = (datetime.now() - last_contact).days
+                # Check staleness
+                if case_data.get("last_contact"):
+                    try:
+                        last_contact = datetime.fromisoformat(case_data["last_contact"])
+                        days_since = (datetime.now() - last_contact).days
                     
-                    if days_since >= 30:
-                        stale_30_days += 1
-                    if days_since >= 60:
-                        stale_60_days += 1
-                    if days_since >= 90:
-                        stale_90_days += 1
-                except:
-                    pass
-        
-        # Top performing firms
-        top_firms = []
-        for firm_email, stats in self.data.get("firm_stats", {}).items():
-            if stats["total_contacts"] >= 3:  # Only firms with decent contact history
-                response_rate = (stats["total_responses"] / stats["total_contacts"]) * 100
-                top_firms.append((firm_email, response_rate))
+                        if days_since >= 30:
+                            stale_30_days += 1
+                        if days_since >= 60:
+                            stale_60_days += 1
+                        if days_since >= 90:
+                            stale_90_days += 1
+                    except:
+                        pass
+        
+            # Top performing firms
+            top_firms = []
+            for firm_email, stats in self.data.get("firm_stats", {}).items():
+                if stats["total_contacts"] >= 3:  # Only firms with decent contact history
+                    response_rate = (stats["total_responses"] / stats["total_contacts"]) * 100
+                    top_firms.append((firm_email, response_rate))
+        
+            top_firms.sort(key=lambda x: x[1], reverse=True)
         
-        top_firms.sort(key=lambda x: x[1], reverse=True)
-        
-        return {
-            "total_cases": total_cases,
-            "status_breakdown": status_counts,
-            "stale_cases": {
-                "30_days": stale_30_days,
-                "60_days": stale_60_days,
-                "90_days": stale_90_days
-            },
-            "top_responsive_firms": top_firms[:5]
-        }
+            return {
+                "total_cases": total_cases,
+                "status_breakdown": status_counts,
+                "stale_cases": {
+                    "30_days": stale_30_days,
+                    "60_days": stale_60_days,
+                    "90_days": stale_90_days
+                },
+                "top_responsive_firms": top_firms[:5]
+            }
     
     def bootstrap_from_email_cache(self, email_cache, case_manager, max_emails=500):
         """
@@ -524,15 +561,16 @@ class CollectionsTracker:
                                 }
                             )
                         
-                        # Update last contact date to email date (not current time)
-                        if pv in self.data["cases"]:
-                            self.data["cases"][pv]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
-                        
-                        # Set firm email if we have it
-                        recipient = email.get("to", "")
-                        if recipient and "@" in recipient:
+                        with self._lock:
+                            # Update last contact date to email date (not current time)
                             if pv in self.data["cases"]:
-                                self.data["cases"][pv]["firm_email"] = recipient
+                                self.data["cases"][pv]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
+                            
+                            # Set firm email if we have it
+                            recipient = email.get("to", "")
+                            if recipient and "@" in recipient:
+                                if pv in self.data["cases"]:
+                                    self.data["cases"][pv]["firm_email"] = recipient
                 
             except Exception as e:
                 logger.error(f"Error processing email in bootstrap: {e}")
@@ -613,6 +651,34 @@ class CollectionsTracker:
             logger.error(f"Error parsing email date '{date_string}': {e}")
             return None
     
+    def get_cached_stale_cases(self, exclude_acknowledged=True):
+        """Cached stale analysis if it exists and is less than an hour old, else None"""
+        with self._lock:
+            results = self._cached_stale_results
+            timestamp = self._cache_timestamp
+            if not results or not timestamp:
+                return None
+            if (datetime.now() - timestamp).total_seconds() >= 3600:  # 1 hour cache
+                return None
+            
+            # Filter acknowledged cases if requested
+            if exclude_acknowledged:
+                return self._filter_acknowledged_cases(results)
+            return {category: list(cases) for category, cases in results.items()}
+    
+    def stale_cache_state(self):
+        """(results, timestamp, generation) of the stale cache, for restore_stale_cache()"""
+        with self._lock:
+            return self._cached_stale_results, self._cache_timestamp, self._stale_generation
+    
+    def restore_stale_cache(self, state):
+        """Put back a stale_cache_state() unless the cache was rebuilt or tracked data changed since"""
+        results, timestamp, generation = state
+        with self._lock:
+            if results is not None and self._cached_stale_results is None and generation == self._stale_generation:
+                self._cached_stale_results = results
+                self._cache_timestamp = timestamp
+    
     def get_comprehensive_stale_cases(self, case_manager, exclude_acknowledged=True, progress_callback=None, skip_email_search=True):
         """
         Get comprehensive stale case analysis using cached bootstrap data - FAST!
@@ -623,21 +689,14 @@ class CollectionsTracker:
             progress_callback: Optional callback for progress updates (message, percentage)
             skip_email_search: Skip searching email cache (use for refresh, False for full analyze)
         """
-        # Check if we have cached stale analysis and it's recent (less than 1 hour old)
-        if (hasattr(self, '_cached_stale_results') and 
-            hasattr(self, '_cache_timestamp') and 
-            self._cached_stale_results and 
-            self._cache_timestamp):
-            cache_age = (datetime.now() - self._cache_timestamp).total_seconds()
-            if cache_age < 3600:  # 1 hour cache
-                logger.info("Using cached stale case analysis")
-                
-                # Filter acknowledged cases if requested
-                if exclude_acknowledged:
-                    return self._filter_acknowledged_cases(self._cached_stale_results)
-                return self._cached_stale_results
+        cached = self.get_cached_stale_cases(exclude_acknowledged)
+        if cached is not None:
+            logger.info("Using cached stale case analysis")
+            return cached
         
         logger.info("Generating fresh stale case analysis from bootstrap data...")
+        with self._lock:
+            generation = self._stale_generation
         
         if progress_callback:
             progress_callback("Loading recent sent emails...", 10)
@@ -665,8 +724,9 @@ class CollectionsTracker:
         missing_cases = []
         
         # DEBUG: Check what data we actually have
-        total_cases = len(self.data["cases"])
-        cases_with_activities = len([pv for pv, data in self.data["cases"].items() if data.get("activities")])
+        with self._lock:
+            total_cases = len(self.data["cases"])
+            cases_with_activities = len([pv for pv, data in self.data["cases"].items() if data.get("activities")])
         logger.info(f"Bootstrap data: {total_cases} total cases, {cases_with_activities} with activities")
         
         # FIXED APPROACH: Analyze ALL cases from Excel, check what bootstrap data exists
@@ -704,267 +764,9 @@ class CollectionsTracker:
             except:
                 continue
             
-            # Get bootstrap tracking data (if it exists)
-            case_tracking = self.data["cases"].get(pv, {})
-            
-            
-            # Calculate days since contact with fallback to activities
-            last_contact = case_tracking.get("last_contact")
-            days_since_contact = None
-            contact_source = None
-            
-            if last_contact and last_contact.strip():
-                try:
-                    # Parse timezone-aware date to naive datetime for comparison
-                    last_contact_dt = parse_timezone_aware_date(last_contact)
-                    if last_contact_dt:
-                        days_since_contact = (datetime.now() - last_contact_dt).days
-                        contact_source = "bootstrap"
-                    else:
-                        raise ValueError(f"Could not parse date: {last_contact}")
-                    
-                    # Fix negative days (future dates) - should not happen with fixed parser but just in case
-                    if days_since_contact < 0:
-                        logger.warning(f"Negative days since contact for case {pv}: {days_since_contact} days")
-                        days_since_contact = 0  # Treat as recent contact
-                except Exception as e:
-                    logger.warning(f"Failed to parse last_contact '{last_contact}' for case {pv}: {e}")
-                    last_contact = None
-            
-            # Fallback: Use most recent activity if no valid last_contact
-            if days_since_contact is None:
-                activities = case_tracking.get("activities", [])
-                if activities:
-                    # Find most recent activity with a valid date
-                    most_recent_activity = None
-                    for activity in activities:
-                        sent_date = activity.get("sent_date")
-                        if sent_date:
-                            try:
-                                # Parse timezone-aware activity date
-                                activity_dt = parse_timezone_aware_date(sent_date)
-                                if activity_dt and (most_recent_activity is None or activity_dt > most_recent_activity):
-                                    most_recent_activity = activity_dt
-                            except:
-                                continue
-                    
-                    if most_recent_activity:
-                        days_since_contact = (datetime.now() - most_recent_activity).days
-                        last_contact = most_recent_activity.isoformat()
-                        contact_source = "activity_fallback"
-                        
-                        if days_since_contact < 0:
-                            days_since_contact = 0
-            
-            # Final check: Use sent emails as most recent contact (highest priority)
-            if pv in sent_emails_data:
-                sent_email_timestamp = sent_emails_data[pv]['timestamp']
-                sent_days_ago = (datetime.now() - sent_email_timestamp).days
-                
-                # If sent email is more recent than any other contact, use it
-                if days_since_contact is None or sent_days_ago < days_since_contact:
-                    days_since_contact = sent_days_ago
-                    last_contact = sent_email_timestamp.isoformat()
-                    contact_source = "sent_email_log"
-                    
-                    if days_since_contact < 0:
-                        days_since_contact = 0
-            
-            # Build case data
-            case_data = {
-                "pv": pv,
-                "name": case_info.get("Name", ""),
-                "attorney_email": case_info.get("Attorney Email", ""),
-                "law_firm": case_info.get("Law Firm", ""),
-                "days_since_contact": days_since_contact,
-                "last_contact": last_contact,
-                "response_count": case_tracking.get("response_count", 0),
-                "activity_count": len(case_tracking.get("activities", []))
-            }
-            
-            # Add DOI, DOA and Status to case data
-            case_data["doi"] = case_info.get("DOI", "")
-            case_data["doa"] = case_info.get("DOA", "")  # Date of Accident for CCP 335.1
-            case_data["status"] = case_info.get("Status", "")
-            
-            # Get patient name for logging/debugging (always needed)
-            patient_name = str(case_info.get("Name", "")).strip()
-            
-            # Check email cache only during full analyze, not refresh
-            has_emails_in_cache = False
-            sent_email_count = 0
-            received_email_count = 0
-            
-            # Skip expensive email search during refresh - use tracked data instead
-            if skip_email_search:
-                # Use existing tracked data for performance
-                if case_tracking.get("sent_count", 0) > 0:
-                    has_emails_in_cache = True
-                    sent_email_count = case_tracking.get("sent_count", 0)
-                    received_email_count = case_tracking.get("response_count", 0)
-            else:
-                # Full email cache search (only during Analyze Email Cache)
-                # Handle DOI as either string or datetime
-                doi_value = case_info.get("DOI", "")
-                if hasattr(doi_value, 'strftime'):
-                    # It's a datetime object
-                    patient_doi = doi_value.strftime("%m/%d/%Y")
-                else:
-                    # It's a string or other type
-                    patient_doi = str(doi_value).strip()
-                
-                if hasattr(self, 'email_cache') and self.email_cache and self.email_cache.cache.get('emails') and patient_name:
-                    # Search email cache for this patient's NAME
-                    import re
-                    
-                    # Create name patterns - handle different name formats
-                    name_parts = patient_name.split()
-                    if len(name_parts) >= 2:
-                        # Try various name combinations
-                        first_name = name_parts[0]
-                        last_name = name_parts[-1]
-                        
-                        # Patterns to search for
-                        name_patterns = [
-                            re.compile(rf'\b{re.escape(patient_name)}\b', re.IGNORECASE),  # Full name
-                            re.compile(rf'\b{re.escape(last_name)}\b.*\b{re.escape(first_name)}\b', re.IGNORECASE),  # Last, First
-                            re.compile(rf'\b{re.escape(first_name)}\b.*\b{re.escape(last_name)}\b', re.IGNORECASE),  # First Last
-                        ]
-                    else:
-                        # Single name or complex name
-                        name_patterns = [
-                            re.compile(rf'\b{re.escape(patient_name)}\b', re.IGNORECASE)
-                        ]
-                    
-                    # Also search for PV as fallback (rare cases where it's included)
-                    pv_pattern = re.compile(rf'\bpv[:\s]*{re.escape(pv)}\b', re.IGNORECASE)
-                    
-                    for email in self.email_cache.cache.get('emails', []):
-                        email_text = f"{email.get('subject', '')} {email.get('snippet', '')}"
-                        
-                        # Check if this email mentions this patient's name or PV
-                        case_found = False
-                        
-                        # First check for name
-                        for pattern in name_patterns:
-                            if pattern.search(email_text):
-                                # If DOI is available and there might be duplicates, verify DOI
-                                if patient_doi and 'doi' in email_text.lower():
-                                    # Try to match DOI to disambiguate
-                                    doi_parts = patient_doi.replace('-', '/').split('/')
-                                    if len(doi_parts) >= 2:
-                                        # Check if DOI components appear in email
-                                        if any(part in email_text for part in doi_parts if len(part) > 2):
-                                            case_found = True
-                                            break
-                                else:
-                                    # No DOI check needed or DOI not in email
-                                    case_found = True
-                                    break
-                        
-                        # Fallback to PV search
-                        if not case_found and pv_pattern.search(email_text):
-                            case_found = True
-                        
-                        if case_found:
-                            # Determine if sent or received
-                            from_field = str(email.get('from', '')).lower()
-                            to_field = str(email.get('to', '')).lower()
-                            
-                            # Email is SENT if from Dean/Prohealth OR from "me"
-                            if (from_field == 'me' or 'dean' in from_field or 
-                                'prohealth' in from_field or 'deanh.transcon' in from_field):
-                                sent_email_count += 1
-                                has_emails_in_cache = True
-                            # Email is RECEIVED if to Dean
-                            elif 'dean' in to_field or 'deanh.transcon' in to_field:
-                                received_email_count += 1
-                                has_emails_in_cache = True
-                    
-                    # Update tracked counts for next time
-                    if pv in self.data["cases"] and (sent_email_count > 0 or received_email_count > 0):
-                        self.data["cases"][pv]["sent_count"] = max(self.data["cases"][pv].get("sent_count", 0), sent_email_count)
-                        self.data["cases"][pv]["response_count"] = max(self.data["cases"][pv].get("response_count", 0), received_email_count)
-            
-            # Improved categorization logic
-            has_bootstrap_data = len(case_tracking) > 0
-            has_activities = case_data["activity_count"] > 0
-            has_valid_contact = days_since_contact is not None
-            
-            # DEBUG logging
-            if pv in ["295187", "300856", "246399"] or (sent_email_count > 0 and not has_activities):
-                logger.info(f"DEBUG Case {pv} ({patient_name}): bootstrap={has_bootstrap_data}, activities={has_activities}, valid_contact={has_valid_contact}, emails_in_cache={has_emails_in_cache}, sent={sent_email_count}, received={received_email_count}")
-            
-            if has_valid_contact:
-                # Critical: No email sent or received in over 90 days
-                if days_since_contact >= 90:
-                    stale_categories["critical"].append(case_data)
-                # High Priority: No email sent or received in over 60 days
-                elif days_since_contact >= 60:
-                    stale_categories["high_priority"].append(case_data)
-                # Needs follow-up: 30-59 days since last contact
-                elif days_since_contact >= 30:
-                    stale_categories["needs_follow_up"].append(case_data)
-                # Recently sent: Emails sent within the last 30 days
-                elif days_since_contact < 30:
-                    stale_categories["recently_sent"].append(case_data)
-                
-                # No Response: Email sent but no responses EVER received (separate check)
-                if case_data["response_count"] == 0 and (has_activities or sent_email_count > 0):
-                    stale_categories["no_response"].append(case_data)
-            elif has_activities or has_emails_in_cache:
-                # Has activities or emails but no valid contact date
-                # Put in no_contact but NOT never_contacted since we have evidence of contact
-                stale_categories["no_contact"].append(case_data)
-                
-                # If we sent emails but got no response, add to no_response
-                if case_data["response_count"] == 0 and (has_activities or sent_email_count > 0):
-                    stale_categories["no_response"].append(case_data)
-            else:
-                # No bootstrap data, no activities, AND no emails in cache - truly never contacted
-                stale_categories["no_contact"].append(case_data)
-                stale_categories["never_contacted"].append(case_data)
-                # Also add to missing_from_bootstrap for tracking
-                if not has_bootstrap_data:
-                    stale_categories["missing_from_bootstrap"].append(case_data)
-                    missing_cases.append(pv)
-            
-            # Check for missing DOI - specifically looking for 2099 year placeholder
-            doi_value = case_data.get("doi", "")
-            doi_str = str(doi_value).strip()
-            if "2099" in doi_str:
-                stale_categories["missing_doi"].append(case_data)
-            
-            # Check for CCP 335.1 eligibility (DOI over 2 years old AND no pending litigation)
-            doi_value = case_data.get("doi")
-            status = str(case_data.get("status", "")).lower()
-            
-            # Check if we have NOT heard back from firm (response_count == 0)
-            has_no_response = case_data.get("response_count", 0) == 0
-            
-            # Check for litigation keywords that would EXCLUDE from CCP 335.1
-            litigation_keywords = ['pending', 'litigation', 'prelitigation', 'pre-litigation', 
-                                 'settled', 'settlement', 'litigating', 'suit', 'lawsuit']
-            has_litigation_keyword = any(keyword in status for keyword in litigation_keywords)
-            
-            if doi_value and str(doi_value).strip() != "" and str(doi_value).upper() != "NONE" and "2099" not in str(doi_value):
-                try:
-                    # Parse DOI and check if over 2 years old
-                    doi_str = str(doi_value).strip()
-                    # Try different date formats
-                    for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%m/%d/%y", "%Y/%m/%d", "%d-%m-%Y"]:
-                        try:
-                            doi_date = datetime.strptime(doi_str, fmt)
-                            years_since_injury = (datetime.now() - doi_date).days / 365.25
-                            
-                            # CCP 335.1: DOI > 2 years old AND no response AND no litigation keywords
-                            if years_since_injury >= 2 and has_no_response and not has_litigation_keyword:
-                                stale_categories["ccp_335_1"].append(case_data)
-                            break
-                        except:
-                            continue
-                except Exception as e:
-                    logger.debug(f"Could not parse DOI for case {pv}: {e}")
+            with self._lock:
+                self._categorize_stale_case(pv, case_info, sent_emails_data, skip_email_search,
+                                            stale_categories, missing_cases)
         
         # Sort each category by priority (handle None values)
         for category in stale_categories.values():
@@ -981,13 +783,17 @@ class CollectionsTracker:
             self._save_missing_cases_log(missing_cases)
             logger.info(f"Found {len(missing_cases)} cases missing from bootstrap - logged for backfill")
         
-        # Cache the results (before filtering acknowledged)
-        self._cached_stale_results = stale_categories
-        self._cache_timestamp = datetime.now()
-        
-        # Save to disk immediately so it persists
-        self._save_tracking_data()
-        logger.info("Saved category analysis to disk for persistence")
+        # Cache the results (before filtering acknowledged) unless cases were contacted meanwhile
+        with self._lock:
+            if generation == self._stale_generation:
+                self._cached_stale_results = stale_categories
+                self._cache_timestamp = datetime.now()
+                
+                # Save to disk immediately so it persists
+                self._save_tracking_data()
+                logger.info("Saved category analysis to disk for persistence")
+            else:
+                logger.info("Tracked cases changed during the analysis - not caching it")
         
         # Filter acknowledged cases if requested
         if exclude_acknowledged:
@@ -995,12 +801,358 @@ class CollectionsTracker:
         
         return stale_categories
     
+    def _categorize_stale_case(self, pv, case_info, sent_emails_data, skip_email_search, stale_categories, missing_cases):
+        """Place a single spreadsheet case into the stale categories it belongs to"""
+        # Get bootstrap tracking data (if it exists)
+        case_tracking = self.data["cases"].get(pv, {})
+        
+        
+        # Calculate days since contact with fallback to activities
+        last_contact = case_tracking.get("last_contact")
+        days_since_contact = None
+        contact_source = None
+        
+        if last_contact and last_contact.strip():
+            try:
+                # Parse timezone-aware date to naive datetime for comparison
+                last_contact_dt = parse_timezone_aware_date(last_contact)
+                if last_contact_dt:
+                    days_since_contact = (datetime.now() - last_contact_dt).days
+                    contact_source = "bootstrap"
+                else:
+                    raise ValueError(f"Could not parse date: {last_contact}")
+                
+                # Fix negative days (future dates) - should not happen with fixed parser but just in case
+                if days_since_contact < 0:
+                    logger.warning(f"Negative days since contact for case {pv}: {days_since_contact} days")
+                    days_since_contact = 0  # Treat as recent contact
+            except Exception as e:
+                logger.warning(f"Failed to parse last_contact '{last_contact}' for case {pv}: {e}")
+                last_contact = None
+        
+        # Fallback: Use most recent activity if no valid last_contact
+        if days_since_contact is None:
+            activities = case_tracking.get("activities", [])
+            if activities:
+                # Find most recent activity with a valid date
+                most_recent_activity = None
+                for activity in activities:
+                    sent_date = activity.get("sent_date")
+                    if sent_date:
+                        try:
+                            # Parse timezone-aware activity date
+                            activity_dt = parse_timezone_aware_date(sent_date)
+                            if activity_dt and (most_recent_activity is None or activity_dt > most_recent_activity):
+                                most_recent_activity = activity_dt
+                        except:
+                            continue
+                
+                if most_recent_activity:
+                    days_since_contact = (datetime.now() - most_recent_activity).days
+                    last_contact = most_recent_activity.isoformat()
+                    contact_source = "activity_fallback"
+                    
+                    if days_since_contact < 0:
+                        days_since_contact = 0
+        
+        # Final check: Use sent emails as most recent contact (highest priority)
+        if pv in sent_emails_data:
+            sent_email_timestamp = sent_emails_data[pv]['timestamp']
+            sent_days_ago = (datetime.now() - sent_email_timestamp).days
+            
+            # If sent email is more recent than any other contact, use it
+            if days_since_contact is None or sent_days_ago < days_since_contact:
+                days_since_contact = sent_days_ago
+                last_contact = sent_email_timestamp.isoformat()
+                contact_source = "sent_email_log"
+                
+                if days_since_contact < 0:
+                    days_since_contact = 0
+        
+        # Build case data
+        case_data = {
+            "pv": pv,
+            "name": case_info.get("Name", ""),
+            "attorney_email": case_info.get("Attorney Email", ""),
+            "law_firm": case_info.get("Law Firm", ""),
+            "days_since_contact": days_since_contact,
+            "last_contact": last_contact,
+            "response_count": case_tracking.get("response_count", 0),
+            "activity_count": len(case_tracking.get("activities", []))
+        }
+        
+        # Add DOI, DOA, Status and Balance to case data
+        case_data["balance"] = case_info.get("Balance", 0.0)
+        case_data["doi"] = case_info.get("DOI", "")
+        case_data["doa"] = case_info.get("DOA", "")  # Date of Accident for CCP 335.1
+        case_data["status"] = case_info.get("Status", "")
+        
+        # Get patient name for logging/debugging (always needed)
+        patient_name = str(case_info.get("Name", "")).strip()
+        
+        # Check email cache only during full analyze, not refresh
+        has_emails_in_cache = False
+        sent_email_count = 0
+        received_email_count = 0
+        
+        # Skip expensive email search during refresh - use tracked data instead
+        if skip_email_search:
+            # Use existing tracked data for performance
+            if case_tracking.get("sent_count", 0) > 0:
+                has_emails_in_cache = True
+                sent_email_count = case_tracking.get("sent_count", 0)
+                received_email_count = case_tracking.get("response_count", 0)
+        else:
+            # Full email cache search (only during Analyze Email Cache)
+            # Handle DOI as either string or datetime
+            doi_value = case_info.get("DOI", "")
+            if hasattr(doi_value, 'strftime'):
+                # It's a datetime object
+                patient_doi = doi_value.strftime("%m/%d/%Y")
+            else:
+                # It's a string or other type
+                patient_doi = str(doi_value).strip()
+            
+            if hasattr(self, 'email_cache') and self.email_cache and self.email_cache.cache.get('emails') and patient_name:
+                # Search email cache for this patient's NAME
+                import re
+                
+                # Create name patterns - handle different name formats
+                name_parts = patient_name.split()
+                if len(name_parts) >= 2:
+                    # Try various name combinations
+                    first_name = name_parts[0]
+                    last_name = name_parts[-1]
+                    
+                    # Patterns to search for
+                    name_patterns = [
+                        re.compile(rf'\b{re.escape(patient_name)}\b', re.IGNORECASE),  # Full name
+                        re.compile(rf'\b{re.escape(last_name)}\b.*\b{re.escape(first_name)}\b', re.IGNORECASE),  # Last, First
+                        re.compile(rf'\b{re.escape(first_name)}\b.*\b{re.escape(last_name)}\b', re.IGNORECASE),  # First Last
+                    ]
+                else:
+                    # Single name or complex name
+                    name_patterns = [
+                        re.compile(rf'\b{re.escape(patient_name)}\b', re.IGNORECASE)
+                    ]
+                
+                # Also search for PV as fallback (rare cases where it's included)
+                pv_pattern = re.compile(rf'\bpv[:\s]*{re.escape(pv)}\b', re.IGNORECASE)
+                
+                for email in self.email_cache.cache.get('emails', []):
+                    email_text = f"{email.get('subject', '')} {email.get('snippet', '')}"
+                    
+                    # Check if this email mentions this patient's name or PV
+                    case_found = False
+                    
+                    # First check for name
+                    for pattern in name_patterns:
+                        if pattern.search(email_text):
+                            # If DOI is available and there might be duplicates, verify DOI
+                            if patient_doi and 'doi' in email_text.lower():
+                                # Try to match DOI to disambiguate
+                                doi_parts = patient_doi.replace('-', '/').split('/')
+                                if len(doi_parts) >= 2:
+                                    # Check if DOI components appear in email
+                                    if any(part in email_text for part in doi_parts if len(part) > 2):
+                                        case_found = True
+                                        break
+                            else:
+                                # No DOI check needed or DOI not in email
+                                case_found = True
+                                break
+                    
+                    # Fallback to PV search
+                    if not case_found and pv_pattern.search(email_text):
+                        case_found = True
+                    
+                    if case_found:
+                        # Determine if sent or received
+                        from_field = str(email.get('from', '')).lower()
+                        to_field = str(email.get('to', '')).lower()
+                        
+                        # Email is SENT if from Dean/Prohealth OR from "me"
+                        if (from_field == 'me' or 'dean' in from_field or 
+                            'prohealth' in from_field or 'deanh.transcon' in from_field):
+                            sent_email_count += 1
+                            has_emails_in_cache = True
+                        # Email is RECEIVED if to Dean
+                        elif 'dean' in to_field or 'deanh.transcon' in to_field:
+                            received_email_count += 1
+                            has_emails_in_cache = True
+                
+                # Update tracked counts for next time
+                if pv in self.data["cases"] and (sent_email_count > 0 or received_email_count > 0):
+                    self.data["cases"][pv]["sent_count"] = max(self.data["cases"][pv].get("sent_count", 0), sent_email_count)
+                    self.data["cases"][pv]["response_count"] = max(self.data["cases"][pv].get("response_count", 0), received_email_count)
+        
+        # Improved categorization logic
+        has_bootstrap_data = len(case_tracking) > 0
+        has_activities = case_data["activity_count"] > 0
+        has_valid_contact = days_since_contact is not None
+        
+        # DEBUG logging
+        if pv in ["295187", "300856", "246399"] or (sent_email_count > 0 and not has_activities):
+            logger.info(f"DEBUG Case {pv} ({patient_name}): bootstrap={has_bootstrap_data}, activities={has_activities}, valid_contact={has_valid_contact}, emails_in_cache={has_emails_in_cache}, sent={sent_email_count}, received={received_email_count}")
+        
+        if has_valid_contact:
+            # Critical: No email sent or received in over 90 days
+            if days_since_contact >= 90:
+                stale_categories["critical"].append(case_data)
+            # High Priority: No email sent or received in over 60 days
+            elif days_since_contact >= 60:
+                stale_categories["high_priority"].append(case_data)
+            # Needs follow-up: 30-59 days since last contact
+            elif days_since_contact >= 30:
+                stale_categories["needs_follow_up"].append(case_data)
+            # Recently sent: Emails sent within the last 30 days
+            elif days_since_contact < 30:
+                stale_categories["recently_sent"].append(case_data)
+            
+            # No Response: Email sent but no responses EVER received (separate check)
+            if case_data["response_count"] == 0 and (has_activities or sent_email_count > 0):
+                stale_categories["no_response"].append(case_data)
+        elif has_activities or has_emails_in_cache:
+            # Has activities or emails but no valid contact date
+            # Put in no_contact but NOT never_contacted since we have evidence of contact
+            stale_categories["no_contact"].append(case_data)
+            
+            # If we sent emails but got no response, add to no_response
+            if case_data["response_count"] == 0 and (has_activities or sent_email_count > 0):
+                stale_categories["no_response"].append(case_data)
+        else:
+            # No bootstrap data, no activities, AND no emails in cache - truly never contacted
+            stale_categories["no_contact"].append(case_data)
+            stale_categories["never_contacted"].append(case_data)
+            # Also add to missing_from_bootstrap for tracking
+            if not has_bootstrap_data:
+                stale_categories["missing_from_bootstrap"].append(case_data)
+                missing_cases.append(pv)
+        
+        # Check for missing DOI - specifically looking for 2099 year placeholder
+        doi_value = case_data.get("doi", "")
+        doi_str = str(doi_value).strip()
+        if "2099" in doi_str:
+            stale_categories["missing_doi"].append(case_data)
+        
+        # Check for CCP 335.1 eligibility (DOI over 2 years old AND no pending litigation)
+        doi_value = case_data.get("doi")
+        status = str(case_data.get("status", "")).lower()
+        
+        # Check if we have NOT heard back from firm (response_count == 0)
+        has_no_response = case_data.get("response_count", 0) == 0
+        
+        # Check for litigation keywords that would EXCLUDE from CCP 335.1
+        litigation_keywords = ['pending', 'litigation', 'prelitigation', 'pre-litigation', 
+                             'settled', 'settlement', 'litigating', 'suit', 'lawsuit']
+        has_litigation_keyword = any(keyword in status for keyword in litigation_keywords)
+        
+        if doi_value and str(doi_value).strip() != "" and str(doi_value).upper() != "NONE" and "2099" not in str(doi_value):
+            try:
+                # Parse DOI and check if over 2 years old
+                doi_str = str(doi_value).strip()
+                # Try different date formats
+                for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%m/%d/%y", "%Y/%m/%d", "%d-%m-%Y"]:
+                    try:
+                        doi_date = datetime.strptime(doi_str, fmt)
+                        years_since_injury = (datetime.now() - doi_date).days / 365.25
+                        
+                        # CCP 335.1: DOI > 2 years old AND no response AND no litigation keywords
+                        if years_since_injury >= 2 and has_no_response and not has_litigation_keyword:
+                            stale_categories["ccp_335_1"].append(case_data)
+                        break
+                    except:
+                        continue
+            except Exception as e:
+                logger.debug(f"Could not parse DOI for case {pv}: {e}")
+    
     def invalidate_stale_case_cache(self):
         """Invalidate the stale case analysis cache to force refresh"""
-        self._cached_stale_results = None
-        self._cache_timestamp = None
+        with self._lock:
+            self._cached_stale_results = None
+            self._cache_timestamp = None
+            self._stale_generation += 1
         logger.info("Stale case analysis cache invalidated - will refresh on next request")
-    
+
+    def apply_case_changes(self, case_manager, changes):
+        """
+        Update the cached stale analysis for only the PVs a spreadsheet reload touched
+
+        Args:
+            case_manager: CaseManager instance (already holding the new data)
+            changes: Change set from CaseManager.reload_cases (added/removed/changed PV lists)
+
+        Returns:
+            set: Category names whose contents changed
+        """
+        with self._lock:
+            if not self._cached_stale_results:
+                # Nothing cached yet - the next analysis will be built from the new data anyway
+                return set()
+
+            affected = set(changes.get("added", [])) | set(changes.get("removed", [])) | set(changes.get("changed", []))
+            if not affected:
+                return set()
+
+            touched_categories = set()
+
+            # Drop every affected PV from the cached categories
+            for category, cases in self._cached_stale_results.items():
+                kept = [case for case in cases if str(case.get("pv")) not in affected]
+                if len(kept) != len(cases):
+                    touched_categories.add(category)
+                    self._cached_stale_results[category] = kept
+
+            # Re-categorize added and changed PVs from a single lookup of their rows
+            to_analyze = set(changes.get("added", [])) | set(changes.get("changed", []))
+            if to_analyze:
+                try:
+                    cases_df = case_manager.df
+                    pv_column = cases_df[1].astype(str).str.strip()
+                    rows = cases_df[pv_column.isin(to_analyze)].drop_duplicates(subset=[1], keep="first")
+                except Exception as e:
+                    logger.error(f"Error looking up changed cases, invalidating stale cache: {e}")
+                    self.invalidate_stale_case_cache()
+                    return set(self._empty_stale_categories().keys())
+
+                sent_emails_data = parse_sent_emails_log()
+                new_categories = self._empty_stale_categories()
+                missing_cases = []
+
+                for _, row in rows.iterrows():
+                    case_info = case_manager.format_case(row)
+                    pv = str(case_info.get("PV", "")).strip()
+                    if pv:
+                        self._categorize_stale_case(pv, case_info, sent_emails_data, True,
+                                                    new_categories, missing_cases)
+
+                for category, cases in new_categories.items():
+                    if not cases:
+                        continue
+                    touched_categories.add(category)
+                    merged = self._cached_stale_results.setdefault(category, []) + cases
+                    merged.sort(key=lambda x: x.get("days_since_contact") or 0, reverse=True)
+                    self._cached_stale_results[category] = merged
+
+            logger.info(f"Applied spreadsheet changes for {len(affected)} cases to stale cache "
+                        f"({len(touched_categories)} categories updated)")
+            return touched_categories
+
+    def _empty_stale_categories(self):
+        """Return an empty stale category structure"""
+        return {
+            "critical": [],
+            "high_priority": [],
+            "needs_follow_up": [],
+            "no_contact": [],
+            "no_response": [],
+            "missing_from_bootstrap": [],
+            "never_contacted": [],
+            "recently_sent": [],
+            "missing_doi": [],
+            "ccp_335_1": []
+        }
+
     def _save_missing_cases_log(self, missing_cases):
         """Save list of missing cases for backfill command"""
         try:
@@ -1052,55 +1204,55 @@ class CollectionsTracker:
     
     def clear_stale_cache(self):
         """Clear the stale case analysis cache to force fresh analysis"""
-        if hasattr(self, '_cached_stale_results'):
-            delattr(self, '_cached_stale_results')
-        if hasattr(self, '_cache_timestamp'):
-            delattr(self, '_cache_timestamp')
+        with self._lock:
+            self._cached_stale_results = None
+            self._cache_timestamp = None
         logger.info("Stale case cache cleared")
     
     def recalculate_response_counts(self):
         """Recalculate response counts excluding our own emails and bounces"""
-        logger.info("Recalculating response counts...")
+        with self._lock:
+            logger.info("Recalculating response counts...")
         
-        for case_pv, case_data in self.data["cases"].items():
-            response_count = 0
-            activities = case_data.get("activities", [])
+            for case_pv, case_data in self.data["cases"].items():
+                response_count = 0
+                activities = case_data.get("activities", [])
             
-            for activity in activities:
-                if activity.get("type") == "email_received":
-                    details = activity.get("details", {})
-                    sender = details.get("sender_email", "").lower()
+                for activity in activities:
+                    if activity.get("type") == "email_received":
+                        details = activity.get("details", {})
+                        sender = details.get("sender_email", "").lower()
                     
-                    # Skip our own emails
-                    if 'dean' in sender or 'prohealth' in sender or 'hyland' in sender:
-                        continue
+                        # Skip our own emails
+                        if 'dean' in sender or 'prohealth' in sender or 'hyland' in sender:
+                            continue
                     
-                    # Skip daemon/bounce emails
-                    daemon_indicators = ['mailer-daemon', 'postmaster', 'delivery', 'undeliverable', 
-                                       'bounce', 'failure', 'failed', 'rejected', 'returned mail']
-                    if any(indicator in sender for indicator in daemon_indicators):
-                        continue
+                        # Skip daemon/bounce emails
+                        daemon_indicators = ['mailer-daemon', 'postmaster', 'delivery', 'undeliverable', 
+                                           'bounce', 'failure', 'failed', 'rejected', 'returned mail']
+                        if any(indicator in sender for indicator in daemon_indicators):
+                            continue
                     
-                    # Skip auto-replies
-                    subject = details.get("subject", "").lower()
-                    auto_reply_indicators = ['out of office', 'auto-reply', 'automatic reply', 
-                                           'away from office', 'on vacation', 'on leave']
-                    if any(indicator in subject for indicator in auto_reply_indicators):
-                        continue
+                        # Skip auto-replies
+                        subject = details.get("subject", "").lower()
+                        auto_reply_indicators = ['out of office', 'auto-reply', 'automatic reply', 
+                                               'away from office', 'on vacation', 'on leave']
+                        if any(indicator in subject for indicator in auto_reply_indicators):
+                            continue
                     
-                    # This is a legitimate response
-                    response_count += 1
+                        # This is a legitimate response
+                        response_count += 1
             
-            # Update the response count
-            case_data["response_count"] = response_count
+                # Update the response count
+                case_data["response_count"] = response_count
         
-        # Save the updated data
-        self._save_tracking_data()
+            # Save the updated data
+            self._save_tracking_data()
         
-        # Clear cache to force refresh
-        self.clear_stale_cache()
+            # Clear cache to force refresh
+            self.invalidate_stale_case_cache()
         
-        logger.info(f"Response counts recalculated for {len(self.data['cases'])} cases")
+            logger.info(f"Response counts recalculated for {len(self.data['cases'])} cases")
     
     def get_stale_cases_by_category(self, case_manager, category, limit=10):
         """
@@ -1125,22 +1277,52 @@ class CollectionsTracker:
         """
         Mark a case as recently contacted to move it out of stale categories
         """
-        if pv in self.data["cases"]:
-            self.log_case_activity(
-                case_pv=pv,
-                activity_type="email_sent",
-                details={
-                    "contact_type": contact_type,
-                    "manual_update": True,
-                    "timestamp": datetime.now().isoformat()
-                }
-            )
-            # Clear cache so next stale analysis will be fresh
-            if hasattr(self, '_cached_stale_results'):
-                delattr(self, '_cached_stale_results')
-            logger.info(f"Marked case {pv} as contacted - moved out of stale categories")
-            return True
-        return False
+        with self._lock:
+            if pv in self.data["cases"]:
+                self.log_case_activity(
+                    case_pv=pv,
+                    activity_type="email_sent",
+                    details={
+                        "contact_type": contact_type,
+                        "manual_update": True,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                )
+                # Clear cache so next stale analysis will be fresh
+                self.invalidate_stale_case_cache()
+                logger.info(f"Marked case {pv} as contacted - moved out of stale categories")
+                return True
+            return False
+    
+    def mark_cases_contacted(self, pvs, contact_type="follow_up"):
+        """
+        Mark several cases as contacted with a single save of the tracking file
+        
+        Returns:
+            Number of tracked cases updated
+        """
+        with self._lock:
+            updated = 0
+            timestamp = datetime.now().isoformat()
+            for pv in pvs:
+                if pv in self.data["cases"]:
+                    self.log_case_activity(
+                        case_pv=pv,
+                        activity_type="email_sent",
+                        details={
+                            "contact_type": contact_type,
+                            "manual_update": True,
+                            "timestamp": timestamp
+                        },
+                        save=False
+                    )
+                    updated += 1
+        
+            if updated:
+                self.invalidate_stale_case_cache()
+                self._save_tracking_data()
+                logger.info(f"Marked {updated} cases as contacted - moved out of stale categories")
+            return updated
     
     def _get_case_basic_info(self, case_manager, pv):
         """Fast lookup of basic case info by PV number"""
@@ -1250,13 +1432,14 @@ class CollectionsTracker:
                                     )
                                     
                                     # Update case metadata
-                                    if case["PV"] in self.data["cases"]:
-                                        # Use actual email date, not current time
-                                        self.data["cases"][case["PV"]]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
-                                        
-                                        # Set firm email
-                                        if to_email and "@" in to_email:
-                                            self.data["cases"][case["PV"]]["firm_email"] = to_email
+                                    with self._lock:
+                                        if case["PV"] in self.data["cases"]:
+                                            # Use actual email date, not current time
+                                            self.data["cases"][case["PV"]]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
+                                            
+                                            # Set firm email
+                                            if to_email and "@" in to_email:
+                                                self.data["cases"][case["PV"]]["firm_email"] = to_email
                                     
                                     matched_activities += 1
                                     
@@ -1326,13 +1509,14 @@ class CollectionsTracker:
                                     )
                                     
                                     # Update response count and potentially last_contact if this is more recent
-                                    if case["PV"] in self.data["cases"]:
-                                        self.data["cases"][case["PV"]]["response_count"] += 1
-                                        
-                                        # If this received email is more recent than last_contact, update it
-                                        current_last = self.data["cases"][case["PV"]].get("last_contact")
-                                        if email_date and (not current_last or email_date.isoformat() > current_last):
-                                            self.data["cases"][case["PV"]]["last_contact"] = email_date.isoformat()
+                                    with self._lock:
+                                        if case["PV"] in self.data["cases"]:
+                                            self.data["cases"][case["PV"]]["response_count"] += 1
+                                            
+                                            # If this received email is more recent than last_contact, update it
+                                            current_last = self.data["cases"][case["PV"]].get("last_contact")
+                                            if email_date and (not current_last or email_date.isoformat() > current_last):
+                                                self.data["cases"][case["PV"]]["last_contact"] = email_date.isoformat()
                                     
                                 except Exception as e:
                                     logger.error(f"Error processing received email for case {case['PV']}: {e}")
@@ -1453,10 +1637,11 @@ class CollectionsTracker:
                                 )
                                 
                                 # Update case metadata
-                                if pv in self.data["cases"]:
-                                    self.data["cases"][pv]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
-                                    if to_email and "@" in to_email:
-                                        self.data["cases"][pv]["firm_email"] = to_email
+                                with self._lock:
+                                    if pv in self.data["cases"]:
+                                        self.data["cases"][pv]["last_contact"] = email_date.isoformat() if email_date else datetime.now().isoformat()
+                                        if to_email and "@" in to_email:
+                                            self.data["cases"][pv]["firm_email"] = to_email
                                 
                         except Exception as e:
                             logger.error(f"Error processing backfill email for case {pv}: {e}")
@@ -1474,7 +1659,7 @@ class CollectionsTracker:
         self._save_tracking_data()
         
         # Clear stale cache so next analysis uses new data
-        self.clear_stale_cache()
+        self.invalidate_stale_case_cache()
         
         # Archive the missing cases log
         try:
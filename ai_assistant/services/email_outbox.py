@@ -0,0 +1,413 @@
+"""
+Email Outbox Service
+Durable SQLite send queue for bulk emails (queued -> sending -> sent/failed)
+"""
+
+import json
+import os
+import random
+import secrets
+import socket
+import sqlite3
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Outbox states
+QUEUED = "queued"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+# Reported for failed rows that were mid-send at a crash (they may have gone out)
+INTERRUPTED = "interrupted"
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# Claims left in 'sending' this long by another process are treated as abandoned by a crash
+# (well over one Gmail send; rows from a crash just before a restart stay put until the next start)
+STALE_CLAIM_SECONDS = 300
+
+# Marks the rows this process is sending, so recovery never touches them
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+
+
+def make_idempotency_key(pv, template: str, test_mode: bool = False, day: str = None) -> str:
+    """One email per case, template and day (test sends never block real ones)"""
+    day = day or datetime.now().strftime("%Y-%m-%d")
+    key = f"{str(pv).strip()}:{template or 'standard'}:{day}"
+    return f"test:{key}" if test_mode else key
+
+
+class EmailOutbox:
+    """Persistent outbox so a crash mid-batch never loses track of what was sent"""
+
+    def __init__(self, db_path: str = None, max_attempts: int = None, retry_base_seconds: int = None):
+        self.db_path = db_path or Config.get_file_path(Config.OUTBOX_DB_PATH)
+        self.max_attempts = max_attempts or Config.OUTBOX_MAX_ATTEMPTS
+        self.retry_base_seconds = retry_base_seconds or Config.OUTBOX_RETRY_BASE_SECONDS
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation so worker threads can share the outbox"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the outbox table if needed"""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT NOT NULL UNIQUE,
+                    batch_id TEXT,
+                    pv TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    to_addr TEXT NOT NULL,
+                    subject TEXT,
+                    payload TEXT NOT NULL,
+                    test_mode INTEGER NOT NULL DEFAULT 0,
+                    add_cms_notes INTEGER NOT NULL DEFAULT 1,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    msg_id TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    sent_at TEXT,
+                    scheduled INTEGER NOT NULL DEFAULT 0,
+                    timezone TEXT
+                )
+            """)
+            # Outboxes created before scheduled sends existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            if "scheduled" not in columns:
+                conn.execute("ALTER TABLE outbox ADD COLUMN scheduled INTEGER NOT NULL DEFAULT 0")
+            if "timezone" not in columns:
+                conn.execute("ALTER TABLE outbox ADD COLUMN timezone TEXT")
+            if "claimed_by" not in columns:
+                conn.execute("ALTER TABLE outbox ADD COLUMN claimed_by TEXT")
+            if "interrupted" not in columns:
+                conn.execute("ALTER TABLE outbox ADD COLUMN interrupted INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox (state, next_attempt_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_batch ON outbox (batch_id)")
+            # Per-case keys covered by a digest row, so a case is emailed once a day either way
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox_case_claims (
+                    case_key TEXT NOT NULL,
+                    outbox_id INTEGER NOT NULL,
+                    PRIMARY KEY (case_key, outbox_id)
+                )
+            """)
+    
+    @staticmethod
+    def _filters(batch_id: str = None, scheduled: bool = None) -> Tuple[str, list]:
+        """Extra WHERE conditions for an optional batch and scheduled/immediate filter"""
+        conditions = ""
+        params = []
+        if batch_id:
+            conditions += " AND batch_id = ?"
+            params.append(batch_id)
+        if scheduled is not None:
+            conditions += " AND scheduled = ?"
+            params.append(int(scheduled))
+        return conditions, params
+
+    @staticmethod
+    def _case_keys(email: Dict, test_mode: bool) -> List[str]:
+        """Per-case idempotency keys of a digest's cases (empty for a single-case email)"""
+        return [make_idempotency_key(case["pv"], case.get("email_type") or "standard", test_mode)
+                for case in email.get("digest_cases") or []]
+
+    @staticmethod
+    def _live_claim(conn, case_key: str, exclude_id: int = None) -> Optional[str]:
+        """State of a row (single email or digest) that still holds a case key, if any
+
+        Interrupted rows keep their claim - they may have been delivered.
+        """
+        row = conn.execute("""
+            SELECT state, interrupted FROM outbox
+            WHERE idempotency_key = ? AND (state != ? OR interrupted = 1) AND id != ?
+            UNION ALL
+            SELECT o.state, o.interrupted FROM outbox_case_claims c JOIN outbox o ON o.id = c.outbox_id
+            WHERE c.case_key = ? AND (o.state != ? OR o.interrupted = 1) AND o.id != ?
+            LIMIT 1
+        """, (case_key, FAILED, exclude_id or -1, case_key, FAILED, exclude_id or -1)).fetchone()
+        if row is None:
+            return None
+        return INTERRUPTED if row["interrupted"] else row["state"]
+
+    def claimed_cases(self, emails: List[Dict], test_mode: bool = False) -> List[Dict]:
+        """Single-case emails whose case already went out (or is queued) today, as enqueue duplicates"""
+        claimed = []
+        with self._connect() as conn:
+            for email in emails:
+                key = make_idempotency_key(email["pv"], email.get("email_type", "standard"), test_mode)
+                state = self._live_claim(conn, key)
+                if state:
+                    claimed.append({"pv": email["pv"], "state": state, "key": key})
+        return claimed
+
+    def enqueue(self, emails: List[Dict], batch_id: str, test_mode: bool = False, add_cms_notes: bool = True,
+                schedule: List[Tuple[float, str]] = None) -> Dict:
+        """
+        Queue emails for sending
+
+        Args:
+            schedule: Optional (send_at timestamp, timezone) per email for delivery windows
+
+        Returns:
+            {"queued": [row ids], "duplicates": [{"pv", "state", "key"}]}
+        """
+        result = {"queued": [], "duplicates": []}
+        now = datetime.now().isoformat()
+
+        with self._connect() as conn:
+            for index, email in enumerate(emails):
+                send_at, timezone = schedule[index] if schedule else (0, None)
+                scheduled = int(schedule is not None)
+                template = email.get("email_type", "standard")
+                key = make_idempotency_key(email["pv"], template, test_mode)
+                existing = conn.execute(
+                    "SELECT id, state, interrupted FROM outbox WHERE idempotency_key = ?", (key,)
+                ).fetchone()
+
+                if existing and existing["interrupted"]:
+                    # Only requeue_failed() sends these again, once the Sent folder was checked
+                    result["duplicates"].append({"pv": email["pv"], "state": INTERRUPTED, "key": key})
+                    continue
+                if existing and existing["state"] != FAILED:
+                    result["duplicates"].append({"pv": email["pv"], "state": existing["state"], "key": key})
+                    continue
+
+                # A case is claimed by its own key or by a digest that covers it
+                case_keys = self._case_keys(email, test_mode)
+                exclude_id = existing["id"] if existing else None
+                claim_state = None
+                for case_key in case_keys or [key]:
+                    claim_state = self._live_claim(conn, case_key, exclude_id)
+                    if claim_state:
+                        break
+                if claim_state:
+                    result["duplicates"].append({"pv": email["pv"], "state": claim_state, "key": key})
+                    continue
+
+                payload = json.dumps(email, default=str)
+                if existing:
+                    # A failed email may be queued again as part of a new batch
+                    conn.execute("""
+                        UPDATE outbox SET batch_id = ?, to_addr = ?, subject = ?, payload = ?,
+                            test_mode = ?, add_cms_notes = ?, state = ?, attempts = 0,
+                            next_attempt_at = ?, last_error = NULL, updated_at = ?, scheduled = ?, timezone = ?
+                        WHERE id = ?
+                    """, (batch_id, email["to"], email.get("subject"), payload, int(test_mode),
+                          int(add_cms_notes), QUEUED, send_at, now, scheduled, timezone, existing["id"]))
+                    row_id = existing["id"]
+                else:
+                    cursor = conn.execute("""
+                        INSERT INTO outbox (idempotency_key, batch_id, pv, template, to_addr, subject,
+                            payload, test_mode, add_cms_notes, state, next_attempt_at, created_at, updated_at,
+                            scheduled, timezone)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (key, batch_id, str(email["pv"]), template, email["to"], email.get("subject"),
+                          payload, int(test_mode), int(add_cms_notes), QUEUED, send_at, now, now,
+                          scheduled, timezone))
+                    row_id = cursor.lastrowid
+                conn.executemany("INSERT OR IGNORE INTO outbox_case_claims (case_key, outbox_id) VALUES (?, ?)",
+                                 [(case_key, row_id) for case_key in case_keys])
+                result["queued"].append(row_id)
+
+        logger.info(f"Outbox batch {batch_id}: queued {len(result['queued'])}, "
+                    f"skipped {len(result['duplicates'])} duplicates")
+        return result
+
+    def claim_next(self, batch_id: str = None, scheduled: bool = None) -> Optional[Dict]:
+        """Atomically move the next ready email from queued to sending"""
+        now = datetime.now()
+        conditions, params = self._filters(batch_id, scheduled)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM outbox WHERE state = ? AND next_attempt_at <= ?" + conditions
+                + " ORDER BY next_attempt_at, id LIMIT 1",
+                [QUEUED, now.timestamp(), *params]
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE outbox SET state = ?, attempts = attempts + 1, updated_at = ?, claimed_by = ? WHERE id = ?",
+                (SENDING, now.isoformat(), PROCESS_OWNER, row["id"])
+            )
+
+        claimed = dict(row)
+        claimed["attempts"] += 1
+        claimed["email"] = json.loads(claimed.pop("payload"))
+        return claimed
+
+    def mark_sent(self, row_id: int, msg_id: str):
+        """Record a successful send"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET state = ?, msg_id = ?, last_error = NULL, sent_at = ?, updated_at = ? WHERE id = ?",
+                (SENT, msg_id, now, now, row_id)
+            )
+
+    def mark_failed(self, row_id: int, error: str, retryable: bool = True) -> str:
+        """Schedule a retry with exponential backoff, or fail permanently; returns the new state"""
+        now = datetime.now()
+        with self._connect() as conn:
+            row = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (row_id,)).fetchone()
+            attempts = row["attempts"] if row else self.max_attempts
+
+            if retryable and attempts < self.max_attempts:
+                delay = min(self.retry_base_seconds * (2 ** (attempts - 1)), MAX_RETRY_DELAY_SECONDS)
+                delay *= random.uniform(0.8, 1.2)
+                state = QUEUED
+                next_attempt_at = now.timestamp() + delay
+            else:
+                state = FAILED
+                next_attempt_at = 0
+
+            conn.execute(
+                "UPDATE outbox SET state = ?, last_error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (state, str(error)[:500], next_attempt_at, now.isoformat(), row_id)
+            )
+        return state
+
+    def recover_interrupted(self, stale_seconds: int = STALE_CLAIM_SECONDS) -> int:
+        """
+        Resolve emails left in 'sending' by a crash (run once at startup)
+
+        Only claims made by another process and untouched for stale_seconds are
+        resolved - a sender in this process may be mid-send on its own rows.
+        Gmail may or may not have accepted them, so they are failed rather than
+        re-sent, and enqueue() reports them as duplicates instead of queueing them again;
+        check the Sent folder and use requeue_failed() if they did not go out.
+        """
+        stale_before = datetime.fromtimestamp(time.time() - stale_seconds).isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                UPDATE outbox SET state = ?, last_error = ?, updated_at = ?, interrupted = 1
+                WHERE state = ? AND (claimed_by IS NULL OR claimed_by != ?) AND updated_at < ?
+            """, (FAILED, "Interrupted while sending - check Sent folder before retrying",
+                  datetime.now().isoformat(), SENDING, PROCESS_OWNER, stale_before))
+            count = cursor.rowcount
+        if count:
+            logger.warning(f"Outbox: {count} emails were interrupted mid-send and marked failed")
+        return count
+
+    def requeue_failed(self, row_ids: List[int] = None) -> int:
+        """Put failed emails back in the queue (all of them when no ids are given)
+
+        This is the explicit retry that also releases interrupted emails.
+        """
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            if row_ids:
+                placeholders = ",".join("?" * len(row_ids))
+                cursor = conn.execute(
+                    f"UPDATE outbox SET state = ?, attempts = 0, next_attempt_at = 0, updated_at = ?, interrupted = 0 "
+                    f"WHERE state = ? AND id IN ({placeholders})",
+                    [QUEUED, now, FAILED, *row_ids]
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE outbox SET state = ?, attempts = 0, next_attempt_at = 0, updated_at = ?, interrupted = 0 "
+                    "WHERE state = ?",
+                    (QUEUED, now, FAILED)
+                )
+            return cursor.rowcount
+
+    def next_retry_delay(self, batch_id: str = None, scheduled: bool = None) -> Optional[float]:
+        """Seconds until the next queued email is due (None when nothing is queued)"""
+        conditions, params = self._filters(batch_id, scheduled)
+        with self._connect() as conn:
+            next_at = conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE state = ?" + conditions, [QUEUED, *params]
+            ).fetchone()[0]
+        if next_at is None:
+            return None
+        return max(0.0, next_at - time.time())
+
+    def stats(self, batch_id: str = None, scheduled: bool = None) -> Dict[str, int]:
+        """Count emails per state"""
+        conditions, params = self._filters(batch_id, scheduled)
+        counts = {QUEUED: 0, SENDING: 0, SENT: 0, FAILED: 0}
+        with self._connect() as conn:
+            for state, count in conn.execute(
+                "SELECT state, COUNT(*) FROM outbox WHERE 1 = 1" + conditions + " GROUP BY state", params
+            ):
+                counts[state] = count
+        return counts
+
+    def sent_since(self, since: datetime) -> int:
+        """Number of emails sent at or after the given time (seeds the daily send ceiling)"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state = ? AND sent_at >= ?", (SENT, since.isoformat())
+            ).fetchone()[0]
+
+    def pending_count(self, scheduled: bool = None) -> int:
+        """Number of emails still waiting to be sent"""
+        return self.stats(scheduled=scheduled)[QUEUED]
+
+    def get_missed_scheduled(self, before: float) -> List[Dict]:
+        """Scheduled emails whose slot passed before the given timestamp without a send attempt"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, pv, to_addr, timezone, next_attempt_at FROM outbox "
+                "WHERE state = ? AND scheduled = 1 AND attempts = 0 AND next_attempt_at < ? "
+                "ORDER BY next_attempt_at, id", (QUEUED, before)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def reschedule(self, slots: List[Tuple[int, float]]):
+        """Move queued emails to new send times ([(row id, timestamp)])"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET next_attempt_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+                [(send_at, now, row_id, QUEUED) for row_id, send_at in slots]
+            )
+
+    def scheduled_summary(self) -> Dict:
+        """Pending scheduled emails: count and the first and last planned send times"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), MIN(next_attempt_at), MAX(next_attempt_at) FROM outbox "
+                "WHERE state = ? AND scheduled = 1", (QUEUED,)
+            ).fetchone()
+        count, first, last = row[0], row[1], row[2]
+        return {
+            "pending": count,
+            "next_send": datetime.fromtimestamp(first) if count else None,
+            "last_send": datetime.fromtimestamp(last) if count else None,
+        }
+
+    def get_failed(self, limit: int = 100) -> List[Dict]:
+        """Most recent permanently failed emails"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, pv, to_addr, template, attempts, last_error, interrupted, updated_at FROM outbox "
+                "WHERE state = ? ORDER BY updated_at DESC LIMIT ?", (FAILED, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -22,11 +22,16 @@ class GmailService:
     
     def __init__(self, email_cache_service=None):
         self.service = None
+        self.api_endpoint = None
         self.email_cache_service = email_cache_service
         self._authenticate()
     
     def _authenticate(self):
         """Authenticate with Gmail API using seamless OAuth2"""
+        if Config.GMAIL_API_ENDPOINT:
+            self._connect_endpoint(Config.GMAIL_API_ENDPOINT)
+            return
+        
         # Look for credentials and token in the ai_assistant directory
         base_dir = os.path.dirname(os.path.dirname(__file__))
         token_path = os.path.join(base_dir, "token.json")
@@ -59,6 +64,27 @@ class GmailService:
             logger.error(f"Authentication failed: {e}")
             raise Exception(f"Failed to authenticate with Gmail: {e}")
     
+    def _connect_endpoint(self, endpoint):
+        """Use a Gmail-compatible server without OAuth (e.g. utils/fake_gmail_server.py for benchmarks)"""
+        import httplib2
+        
+        self.api_endpoint = endpoint.rstrip("/") + "/"
+        self.service = build(
+            "gmail", "v1",
+            http=httplib2.Http(timeout=60),
+            client_options={"api_endpoint": self.api_endpoint},
+            static_discovery=True,
+            cache_discovery=False
+        )
+        logger.warning(f"Gmail service using API endpoint {self.api_endpoint} - not the real mailbox")
+    
+    def new_batch_request(self, callback=None):
+        """Batch request bound to the configured endpoint (googleapiclient defaults to Google's batch URL)"""
+        if self.api_endpoint:
+            from googleapiclient.http import BatchHttpRequest
+            return BatchHttpRequest(callback=callback, batch_uri=self.api_endpoint + "batch/gmail/v1")
+        return self.service.new_batch_http_request(callback=callback)
+    
     def search_messages(self, query, max_results=None, progress=None):
         """
         Search Gmail messages with a query
@@ -378,7 +404,7 @@ class GmailService:
             
         except Exception as e:
             logger.error(f"Failed to send email to {recipient_email}: {e}")
-            raise Exception(f"Failed to send email: {e}")
+            raise Exception(f"Failed to send email: {e}") from e
     
     def get_message(self, message_id):
         """
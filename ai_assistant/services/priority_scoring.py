@@ -0,0 +1,136 @@
+"""
+Priority Scoring Service
+Vectorized collection-likelihood scores (0-100) for every case, cached between tracker changes
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default points when nothing better is known
+UNKNOWN_FIRM_POINTS = 20
+BAD_DOI_POINTS = 15
+NO_TRACKER_POINTS = 10
+
+
+class PriorityScorer:
+    """
+    Scores all cases in one pass over the typed case table
+
+    Scoring factors:
+    - Firm responsiveness history from firm_intelligence.json (0-40 points)
+    - Case age sweet spot (0-30 points)
+    - Days since last contact from the collections tracker (0-20 points)
+
+    Scores are cached and rebuilt only when the case table, the tracker
+    revision or the firm scores change.
+    """
+
+    def __init__(self, case_manager, collections_tracker=None, firm_scores: Dict = None):
+        self.case_manager = case_manager
+        self.collections_tracker = collections_tracker
+        self.firm_scores = firm_scores if firm_scores is not None else {}
+        self._scores = None
+        self._scored_table = None
+        self._cache_key = None
+        self._firm_revision = 0
+
+    @property
+    def firm_revision(self) -> int:
+        """Bumped whenever firm scores change"""
+        return self._firm_revision
+    
+    def invalidate(self):
+        """Drop cached scores (call after firm scores change)"""
+        self._firm_revision += 1
+        self._scores = None
+
+    def get_scores(self) -> pd.Series:
+        """PV -> priority score for every case, recomputed only when its inputs changed"""
+        table = self.case_manager.get_case_table()
+        tracker_revision = getattr(self.collections_tracker, "revision", None)
+        cache_key = (tracker_revision, self._firm_revision)
+
+        if self._scores is None or self._cache_key != cache_key or self._scored_table is not table:
+            try:
+                scores = self.score_table(table)
+                self._scores = pd.Series(scores.values, index=table["PV"]).groupby(level=0).first()
+            except Exception as e:
+                logger.error(f"Error scoring case priorities: {e}")
+                return pd.Series(dtype=int)
+            self._scored_table = table
+            self._cache_key = cache_key
+            logger.info(f"Scored priority for {len(self._scores)} cases")
+        return self._scores
+
+    def score(self, pv) -> int:
+        """Cached priority score for a single PV (0 if the case is unknown)"""
+        return int(self.get_scores().get(str(pv).strip(), 0))
+
+    def sort_cases(self, cases: List[Dict]) -> List[Dict]:
+        """Set priority_score on each case dict and return them highest first"""
+        scores = self.get_scores()
+        for case in cases:
+            case["priority_score"] = int(scores.get(str(case.get("pv", "")).strip(), 0))
+        return sorted(cases, key=lambda case: case["priority_score"], reverse=True)
+
+    def score_table(self, table: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> pd.Series:
+        """Compute scores for every row of a typed case table"""
+        now = now or pd.Timestamp.now()
+        score = self._firm_points(table) + self._age_points(table, now) + self._contact_points(table, now)
+        return score.clip(upper=100).astype(int)
+
+    def _firm_points(self, table: pd.DataFrame) -> pd.Series:
+        """Firm responsiveness (0-40 points); unknown firms get a middle score"""
+        response_rates = {
+            str(email).lower(): data.get("response_rate", 0.5)
+            for email, data in self.firm_scores.items() if isinstance(data, dict)
+        }
+        rates = table["Attorney Email"].str.lower().map(response_rates)
+        points = (rates * 40).fillna(UNKNOWN_FIRM_POINTS)
+        return np.floor(points).astype(int)
+
+    def _age_points(self, table: pd.DataFrame, now: pd.Timestamp) -> pd.Series:
+        """Case age sweet spot (0-30 points) - best is 6-18 months old"""
+        months_old = (now - table["DOI Date"]).dt.days / 30
+        points = np.select(
+            [
+                (months_old >= 6) & (months_old <= 18),   # Perfect age
+                (months_old >= 3) & (months_old < 6),     # Good but young
+                (months_old > 18) & (months_old <= 24),   # Good but aging
+                (months_old > 24) & (months_old <= 36),   # Getting old
+            ],
+            [30, 20, 20, 10],
+            default=0
+        )
+        # A DOI that is filled in but cannot be parsed (2099 placeholders excluded)
+        unparseable = (
+            (table["DOI"] != "")
+            & table["DOI Date"].isna()
+            & ~table["DOI"].str.contains("2099", regex=False)
+        )
+        return pd.Series(np.where(unparseable, BAD_DOI_POINTS, points), index=table.index)
+
+    def _contact_points(self, table: pd.DataFrame, now: pd.Timestamp) -> pd.Series:
+        """Days since last contact (0-20 points); recent contact scores 0 so firms are not pestered"""
+        if not self.collections_tracker:
+            return pd.Series(NO_TRACKER_POINTS, index=table.index)
+
+        last_contacts = self.collections_tracker.get_last_contact_map()
+        last_contact = pd.to_datetime(table["PV"].map(last_contacts), errors="coerce")
+        days_since = (now - last_contact).dt.days
+        points = np.select(
+            [
+                days_since.isna(),                             # Never contacted - high priority
+                (days_since >= 20) & (days_since <= 40),      # Perfect follow-up window
+                (days_since > 40) & (days_since <= 60),       # Good follow-up window
+                (days_since > 60) & (days_since <= 90),       # Needs attention
+                days_since > 90,                              # Long overdue
+            ],
+            [20, 20, 15, 10, 5],
+            default=0
+        )
+        return pd.Series(points, index=table.index)
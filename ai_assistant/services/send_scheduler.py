@@ -0,0 +1,152 @@
+"""
+Send Window Scheduler
+Plans bulk emails into the recipient firm's local business hours and spreads them across the window
+"""
+
+import json
+import os
+import logging
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, List, Tuple
+import pytz
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Emails this far past their slot without an attempt were missed (app closed, long backlog)
+MISSED_GRACE_SECONDS = 300
+
+
+def parse_clock(value: str) -> dt_time:
+    """'09:00' -> time(9, 0)"""
+    hours, minutes = str(value).strip().split(":")
+    return dt_time(int(hours), int(minutes))
+
+
+class SendScheduler:
+    """Assigns send times inside per-timezone business-hour windows and keeps the outbox on plan"""
+
+    def __init__(self, outbox, timezones_file: str = None, default_timezone: str = None,
+                 window_start: str = None, window_end: str = None, weekdays: str = None):
+        self.outbox = outbox
+        self.timezones_file = timezones_file or Config.get_file_path("data/firm_timezones.json")
+        self.default_timezone = default_timezone or Config.SEND_WINDOW_TIMEZONE
+        self.window_start = parse_clock(window_start or Config.SEND_WINDOW_START)
+        self.window_end = parse_clock(window_end or Config.SEND_WINDOW_END)
+        self.weekdays = {int(day) for day in str(weekdays or Config.SEND_WINDOW_WEEKDAYS).split(",") if day.strip()}
+        if self.window_end <= self.window_start:
+            raise ValueError(f"Send window must end after it starts ({self.window_start}-{self.window_end})")
+        self.firm_timezones = self._load_firm_timezones()
+
+    def _load_firm_timezones(self) -> Dict[str, str]:
+        """Address or domain -> timezone overrides (e.g. {"smithlaw.com": "America/New_York"})"""
+        if os.path.exists(self.timezones_file):
+            try:
+                with open(self.timezones_file, 'r', encoding='utf-8') as f:
+                    return {str(key).strip().lower(): value for key, value in json.load(f).items()}
+            except Exception as e:
+                logger.error(f"Error loading firm timezones: {e}")
+        return {}
+
+    def timezone_for(self, address: str) -> str:
+        """Timezone for a recipient address: exact address, then domain, then the default"""
+        address = str(address or "").strip().lower()
+        domain = address.rsplit("@", 1)[-1]
+        tz_name = self.firm_timezones.get(address) or self.firm_timezones.get(domain) or self.default_timezone
+        try:
+            pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            logger.warning(f"Unknown timezone '{tz_name}' for {address} - using {self.default_timezone}")
+            tz_name = self.default_timezone
+        return tz_name
+
+    def window_at(self, tz_name: str, moment: datetime) -> Tuple[datetime, datetime]:
+        """The business-hour window containing moment, or the next one to open (aware datetimes)"""
+        tz = pytz.timezone(tz_name)
+        local = moment.astimezone(tz)
+        day = local.date()
+        for _ in range(8):
+            if day.weekday() in self.weekdays:
+                opens = tz.localize(datetime.combine(day, self.window_start))
+                closes = tz.localize(datetime.combine(day, self.window_end))
+                if local < closes:
+                    return opens, closes
+            day += timedelta(days=1)
+        raise ValueError("Send window has no weekdays configured")
+
+    def is_open(self, tz_name: str, moment: datetime = None) -> bool:
+        """Whether the window for the timezone is open at moment (default now)"""
+        moment = moment or datetime.now(pytz.utc)
+        opens, closes = self.window_at(tz_name, moment)
+        return opens <= moment < closes
+
+    def plan_slots(self, count: int, tz_name: str, per_minute: float, per_day: int,
+                   start: datetime = None) -> List[float]:
+        """
+        Evenly spaced send timestamps for count emails in the timezone's windows
+
+        Each window takes at most what the rate ceilings allow (per_minute over the
+        window length, capped by per_day); the rest roll over to the next window.
+        """
+        cursor = start or datetime.now(pytz.utc)
+        slots = []
+        while len(slots) < count:
+            opens, closes = self.window_at(tz_name, cursor)
+            window_start = max(cursor, opens)
+            seconds = (closes - window_start).total_seconds()
+            capacity = min(per_day, int(seconds / 60 * per_minute))
+            take = min(capacity, count - len(slots))
+            if take > 0:
+                interval = seconds / take
+                first = window_start.timestamp()
+                slots.extend(first + i * interval for i in range(take))
+            cursor = closes + timedelta(seconds=1)
+        return slots
+
+    def plan(self, emails: List[Dict], per_minute: int, per_day: int, start: datetime = None) -> List[Tuple[float, str]]:
+        """
+        (send_at, timezone) for each email, in the same order
+
+        Emails are grouped by recipient timezone; each group gets a share of the
+        rate ceilings proportional to its size so the groups together stay under them.
+        """
+        groups = {}
+        for index, email in enumerate(emails):
+            tz_name = self.timezone_for(email.get("original_to") or email.get("to"))
+            groups.setdefault(tz_name, []).append(index)
+
+        schedule = [None] * len(emails)
+        for tz_name, indices in groups.items():
+            share = len(indices) / len(emails)
+            slots = self.plan_slots(len(indices), tz_name, max(per_minute * share, 0.1),
+                                    max(1, int(per_day * share)), start)
+            for index, send_at in zip(indices, slots):
+                schedule[index] = (send_at, tz_name)
+        return schedule
+
+    def catch_up(self, per_minute: int, per_day: int, now: datetime = None) -> int:
+        """
+        Re-plan scheduled emails whose slot passed without a send (e.g. the app was closed)
+
+        Missed emails are spread over the rest of the current window if it is still
+        open, otherwise over the next one. Returns the number rescheduled.
+        """
+        now = now or datetime.now(pytz.utc)
+        missed = self.outbox.get_missed_scheduled(now.timestamp() - MISSED_GRACE_SECONDS)
+        if not missed:
+            return 0
+
+        groups = {}
+        for row in missed:
+            groups.setdefault(row["timezone"] or self.timezone_for(row["to_addr"]), []).append(row["id"])
+
+        updates = []
+        for tz_name, row_ids in groups.items():
+            share = len(row_ids) / len(missed)
+            slots = self.plan_slots(len(row_ids), tz_name, max(per_minute * share, 0.1),
+                                    max(1, int(per_day * share)), now)
+            updates.extend(zip(row_ids, slots))
+
+        self.outbox.reschedule(updates)
+        logger.info(f"Send scheduler: re-planned {len(updates)} missed scheduled emails")
+        return len(updates)
@@ -0,0 +1,171 @@
+"""
+Case Search Index
+Trigram index over patient names, law firms and attorney emails for fast fuzzy lookup
+"""
+
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Fields indexed per case and how much a match on each counts when ranking
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "law_firm": 0.8,
+    "attorney_email": 0.7,
+}
+
+
+def normalize_text(text) -> str:
+    """Lowercase, strip punctuation and sort tokens so 'LAST, FIRST' == 'First Last'"""
+    if text is None:
+        return ""
+    text = str(text).lower().strip()
+    if not text or text == "nan":
+        return ""
+    tokens = re.findall(r"[a-z0-9]+", text)
+    return " ".join(sorted(tokens))
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Return the padded trigram set for an already-normalized string"""
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class CaseSearchIndex:
+    """In-memory trigram index mapping case text fields back to PV numbers"""
+
+    def __init__(self):
+        self.postings = defaultdict(list)  # trigram -> list of text ids
+        self.texts = []                    # text id -> (normalized text, trigram count)
+        self.text_ids = {}                 # normalized text -> text id
+        self.owners = defaultdict(list)    # text id -> [(pv, field), ...]
+        self.pvs = set()
+        self.cms_by_pv = {}                # pv -> CMS number, for prefix lookups
+        self.texts_by_pv = defaultdict(list)  # pv -> text ids, for narrowing searches
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build an index from the CaseManager DataFrame (header=None column layout)"""
+        index = cls()
+        if df is None or df.empty or df.shape[1] < 2:
+            return index
+
+        columns = {"name": 3, "law_firm": 12, "attorney_email": 18}
+        pvs = df[1].astype(str).str.strip().tolist()
+        cms_numbers = df[0].astype(str).str.strip().tolist()
+        field_values = {
+            field: (df[col].astype(str).tolist() if col < df.shape[1] else [""] * len(df))
+            for field, col in columns.items()
+        }
+
+        for i, pv in enumerate(pvs):
+            if not pv or pv in index.pvs:
+                continue
+            index.add_case(pv, cms=cms_numbers[i], **{field: values[i] for field, values in field_values.items()})
+
+        logger.info(f"Built case search index: {len(index.pvs)} cases, {len(index.postings)} trigrams")
+        return index
+
+    def add_case(self, pv: str, name: str = "", law_firm: str = "", attorney_email: str = "", cms: str = ""):
+        """Index the searchable fields of one case"""
+        pv = str(pv).strip()
+        self.pvs.add(pv)
+        self.cms_by_pv[pv] = str(cms).strip()
+        for field, value in (("name", name), ("law_firm", law_firm), ("attorney_email", attorney_email)):
+            normalized = normalize_text(value)
+            if not normalized:
+                continue
+            # Shared values (firm names, email domains) are indexed once
+            text_id = self.text_ids.get(normalized)
+            if text_id is None:
+                grams = trigrams(normalized)
+                text_id = len(self.texts)
+                self.texts.append((normalized, len(grams)))
+                self.text_ids[normalized] = text_id
+                for gram in grams:
+                    self.postings[gram].append(text_id)
+            self.owners[text_id].append((pv, field))
+            self.texts_by_pv[pv].append(text_id)
+
+    def prefix_search(self, query: str, restrict_to: Optional[Set[str]] = None) -> List[str]:
+        """Return PVs whose PV or CMS number starts with the query"""
+        query = str(query).strip().lower()
+        if not query:
+            return []
+        pvs = restrict_to if restrict_to is not None else self.pvs
+        return [pv for pv in pvs
+                if pv.lower().startswith(query) or self.cms_by_pv.get(pv, "").lower().startswith(query)]
+
+    def search(self, query: str, limit: int = 50, min_score: float = 0.3,
+               fields: Optional[List[str]] = None, restrict_to: Optional[Set[str]] = None) -> List[Dict]:
+        """
+        Ranked fuzzy search
+
+        Args:
+            query: Free text (name, firm or email fragment; misspellings allowed)
+            limit: Maximum number of PVs to return (None returns every match)
+            min_score: Minimum similarity (0-1) for a match to be returned
+            fields: Optional subset of FIELD_WEIGHTS keys to search
+            restrict_to: Optional set of PVs to score. Trigram scores can rise as a query
+                         grows, so a previous result set is not a safe restriction
+                         for a longer query
+
+        Returns:
+            List of {"pv", "score", "field", "matched"} dicts, best first
+        """
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+
+        query_grams = trigrams(normalized)
+        if not query_grams:
+            return []
+
+        # Count shared trigrams per distinct text using only the postings of the query's trigrams
+        overlap = Counter()
+        for gram in query_grams:
+            overlap.update(self.postings.get(gram, ()))
+
+        if restrict_to is not None:
+            # Narrowing: only texts belonging to the previous result set are candidates
+            allowed = {text_id for pv in restrict_to for text_id in self.texts_by_pv.get(pv, ())}
+            candidates = [(text_id, common) for text_id, common in overlap.items() if text_id in allowed]
+        elif limit:
+            # Only the texts sharing the most trigrams can make the top results - skip the long tail
+            candidate_count = max(limit * 20, 200)
+            candidates = overlap.most_common(candidate_count) if len(overlap) > candidate_count else overlap.items()
+        else:
+            candidates = overlap.items()
+
+        best = {}
+        query_size = len(query_grams)
+        for text_id, common in candidates:
+            text, text_size = self.texts[text_id]
+
+            # Coverage rewards partial queries ("smith" in "john smith"),
+            # dice rewards close whole-string matches and tolerates typos
+            coverage = common / query_size
+            dice = 2 * common / (query_size + text_size)
+            similarity = 0.6 * coverage + 0.4 * dice
+            if normalized in text:
+                similarity = max(similarity, 0.95)
+
+            for pv, field in self.owners[text_id]:
+                if fields and field not in fields:
+                    continue
+                if restrict_to is not None and pv not in restrict_to:
+                    continue
+                score = similarity * FIELD_WEIGHTS.get(field, 1.0)
+                if score >= min_score and (pv not in best or score > best[pv]["score"]):
+                    best[pv] = {"pv": pv, "score": round(score, 3), "field": field, "matched": text}
+
+        results = sorted(best.values(), key=lambda r: r["score"], reverse=True)
+        return results[:limit] if limit else results
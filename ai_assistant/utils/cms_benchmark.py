@@ -0,0 +1,116 @@
+"""
+CMS note-entry benchmark
+Runs process_session_cms_notes headless against utils/mock_cms_server.py and reports
+notes per minute for the sequential processor and the tab pool, with either note driver
+
+    python -m utils.cms_benchmark --notes 60 --workers 1,4 --latency-ms 50 --submit-latency-ms 200
+    python -m utils.cms_benchmark --drivers browser,http --workers 1
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import logging
+from typing import Dict, List
+
+from config import Config
+from services.cms_note_queue import CMSNoteQueue, set_cms_note_queue
+from utils.mock_cms_server import MockCMSServer
+
+logger = logging.getLogger(__name__)
+
+
+async def run_benchmark(notes: int, workers: int, server_options: Dict = None, pids: int = None,
+                        driver: str = "browser") -> Dict:
+    """
+    Queue notes on a scratch queue and process them against a fresh mock CMS
+
+    Args:
+        notes: Pending notes to queue
+        workers: Tabs for process_session_cms_notes (1 = sequential)
+        pids: Distinct cases the notes are spread over (default: one note per case)
+        driver: "browser" (Playwright) or "http" (direct form posts)
+
+    Returns:
+        Timing and throughput, including session start and login
+    """
+    from services.cms_integration import process_session_cms_notes
+
+    server = MockCMSServer(**(server_options or {})).start()
+    saved = (Config.CMS_BASE_URL, Config.CMS_HEADLESS, Config.CMS_NOTE_DELAY_SECONDS, Config.CMS_HTTP_DRIVER_ENABLED)
+    # The mock CMS is what the HTTP driver was written against, so it may run here without the opt-in
+    Config.CMS_BASE_URL, Config.CMS_HEADLESS, Config.CMS_NOTE_DELAY_SECONDS = server.url, True, 0
+    Config.CMS_HTTP_DRIVER_ENABLED = True
+
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            queue = CMSNoteQueue(os.path.join(scratch, "cms_benchmark.db"), migrate_legacy=False)
+            previous = set_cms_note_queue(queue)
+            try:
+                cases = pids or notes
+                for index in range(notes):
+                    queue.enqueue(100000 + index % cases, f"attorney{index}@example.com", "FOLLOW-UP")
+
+                started = time.perf_counter()
+                completed = await process_session_cms_notes(workers=workers, driver=driver)
+                seconds = time.perf_counter() - started
+                left = queue.stats()["pending_count"]
+            finally:
+                set_cms_note_queue(previous)
+    finally:
+        (Config.CMS_BASE_URL, Config.CMS_HEADLESS, Config.CMS_NOTE_DELAY_SECONDS,
+         Config.CMS_HTTP_DRIVER_ENABLED) = saved
+        stats = server.stats()
+        server.stop()
+
+    return {
+        "driver": driver,
+        "workers": workers,
+        "queued": notes,
+        "notes_added": stats["notes"],
+        "case_updates": stats["case_updates"],
+        "pending_left": left,
+        "completed": completed,
+        "seconds": round(seconds, 2),
+        "notes_per_minute": round(stats["notes"] / seconds * 60, 1) if seconds else 0.0,
+    }
+
+
+def print_report(results: List[Dict]):
+    print(f"\n{'Driver':>8} {'Workers':>8} {'Added':>7} {'Left':>6} {'Seconds':>9} {'Notes/min':>10}")
+    for result in results:
+        print(f"{result['driver']:>8} {result['workers']:>8} {result['notes_added']:>7} {result['pending_left']:>6} "
+              f"{result['seconds']:>9} {result['notes_per_minute']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CMS note entry against the mock CMS")
+    parser.add_argument("--notes", type=int, default=40)
+    parser.add_argument("--pids", type=int, default=None, help="Spread notes over this many cases")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated pool sizes to compare")
+    parser.add_argument("--drivers", default="browser", help="Comma-separated note drivers: browser, http")
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--submit-latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    server_options = {
+        "latency_ms": args.latency_ms,
+        "submit_latency_ms": args.submit_latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+    }
+    results = []
+    for driver in [value.strip() for value in args.drivers.split(",") if value.strip()]:
+        for workers in [int(value) for value in args.workers.split(",") if value.strip()]:
+            print(f"⏱️ {args.notes} notes on {workers} {driver} tab(s)...")
+            results.append(asyncio.run(run_benchmark(args.notes, workers, server_options, args.pids, driver)))
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,581 @@
+"""
+Fake Gmail REST server for offline benchmarks and regression runs
+Serves list/get/threads/history/send/profile and /batch over a synthetic mailbox,
+with configurable latency and quota errors. Point GmailService at it with
+GMAIL_API_ENDPOINT=http://127.0.0.1:8765/
+
+    python -m utils.fake_gmail_server --messages 5000 --latency-ms 40 --error-rate 0.01
+"""
+
+import argparse
+import base64
+import email
+import json
+import random
+import re
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Gmail API quota units per method (https://developers.google.com/gmail/api/reference/quota)
+QUOTA_UNITS = {
+    "messages.list": 5,
+    "messages.get": 5,
+    "messages.send": 100,
+    "threads.list": 10,
+    "threads.get": 10,
+    "history.list": 2,
+    "getProfile": 1,
+}
+
+FIRST_NAMES = ["MARIA", "JOSE", "DAVID", "LINDA", "JAMES", "ANA", "ROBERT", "SOFIA", "MICHAEL", "ELENA",
+               "CARLOS", "KAREN", "DANIEL", "ROSA", "KEVIN", "LAURA", "BRIAN", "GLORIA", "STEVEN", "NANCY"]
+LAST_NAMES = ["GARCIA", "SMITH", "LOPEZ", "NGUYEN", "JOHNSON", "MARTINEZ", "KIM", "BROWN", "HERNANDEZ",
+              "DAVIS", "GONZALEZ", "WILSON", "PEREZ", "LEE", "RAMIREZ", "TAYLOR", "TORRES", "CLARK"]
+REPLIES = [
+    "The case is still pending. We will update you once it settles.",
+    "This matter settled last month; please send a final bill.",
+    "We no longer represent this client.",
+    "Can you send itemized bills and the MRI report?",
+    "Still in treatment, no settlement yet.",
+]
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SyntheticMailbox:
+    """Deterministic collections mailbox: status requests to law firms and their replies"""
+
+    def __init__(self, message_count: int = 1000, seed: int = 0, account: str = "collections@example.com",
+                 firm_count: int = 50, days: int = 365):
+        self._lock = threading.RLock()
+        self.account = account
+        self.messages = {}  # id -> message resource
+        self.threads = {}  # thread id -> [message ids], oldest first
+        self.history = []  # [(history id, message id)], ascending
+        self.history_id = 100000
+        self._next_id = 0
+        self._generate(message_count, random.Random(seed), firm_count, days)
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"{0x18a0000000000 + self._next_id:x}"
+
+    def _generate(self, count: int, rng: random.Random, firm_count: int, days: int):
+        """Build threads of a status request plus zero to two replies, spread over the last N days"""
+        firms = [f"attorney{n}@firm{n}law.com" for n in range(firm_count)]
+        start = datetime.now() - timedelta(days=days)
+        step = timedelta(days=days) / max(count, 1)
+        moment = start
+        while len(self.messages) < count:
+            firm = rng.choice(firms)
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            pv = str(rng.randint(100000, 999999))
+            doi = (start - timedelta(days=rng.randint(30, 1200))).strftime("%m/%d/%Y")
+            subject = f"{name.title()} DOI {doi} // Prohealth Advanced Imaging"
+            body = (f"Hello Law Firm,\n\nIn regards to Prohealth Advanced Imaging billing and liens for "
+                    f"{name.title()}.\n\nCan you let me know the current status of this case?\n\n"
+                    f"Thank you for your time\n\nReference #: {pv}")
+            thread_id = None
+            for reply in range(1 + rng.choice([0, 0, 1, 1, 2])):
+                if len(self.messages) >= count:
+                    break
+                if reply == 0:
+                    message = self._make_message(self.account, firm, subject, body, moment, ["SENT"], thread_id)
+                else:
+                    message = self._make_message(firm, self.account, f"Re: {subject}", rng.choice(REPLIES),
+                                                 moment, ["INBOX", "UNREAD"] if rng.random() < 0.3 else ["INBOX"],
+                                                 thread_id)
+                thread_id = message["threadId"]
+                self._store(message)
+                moment += step * rng.uniform(0.5, 1.5)
+
+    def _make_message(self, sender: str, recipient: str, subject: str, body: str, when: datetime,
+                      labels: List[str], thread_id: str = None) -> Dict:
+        """Gmail message resource (format=full) for a plain-text email"""
+        message_id = self._new_id()
+        data = body.encode()
+        return {
+            "id": message_id,
+            "threadId": thread_id or message_id,
+            "labelIds": list(labels),
+            "snippet": " ".join(body.split())[:200],
+            "internalDate": str(int(when.timestamp() * 1000)),
+            "sizeEstimate": len(data) + 500,
+            "payload": {
+                "partId": "",
+                "mimeType": "text/plain",
+                "filename": "",
+                "headers": [
+                    {"name": "From", "value": sender},
+                    {"name": "To", "value": recipient},
+                    {"name": "Subject", "value": subject},
+                    {"name": "Date", "value": when.strftime("%a, %d %b %Y %H:%M:%S -0800")},
+                    {"name": "Message-ID", "value": f"<{message_id}@fake.gmail>"},
+                ],
+                "body": {"size": len(data), "data": _b64(data)},
+            },
+        }
+
+    def _store(self, message: Dict):
+        with self._lock:
+            self.history_id += 1
+            message["historyId"] = str(self.history_id)
+            self.messages[message["id"]] = message
+            self.threads.setdefault(message["threadId"], []).append(message["id"])
+            self.history.append((self.history_id, message["id"]))
+
+    def send(self, raw: str, thread_id: str = None) -> Dict:
+        """Store a sent RFC 2822 message (as messages.send does) and return its id/threadId"""
+        parsed = email.message_from_bytes(_unb64(raw))
+        payload = parsed.get_payload(decode=True) or b""
+        with self._lock:
+            if thread_id and thread_id not in self.threads:
+                thread_id = None
+            message = self._make_message(self.account, parsed.get("to", ""), parsed.get("subject", ""),
+                                         payload.decode(errors="replace"), datetime.now(), ["SENT"], thread_id)
+            self._store(message)
+        return {"id": message["id"], "threadId": message["threadId"], "labelIds": message["labelIds"]}
+
+    def search(self, query: str = "", label_ids: List[str] = None) -> List[str]:
+        """Message ids matching a Gmail search query, newest first"""
+        matcher = QueryMatcher(query)
+        with self._lock:
+            candidates = sorted(self.messages.values(), key=lambda m: int(m["internalDate"]), reverse=True)
+        return [m["id"] for m in candidates
+                if (not label_ids or all(label in m["labelIds"] for label in label_ids)) and matcher.matches(m)]
+
+    def render(self, message: Dict, fmt: str = "full", metadata_headers: List[str] = None) -> Dict:
+        """Message resource in the requested format"""
+        if fmt == "minimal":
+            return {k: v for k, v in message.items() if k != "payload"}
+        if fmt == "metadata":
+            wanted = {h.lower() for h in metadata_headers or []}
+            headers = [h for h in message["payload"]["headers"] if not wanted or h["name"].lower() in wanted]
+            rendered = {k: v for k, v in message.items() if k != "payload"}
+            rendered["payload"] = {"mimeType": message["payload"]["mimeType"], "headers": headers}
+            return rendered
+        if fmt == "raw":
+            headers = {h["name"]: h["value"] for h in message["payload"]["headers"]}
+            mime = MIMEText(_unb64(message["payload"]["body"]["data"]).decode())
+            for name in ("From", "To", "Subject", "Date"):
+                mime[name] = headers.get(name, "")
+            rendered = {k: v for k, v in message.items() if k != "payload"}
+            rendered["raw"] = _b64(mime.as_bytes())
+            return rendered
+        return message
+
+    def history_since(self, start_history_id: int) -> Optional[List[Dict]]:
+        """messagesAdded records after start_history_id (None if it predates the mailbox)"""
+        with self._lock:
+            if not self.history or start_history_id < self.history[0][0] - 1:
+                return None
+            records = []
+            for history_id, message_id in self.history:
+                if history_id > start_history_id:
+                    message = self.messages[message_id]
+                    stub = {"id": message_id, "threadId": message["threadId"], "labelIds": message["labelIds"]}
+                    records.append({"id": str(history_id), "messages": [stub], "messagesAdded": [{"message": stub}]})
+            return records
+
+
+class QueryMatcher:
+    """Subset of Gmail search: terms, "phrases", OR, parentheses, -negation, in:, from:, to:, subject:, after:, before:"""
+
+    TOKEN = re.compile(r'\(|\)|-?(?:\w+:)?"[^"]*"|[^\s()]+')
+
+    def __init__(self, query: str):
+        self.tokens = self.TOKEN.findall(query or "")
+        self.pos = 0
+        self.predicate = self._parse_or() if self.tokens else (lambda message: True)
+
+    def matches(self, message: Dict) -> bool:
+        return self.predicate(message)
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _parse_or(self):
+        options = [self._parse_and()]
+        while self._peek() == "OR":
+            self.pos += 1
+            options.append(self._parse_and())
+        return lambda m: any(option(m) for option in options)
+
+    def _parse_and(self):
+        parts = []
+        while self._peek() not in (None, ")", "OR"):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if token == "(":
+                parts.append(self._parse_or())
+                if self._peek() == ")":
+                    self.pos += 1
+            else:
+                parts.append(self._term(token))
+        return lambda m: all(part(m) for part in parts)
+
+    def _term(self, token: str):
+        negate = token.startswith("-")
+        token = token.lstrip("-")
+        operator, _, value = token.partition(":") if re.match(r"^\w+:", token) else ("", "", token)
+        value = value.strip('"').lower()
+
+        if operator == "in":
+            label = {"sent": "SENT", "inbox": "INBOX"}.get(value, value.upper())
+            test = lambda m: label in m["labelIds"]
+        elif operator in ("from", "to", "subject"):
+            test = lambda m: value in self._header(m, operator).lower()
+        elif operator in ("after", "before"):
+            cutoff = self._parse_date(value)
+            if operator == "after":
+                test = lambda m: int(m["internalDate"]) / 1000 >= cutoff
+            else:
+                test = lambda m: int(m["internalDate"]) / 1000 < cutoff
+        else:
+            test = lambda m: value in self._text(m)
+        return (lambda m: not test(m)) if negate else test
+
+    @staticmethod
+    def _header(message: Dict, name: str) -> str:
+        for header in message["payload"]["headers"]:
+            if header["name"].lower() == name:
+                return header["value"]
+        return ""
+
+    def _text(self, message: Dict) -> str:
+        body = _unb64(message["payload"]["body"].get("data", "")).decode(errors="replace")
+        return " ".join([self._header(message, "subject"), self._header(message, "from"),
+                         self._header(message, "to"), body]).lower()
+
+    @staticmethod
+    def _parse_date(value: str) -> float:
+        if value.isdigit():
+            return float(value)
+        for fmt in ("%Y/%m/%d", "%Y-%m-%d", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(value, fmt).timestamp()
+            except ValueError:
+                continue
+        return 0.0
+
+
+class ApiError(Exception):
+    """Error returned to the client in Gmail's JSON error format"""
+
+    def __init__(self, code: int, message: str, reason: str, status: str):
+        super().__init__(message)
+        self.code = code
+        self.body = {"error": {"code": code, "message": message, "status": status,
+                               "errors": [{"message": message, "domain": "global", "reason": reason}]}}
+
+
+class FakeGmailServer:
+    """HTTP server speaking enough of the Gmail v1 REST API for GmailService and googleapiclient batches"""
+
+    def __init__(self, mailbox: SyntheticMailbox = None, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 quota_per_second: int = None, error_status: int = 429, seed: int = 0):
+        self.mailbox = mailbox or SyntheticMailbox(seed=seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_per_second = quota_per_second
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._quota_tokens = float(quota_per_second or 0)
+        self._quota_refill = time.monotonic()
+        self.counters = {"requests": 0, "batch_requests": 0, "errors_injected": 0, "quota_rejections": 0}
+        self.method_counts = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle_http(self, "GET")
+
+            def do_POST(self):
+                server._handle_http(self, "POST")
+
+            def log_message(self, format, *args):
+                logger.debug("fake gmail: " + format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeGmailServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-gmail", daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Gmail server on {self.url} ({len(self.mailbox.messages)} messages)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> Dict:
+        """Request counters (per API method) for benchmark reports"""
+        with self._lock:
+            return dict(self.counters, methods=dict(self.method_counts),
+                        messages=len(self.mailbox.messages), history_id=self.mailbox.history_id)
+
+    # ---- HTTP plumbing -------------------------------------------------
+
+    def _handle_http(self, handler: BaseHTTPRequestHandler, verb: str):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        path = urlsplit(handler.path).path
+
+        self._sleep_latency()
+        if path.rstrip("/") in ("/batch", "/batch/gmail/v1"):
+            with self._lock:
+                self.counters["batch_requests"] += 1
+            status, headers, payload = self._handle_batch(handler.headers.get("Content-Type", ""), body)
+        else:
+            status, payload = self._dispatch(verb, handler.path, body)
+            headers = {"Content-Type": "application/json; charset=UTF-8"}
+            payload = json.dumps(payload).encode()
+
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _sleep_latency(self):
+        if self.latency_ms or self.jitter_ms:
+            with self._lock:
+                delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, delay) / 1000)
+
+    def _handle_batch(self, content_type: str, body: bytes):
+        """multipart/mixed batch: run each embedded request and answer with a multipart response"""
+        match = re.search(r'boundary="?([^";]+)"?', content_type)
+        if not match:
+            error = ApiError(400, "Missing batch boundary", "badRequest", "INVALID_ARGUMENT")
+            return 400, {"Content-Type": "application/json"}, json.dumps(error.body).encode()
+
+        boundary = match.group(1)
+        parts = body.decode(errors="replace").split(f"--{boundary}")
+        response_boundary = f"batch_{self._rng.getrandbits(48):x}"
+        out = []
+        for part in parts:
+            part = part.strip("\r\n")
+            if not part or part == "--":
+                continue
+            part_headers, embedded = self._split_head(part)
+            content_id = re.search(r"(?im)^content-id:\s*<?([^>\r\n]+)>?", part_headers)
+            request_head, embedded_body = self._split_head(embedded)
+            request_line = request_head.splitlines()[0] if request_head else ""
+            if len(request_line.split()) < 2:
+                status, payload = 400, ApiError(400, "Malformed batch part", "badRequest", "INVALID_ARGUMENT").body
+            else:
+                verb, target = request_line.split()[:2]
+                status, payload = self._dispatch(verb, target, embedded_body.strip().encode())
+            out.append(
+                f"--{response_boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id.group(1) if content_id else ''}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        out.append(f"--{response_boundary}--\r\n")
+        return 200, {"Content-Type": f"multipart/mixed; boundary={response_boundary}"}, "".join(out).encode()
+
+    @staticmethod
+    def _split_head(text: str):
+        """Split 'headers<blank line>body'"""
+        parts = re.split(r"\r?\n\r?\n", text, maxsplit=1)
+        return parts[0], parts[1] if len(parts) > 1 else ""
+
+    # ---- API -----------------------------------------------------------
+
+    def _dispatch(self, verb: str, target: str, body: bytes):
+        """Route one API call; returns (status, JSON-able payload)"""
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        match = re.match(r"^/gmail/v1/users/([^/]+)/(.+?)/?$", url.path)
+        try:
+            if not match:
+                raise ApiError(404, f"Not found: {url.path}", "notFound", "NOT_FOUND")
+            route = match.group(2)
+            method, handler = self._route(verb, route)
+            self._charge(method)
+            return 200, handler(route, params, body)
+        except ApiError as e:
+            return e.code, e.body
+
+    def _route(self, verb: str, route: str):
+        if verb == "GET" and route == "messages":
+            return "messages.list", self._list_messages
+        if verb == "POST" and route == "messages/send":
+            return "messages.send", self._send
+        if verb == "GET" and route.startswith("messages/"):
+            return "messages.get", self._get_message
+        if verb == "GET" and route == "threads":
+            return "threads.list", self._list_threads
+        if verb == "GET" and route.startswith("threads/"):
+            return "threads.get", self._get_thread
+        if verb == "GET" and route == "history":
+            return "history.list", self._list_history
+        if verb == "GET" and route == "profile":
+            return "getProfile", self._profile
+        raise ApiError(404, f"Unsupported call {verb} {route}", "notFound", "NOT_FOUND")
+
+    def _charge(self, method: str):
+        """Count the call, then apply the quota budget and random error injection"""
+        with self._lock:
+            self.counters["requests"] += 1
+            self.method_counts[method] = self.method_counts.get(method, 0) + 1
+
+            if self.quota_per_second:
+                now = time.monotonic()
+                self._quota_tokens = min(self.quota_per_second,
+                                         self._quota_tokens + (now - self._quota_refill) * self.quota_per_second)
+                self._quota_refill = now
+                units = QUOTA_UNITS.get(method, 5)
+                if self._quota_tokens < units:
+                    self.counters["quota_rejections"] += 1
+                    raise self._quota_error()
+                self._quota_tokens -= units
+
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.counters["errors_injected"] += 1
+                raise self._quota_error()
+
+    def _quota_error(self) -> ApiError:
+        if self.error_status == 403:
+            return ApiError(403, "User-rate limit exceeded", "userRateLimitExceeded", "PERMISSION_DENIED")
+        if self.error_status >= 500:
+            return ApiError(self.error_status, "Backend Error", "backendError", "UNAVAILABLE")
+        return ApiError(429, "Too many concurrent requests for user", "rateLimitExceeded", "RESOURCE_EXHAUSTED")
+
+    @staticmethod
+    def _page(items: List, params: Dict, default_size: int, max_size: int):
+        size = min(int(params.get("maxResults", [default_size])[0]), max_size)
+        start = int(params.get("pageToken", ["0"])[0] or 0)
+        page = items[start:start + size]
+        next_token = str(start + size) if start + size < len(items) else None
+        return page, next_token
+
+    def _list_messages(self, route, params, body):
+        ids = self.mailbox.search(params.get("q", [""])[0], params.get("labelIds"))
+        page, next_token = self._page(ids, params, 100, 500)
+        result = {"resultSizeEstimate": len(ids)}
+        if page:
+            result["messages"] = [{"id": i, "threadId": self.mailbox.messages[i]["threadId"]} for i in page]
+        if next_token:
+            result["nextPageToken"] = next_token
+        return result
+
+    def _get_message(self, route, params, body):
+        message = self.mailbox.messages.get(route.split("/", 1)[1])
+        if not message:
+            raise ApiError(404, "Requested entity was not found.", "notFound", "NOT_FOUND")
+        return self.mailbox.render(message, params.get("format", ["full"])[0], params.get("metadataHeaders"))
+
+    def _list_threads(self, route, params, body):
+        seen = []
+        for message_id in self.mailbox.search(params.get("q", [""])[0], params.get("labelIds")):
+            thread_id = self.mailbox.messages[message_id]["threadId"]
+            if thread_id not in seen:
+                seen.append(thread_id)
+        page, next_token = self._page(seen, params, 100, 500)
+        result = {"resultSizeEstimate": len(seen),
+                  "threads": [{"id": t, "snippet": self.mailbox.messages[self.mailbox.threads[t][-1]]["snippet"]}
+                              for t in page]}
+        if next_token:
+            result["nextPageToken"] = next_token
+        return result
+
+    def _get_thread(self, route, params, body):
+        thread_id = route.split("/", 1)[1]
+        message_ids = self.mailbox.threads.get(thread_id)
+        if not message_ids:
+            raise ApiError(404, "Requested entity was not found.", "notFound", "NOT_FOUND")
+        fmt = params.get("format", ["full"])[0]
+        messages = [self.mailbox.render(self.mailbox.messages[i], fmt, params.get("metadataHeaders"))
+                    for i in message_ids]
+        return {"id": thread_id, "historyId": messages[-1]["historyId"], "messages": messages}
+
+    def _list_history(self, route, params, body):
+        try:
+            start = int(params["startHistoryId"][0])
+        except (KeyError, ValueError):
+            raise ApiError(400, "Missing startHistoryId", "invalidArgument", "INVALID_ARGUMENT")
+        records = self.mailbox.history_since(start)
+        if records is None:
+            raise ApiError(404, "Requested entity was not found.", "notFound", "NOT_FOUND")
+        page, next_token = self._page(records, params, 100, 500)
+        result = {"historyId": str(self.mailbox.history_id)}
+        if page:
+            result["history"] = page
+        if next_token:
+            result["nextPageToken"] = next_token
+        return result
+
+    def _send(self, route, params, body):
+        try:
+            request = json.loads(body or b"{}")
+            return self.mailbox.send(request["raw"], request.get("threadId"))
+        except (KeyError, ValueError) as e:
+            raise ApiError(400, f"Invalid message: {e}", "invalidArgument", "INVALID_ARGUMENT")
+
+    def _profile(self, route, params, body):
+        return {"emailAddress": self.mailbox.account, "messagesTotal": len(self.mailbox.messages),
+                "threadsTotal": len(self.mailbox.threads), "historyId": str(self.mailbox.history_id)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Gmail REST server over a synthetic mailbox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--messages", type=int, default=1000, help="Synthetic mailbox size")
+    parser.add_argument("--firms", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with a quota error")
+    parser.add_argument("--error-status", type=int, default=429, choices=[429, 403, 500, 503])
+    parser.add_argument("--quota-per-second", type=int, default=None, help="Quota units per second (Gmail: 250)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    mailbox = SyntheticMailbox(args.messages, seed=args.seed, firm_count=args.firms)
+    server = FakeGmailServer(mailbox, args.host, args.port, args.latency_ms, args.jitter_ms,
+                             args.error_rate, args.quota_per_second, args.error_status, args.seed)
+    print(f"📬 Fake Gmail server on {server.url} with {len(mailbox.messages)} messages")
+    print(f"   Set GMAIL_API_ENDPOINT={server.url} in config.env to use it")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(server.stats(), indent=2)}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
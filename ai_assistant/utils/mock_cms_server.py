@@ -0,0 +1,352 @@
+"""
+Mock CMS web app for headless note-entry runs and benchmarks
+Reproduces the login, Collectors page and note form that CMSIntegrationService drives
+(input#txtSearch, button "Add", #NoteType, #AddNote, #NextCntDate, #btnAddNote, #btnUpdateCase)
+with configurable latency and failures. Point the app at it with CMS_BASE_URL=http://127.0.0.1:8766/CMS
+
+    python -m utils.mock_cms_server --latency-ms 80 --submit-latency-ms 250
+"""
+
+import argparse
+import html
+import json
+import random
+import secrets
+import threading
+import time
+import logging
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = "CMSSESSION"
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>CMS - Log in</title></head><body>
+<h2>Transcon CMS</h2>
+<form method="post" action="/CMS/Account/Login">
+  <input type="hidden" name="__RequestVerificationToken" value="{token}">
+  <label>User name <input type="text" name="UserName"></label>
+  <label>Password <input type="password" name="Password"></label>
+  <button type="submit">Log in</button>
+  {error}
+</form>
+</body></html>"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>CMS - Home</title></head><body>
+<nav>
+  <a href="#" id="menuView" onclick="document.getElementById('viewMenu').style.display='block'; return false;">View</a>
+  <div id="viewMenu" style="display:none"><a href="/CMS/Collecter/AddCollecter">Collectors</a></div>
+</nav>
+<p>Welcome, {user}</p>
+</body></html>"""
+
+COLLECTORS_PAGE = """<!DOCTYPE html>
+<html><head><title>CMS - Collectors</title></head><body>
+<input type="hidden" id="requestToken" name="__RequestVerificationToken" value="{token}">
+<label>Search <input type="text" id="txtSearch" autocomplete="off"></label>
+<table id="results"><tbody></tbody></table>
+<button type="button" id="btnAdd" style="display:none">Add</button>
+<div id="noteForm" style="display:none">
+  <select id="NoteType">
+    <option value="COR">Correspondence</option>
+    <option value="NA">None</option>
+    <option value="CALL">Phone Call</option>
+  </select>
+  <textarea id="AddNote"></textarea>
+  <input type="text" id="NextCntDate">
+  <button type="button" id="btnAddNote">Save Note</button>
+</div>
+<button type="button" id="btnUpdateCase" style="display:none">Update Case</button>
+<script>
+let currentPid = null;
+const $ = (id) => document.getElementById(id);
+function post(url, data) {{
+  const body = new URLSearchParams(data);
+  body.append('__RequestVerificationToken', $('requestToken').value);
+  return fetch(url, {{method: 'POST', body: body, credentials: 'same-origin'}})
+    .then((r) => {{ if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); }});
+}}
+$('txtSearch').addEventListener('keydown', (event) => {{
+  if (event.key !== 'Enter') return;
+  const pid = $('txtSearch').value.trim();
+  currentPid = null;
+  $('btnAdd').style.display = 'none';
+  $('btnUpdateCase').style.display = 'none';
+  $('noteForm').style.display = 'none';
+  fetch('/CMS/Collecter/Search?pid=' + encodeURIComponent(pid), {{credentials: 'same-origin'}})
+    .then((r) => r.json())
+    .then((d) => {{
+      const tbody = $('results').querySelector('tbody');
+      tbody.innerHTML = '';
+      const row = document.createElement('tr');
+      if (d.found) {{
+        row.innerHTML = '<td>' + d.pid + '</td><td>' + d.name + '</td><td>' + d.status + '</td>';
+        currentPid = d.pid;
+        $('btnAdd').style.display = '';
+        $('btnUpdateCase').style.display = '';
+      }} else {{
+        row.innerHTML = '<td>No case found</td>';
+      }}
+      tbody.appendChild(row);
+    }});
+}});
+$('btnAdd').addEventListener('click', () => {{
+  $('AddNote').value = '';
+  $('NextCntDate').value = '';
+  $('noteForm').style.display = '';
+}});
+$('btnAddNote').addEventListener('click', () => {{
+  post('/CMS/Collecter/AddNote', {{
+    PID: currentPid, NoteType: $('NoteType').value, AddNote: $('AddNote').value, NextCntDate: $('NextCntDate').value
+  }}).then(() => {{ $('noteForm').style.display = 'none'; }}).catch((e) => alert(e));
+}});
+$('btnUpdateCase').addEventListener('click', () => {{
+  post('/CMS/Collecter/UpdateCase', {{PID: currentPid}}).catch((e) => alert(e));
+}});
+</script>
+</body></html>"""
+
+
+class MockCMSServer:
+    """Local stand-in for the CMS pages and form posts used to add notes"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, username: str = None, password: str = None,
+                 latency_ms: float = 0, submit_latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, unknown_pids=None, seed: int = 0):
+        self.username = username
+        self.password = password
+        self.latency_ms = latency_ms
+        self.submit_latency_ms = submit_latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.unknown_pids = {str(pid) for pid in unknown_pids or []}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.sessions = set()
+        self.tokens = set()
+        self.notes = []  # {"pid", "note_type", "text", "next_contact", "at"}
+        self.counters = {"logins": 0, "searches": 0, "notes": 0, "case_updates": 0, "errors_injected": 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def log_message(self, format, *args):
+                logger.debug("mock cms: " + format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as CMS_BASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/CMS"
+
+    def start(self) -> "MockCMSServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-cms", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock CMS on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, sessions=len(self.sessions))
+
+    def notes_for(self, pid) -> list:
+        with self._lock:
+            return [note for note in self.notes if note["pid"] == str(pid)]
+
+    # ---- HTTP plumbing -------------------------------------------------
+
+    def _handle(self, handler: BaseHTTPRequestHandler, verb: str):
+        url = urlsplit(handler.path)
+        path = url.path.rstrip("/") or "/"
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        form = {k: v[0] for k, v in parse_qs(handler.rfile.read(length).decode()).items()} if length else {}
+        session = self._session_of(handler)
+
+        self._sleep(self.latency_ms + (self.submit_latency_ms if verb == "POST" else 0))
+        try:
+            route = {
+                ("GET", "/CMS"): self._login_page,
+                ("GET", "/CMS/Account/Login"): self._login_page,
+                ("POST", "/CMS/Account/Login"): self._login,
+                ("GET", "/CMS/Home"): self._home,
+                ("GET", "/CMS/Collecter/AddCollecter"): self._collectors,
+                ("GET", "/CMS/Collecter/Search"): self._search,
+                ("POST", "/CMS/Collecter/AddNote"): self._add_note,
+                ("POST", "/CMS/Collecter/UpdateCase"): self._update_case,
+                ("GET", "/CMS/_mock/stats"): lambda *_: (200, "application/json", json.dumps(self.stats()), {}),
+            }.get((verb, path))
+            if route is None:
+                status, content_type, body, headers = 404, "text/plain", "Not found", {}
+            else:
+                status, content_type, body, headers = route(session, query, form)
+        except Exception as e:
+            logger.error(f"Mock CMS error on {verb} {path}: {e}")
+            status, content_type, body, headers = 500, "text/plain", str(e), {}
+
+        payload = body.encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _sleep(self, base_ms: float):
+        if base_ms or self.jitter_ms:
+            with self._lock:
+                delay = base_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, delay) / 1000)
+
+    def _session_of(self, handler) -> str:
+        for part in (handler.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE and value in self.sessions:
+                return value
+        return None
+
+    def _new_token(self) -> str:
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self.tokens.add(token)
+        return token
+
+    def _check_token(self, form: Dict) -> bool:
+        with self._lock:
+            return form.get("__RequestVerificationToken") in self.tokens
+
+    def _maybe_fail(self):
+        with self._lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.counters["errors_injected"] += 1
+                return True
+        return False
+
+    @staticmethod
+    def _redirect(location: str, headers: Dict = None):
+        return 302, "text/plain", "", dict(headers or {}, Location=location)
+
+    # ---- pages ---------------------------------------------------------
+
+    def _login_page(self, session, query, form, error: str = ""):
+        if session:
+            return self._redirect("/CMS/Home")
+        return 200, "text/html", LOGIN_PAGE.format(token=self._new_token(), error=error), {}
+
+    def _login(self, session, query, form):
+        username = form.get("UserName", "")
+        password = form.get("Password", "")
+        valid = (username == self.username and password == self.password) if self.username else bool(username)
+        if not self._check_token(form) or not valid:
+            return self._login_page(None, query, form, '<p class="error">Invalid login attempt.</p>')
+
+        new_session = secrets.token_urlsafe(24)
+        with self._lock:
+            self.sessions.add(new_session)
+            self.counters["logins"] += 1
+        return self._redirect("/CMS/Home", {"Set-Cookie": f"{SESSION_COOKIE}={new_session}; Path=/; HttpOnly"})
+
+    def _home(self, session, query, form):
+        if not session:
+            return self._redirect("/CMS")
+        return 200, "text/html", HOME_PAGE.format(user=html.escape(self.username or "collector")), {}
+
+    def _collectors(self, session, query, form):
+        if not session:
+            return self._redirect("/CMS")
+        return 200, "text/html", COLLECTORS_PAGE.format(token=self._new_token()), {}
+
+    # ---- API used by the Collectors page --------------------------------
+
+    def _search(self, session, query, form):
+        if not session:
+            return 401, "application/json", json.dumps({"error": "not logged in"}), {}
+        pid = query.get("pid", "").strip()
+        with self._lock:
+            self.counters["searches"] += 1
+        found = bool(pid) and pid.isdigit() and pid not in self.unknown_pids
+        result = {"found": found, "pid": pid}
+        if found:
+            result.update(name=f"PATIENT {pid}", status="ACTIVE")
+        return 200, "application/json", json.dumps(result), {}
+
+    def _add_note(self, session, query, form):
+        if not session or not self._check_token(form):
+            return 401, "application/json", json.dumps({"error": "not logged in"}), {}
+        if self._maybe_fail():
+            return 500, "application/json", json.dumps({"error": "Server Error"}), {}
+        pid = form.get("PID", "")
+        if not pid or not form.get("AddNote"):
+            return 400, "application/json", json.dumps({"error": "PID and note are required"}), {}
+        note = {
+            "pid": pid,
+            "note_type": form.get("NoteType", ""),
+            "text": form.get("AddNote", ""),
+            "next_contact": form.get("NextCntDate", ""),
+            "at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self.notes.append(note)
+            self.counters["notes"] += 1
+        return 200, "application/json", json.dumps({"success": True, "note": note}), {}
+
+    def _update_case(self, session, query, form):
+        if not session or not self._check_token(form):
+            return 401, "application/json", json.dumps({"error": "not logged in"}), {}
+        if self._maybe_fail():
+            return 500, "application/json", json.dumps({"error": "Server Error"}), {}
+        with self._lock:
+            self.counters["case_updates"] += 1
+        return 200, "application/json", json.dumps({"success": True, "pid": form.get("PID", "")}), {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock CMS for headless note-entry runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--username", default=None, help="Required user name (default: accept any)")
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added to every request")
+    parser.add_argument("--submit-latency-ms", type=float, default=0, help="Added to note and case-update posts")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of posts failing with HTTP 500")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockCMSServer(args.host, args.port, args.username, args.password, args.latency_ms,
+                           args.submit_latency_ms, args.jitter_ms, args.error_rate)
+    print(f"🗂️ Mock CMS on {server.url}")
+    print(f"   Set CMS_BASE_URL={server.url} (and CMS_HEADLESS=true) in config.env to use it")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(server.stats(), indent=2)}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Rate limiting and throughput metrics for outgoing email
+Token bucket with per-minute and per-day ceilings, adjustable while a batch runs
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from datetime import date
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """Thread-safe token bucket (per minute) combined with a daily send ceiling"""
+
+    def __init__(self, per_minute: int, per_day: int, burst: int = None, sent_today: int = 0):
+        self._lock = threading.Lock()
+        self.per_minute = max(1, int(per_minute))
+        self.per_day = max(1, int(per_day))
+        self.fixed_burst = burst
+        self.burst = burst or min(5, self.per_minute)
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
+        self.day = date.today()
+        self.sent_today = sent_today
+
+    def set_limits(self, per_minute: int = None, per_day: int = None):
+        """Change the ceilings; takes effect for the next token"""
+        with self._lock:
+            if per_minute:
+                self.per_minute = max(1, int(per_minute))
+                self.burst = self.fixed_burst or min(5, self.per_minute)
+                self.tokens = min(self.tokens, self.burst)
+            if per_day:
+                self.per_day = max(1, int(per_day))
+        logger.info(f"Send rate limits: {self.per_minute}/min, {self.per_day}/day")
+
+    def _refill(self):
+        """Add tokens for the time elapsed and reset the daily count at midnight"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.per_minute / 60.0)
+        self.last_refill = now
+
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            self.sent_today = 0
+
+    def daily_remaining(self) -> int:
+        """Sends left under today's ceiling"""
+        with self._lock:
+            self._refill()
+            return max(0, self.per_day - self.sent_today)
+
+    def acquire(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Block until a send is allowed
+
+        Returns:
+            False if the daily ceiling is reached or should_stop() turns True
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.sent_today >= self.per_day:
+                    return False
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.sent_today += 1
+                    return True
+                wait = (1 - self.tokens) * 60.0 / self.per_minute
+
+            if should_stop and should_stop():
+                return False
+            # Sleep in short slices so stop requests and limit changes are picked up
+            time.sleep(min(wait, 0.5))
+
+    def refund(self):
+        """Return a token that was acquired but not used"""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+            self.sent_today = max(0, self.sent_today - 1)
+
+
+class ThroughputMeter:
+    """Live send metrics: counts, rolling rate and ETA"""
+
+    def __init__(self, total: int = 0, window_seconds: int = 60):
+        self._lock = threading.Lock()
+        self.total = total
+        self.window_seconds = window_seconds
+        self.started = time.monotonic()
+        self.sent = 0
+        self.failed = 0
+        self.retrying = 0
+        self.bookkept = 0
+        self.recent = deque()  # monotonic timestamps of recent sends
+
+    def record_sent(self):
+        with self._lock:
+            now = time.monotonic()
+            self.sent += 1
+            self.recent.append(now)
+            while self.recent and now - self.recent[0] > self.window_seconds:
+                self.recent.popleft()
+
+    def record_failed(self):
+        with self._lock:
+            self.failed += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retrying += 1
+
+    def record_bookkept(self):
+        with self._lock:
+            self.bookkept += 1
+
+    def snapshot(self, limiter: TokenBucketLimiter = None) -> Dict:
+        """Current metrics as a plain dict (safe to pass across threads)"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.started
+            while self.recent and now - self.recent[0] > self.window_seconds:
+                self.recent.popleft()
+
+            window = min(elapsed, self.window_seconds)
+            rate = len(self.recent) * 60.0 / window if window >= 1 else 0.0
+            average = self.sent * 60.0 / elapsed if elapsed >= 1 else 0.0
+            remaining = max(0, self.total - self.sent - self.failed)
+            eta = remaining * 60.0 / rate if rate > 0 else None
+
+            metrics = {
+                "total": self.total,
+                "sent": self.sent,
+                "failed": self.failed,
+                "retrying": self.retrying,
+                "remaining": remaining,
+                "bookkeeping_backlog": self.sent - self.bookkept,
+                "per_minute": round(rate, 1),
+                "average_per_minute": round(average, 1),
+                "elapsed_seconds": round(elapsed, 1),
+                "eta_seconds": round(eta) if eta is not None else None,
+            }
+
+        if limiter:
+            metrics["limit_per_minute"] = limiter.per_minute
+            metrics["limit_per_day"] = limiter.per_day
+            metrics["daily_remaining"] = limiter.daily_remaining()
+        return metrics
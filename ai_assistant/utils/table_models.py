@@ -0,0 +1,126 @@
+"""
+Table models for large case lists
+Model/view replacements for QTableWidget so tables only render visible rows
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DictTableModel(QAbstractTableModel):
+    """Read-only table model over a list of dicts
+
+    Columns are (header, key) pairs or (header, key, formatter) triples.
+    The raw value is exposed on Qt.UserRole so sorting works on numbers.
+    """
+
+    def __init__(self, columns, parent=None, foregrounds=None):
+        super().__init__(parent)
+        self.columns = [col if len(col) == 3 else (col[0], col[1], None) for col in columns]
+        self.rows = []
+        self.foregrounds = foregrounds or {}  # key -> callable(row) returning a QColor or None
+
+    def set_rows(self, rows):
+        """Replace all rows in one model reset"""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.endResetModel()
+
+    def append_row(self, row):
+        """Append a single row without resetting the model"""
+        position = len(self.rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.rows.append(row)
+        self.endInsertRows()
+
+    def remove_rows(self, predicate):
+        """Remove every row the predicate matches; returns the number removed"""
+        removed = 0
+        for position in range(len(self.rows) - 1, -1, -1):
+            if predicate(self.rows[position]):
+                self.beginRemoveRows(QModelIndex(), position, position)
+                del self.rows[position]
+                self.endRemoveRows()
+                removed += 1
+        return removed
+
+    def row_data(self, row):
+        """Return the dict behind a source row"""
+        if 0 <= row < len(self.rows):
+            return self.rows[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+        _, key, formatter = self.columns[index.column()]
+        value = row.get(key, "")
+
+        if role == Qt.DisplayRole:
+            if formatter:
+                return formatter(value, row)
+            return "" if value is None else str(value)
+        if role == Qt.UserRole:
+            return value if isinstance(value, (int, float)) else ("" if value is None else str(value))
+        if role == Qt.ForegroundRole and key in self.foregrounds:
+            return self.foregrounds[key](row)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+
+class CaseFilterProxyModel(QSortFilterProxyModel):
+    """Sort/filter proxy combining named row predicates (search, balance, ...)
+
+    Each predicate receives the row dict and returns True to keep the row.
+    Filtering happens in the proxy, so the source rows are never rebuilt.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.predicates = {}
+        self.setSortRole(Qt.UserRole)
+        self.setDynamicSortFilter(False)
+
+    def set_predicate(self, name, predicate):
+        """Add, replace or (with None) remove a named predicate and re-filter"""
+        if predicate is None:
+            self.predicates.pop(name, None)
+        else:
+            self.predicates[name] = predicate
+        self.invalidateFilter()
+
+    def set_allowed_pvs(self, pvs, key="PV", name="search"):
+        """Restrict rows to a set of PVs (None shows everything)"""
+        if pvs is None:
+            self.set_predicate(name, None)
+        else:
+            allowed = {str(pv) for pv in pvs}
+            self.set_predicate(name, lambda row: str(row.get(key, "")) in allowed)
+
+    def row_data(self, proxy_row):
+        """Return the dict behind a proxy row"""
+        source_index = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().row_data(source_index.row())
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.predicates:
+            return True
+        row = self.sourceModel().rows[source_row]
+        for predicate in self.predicates.values():
+            if not predicate(row):
+                return False
+        return True
@@ -4,6 +4,8 @@ Prevents UI freezing by running operations in background threads
 """
 
 from PyQt5.QtCore import QThread, pyqtSignal, QObject
+from types import MappingProxyType
+from datetime import datetime
 import time
 import logging
 
@@ -377,4 +379,271 @@ class CollectionsAnalyzerWorker(QThread):
         self.progress_update.emit(100, "Analysis complete!")
         self.log_message.emit(f"✅ Found {matches_found} emails for {len(tracking_data)} cases")
         
-        return {'tracking_data': tracking_data, 'matches': matches_found}
\ No newline at end of file
+        return {'tracking_data': tracking_data, 'matches': matches_found}
+
+
+class AnalysisCancelled(Exception):
+    """Raised from a progress callback to abort a running analysis"""
+
+
+class CategoryAnalysisWorker(QThread):
+    """Worker thread for the case category analysis
+
+    Emits one read-only snapshot when done so the GUI can swap it in at once:
+    {"categories": {category: tuple of case dicts}, "dashboard": {...}, "timestamp": datetime}
+    """
+    
+    progress_update = pyqtSignal(int, str)
+    log_message = pyqtSignal(str)
+    finished = pyqtSignal(object)  # snapshot
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+    
+    def __init__(self, tracker, case_manager, exclude_acknowledged=True, skip_email_search=True):
+        super().__init__()
+        self.tracker = tracker
+        self.case_manager = case_manager
+        self.exclude_acknowledged = exclude_acknowledged
+        self.skip_email_search = skip_email_search
+        self.should_stop = False
+        
+    def stop(self):
+        """Signal the worker to stop"""
+        self.should_stop = True
+        
+    def run(self):
+        """Run the category analysis in background"""
+        # Keep the previous results so a cancelled or failed run leaves the tracker as it was
+        previous_cache = self.tracker.stale_cache_state()
+        
+        try:
+            self.log_message.emit("🗑️ Clearing category cache")
+            self.tracker.clear_stale_cache()
+            
+            self.log_message.emit("🔍 Analyzing case activity patterns")
+            
+            def progress_callback(msg, pct):
+                if self.should_stop:
+                    raise AnalysisCancelled()
+                self.progress_update.emit(pct, msg)
+                if "Found" in msg or "Processing" in msg:
+                    self.log_message.emit(msg)
+            
+            categories = self.tracker.get_comprehensive_stale_cases(
+                self.case_manager,
+                exclude_acknowledged=self.exclude_acknowledged,
+                progress_callback=progress_callback,
+                skip_email_search=self.skip_email_search
+            )
+            if self.should_stop:
+                raise AnalysisCancelled()
+            
+            self.progress_update.emit(92, "Attaching balances...")
+            self.log_message.emit("📦 Processing case categories")
+            snapshot_categories = self._freeze_categories(categories)
+            
+            self.progress_update.emit(96, "Calculating statistics...")
+            self.log_message.emit("📊 Calculating statistics")
+            dashboard = self.tracker.get_collections_dashboard()
+            
+            snapshot = MappingProxyType({
+                "categories": snapshot_categories,
+                "dashboard": MappingProxyType(dashboard),
+                "timestamp": datetime.now(),
+            })
+            
+            self.progress_update.emit(100, "Analysis complete!")
+            self.log_message.emit("✅ Category analysis complete")
+            self.finished.emit(snapshot)
+            
+        except AnalysisCancelled:
+            self.tracker.restore_stale_cache(previous_cache)
+            logger.info("Category analysis cancelled")
+            self.cancelled.emit()
+        except Exception as e:
+            self.tracker.restore_stale_cache(previous_cache)
+            logger.error(f"Error in category analysis: {e}")
+            self.error.emit(str(e))
+    
+    def _freeze_categories(self, categories):
+        """Copy every case row (with its balance) into read-only per-category tuples"""
+        balance_map = None
+        frozen = {}
+        for category, cases in categories.items():
+            rows = []
+            for case in cases:
+                row = dict(case)
+                if 'balance' not in row:
+                    if balance_map is None:
+                        balance_map = self.case_manager.get_balance_map()
+                    row['balance'] = balance_map.get(str(row.get('pv', '')).strip(), 0.0)
+                rows.append(row)
+            frozen[category] = tuple(rows)
+        return MappingProxyType(frozen)
+
+
+class OutboxSenderWorker(QThread):
+    """Worker thread that sends a batch through (or drains) the bulk email outbox"""
+    
+    progress_update = pyqtSignal(int, str)
+    log_message = pyqtSignal(str)
+    metrics_update = pyqtSignal(dict)  # live throughput metrics
+    finished = pyqtSignal(dict)  # send results
+    error = pyqtSignal(str)
+    
+    def __init__(self, bulk_service, emails=None, add_cms_notes=True, digest=False):
+        super().__init__()
+        self.bulk_service = bulk_service
+        self.emails = emails  # None resumes whatever is left in the outbox
+        self.add_cms_notes = add_cms_notes
+        self.digest = digest  # one email per firm address
+        self.should_stop = False
+        
+    def stop(self):
+        """Stop after the email currently being sent"""
+        self.should_stop = True
+        
+    def run(self):
+        """Send emails in background"""
+        try:
+            def progress_callback(msg, pct):
+                self.progress_update.emit(pct, msg)
+                self.log_message.emit(msg)
+            
+            if self.emails is None:
+                results = self.bulk_service.drain_outbox(
+                    progress_callback=progress_callback,
+                    should_stop=lambda: self.should_stop,
+                    metrics_callback=self.metrics_update.emit
+                )
+            else:
+                results = self.bulk_service.send_batch(
+                    self.emails,
+                    add_cms_notes=self.add_cms_notes,
+                    progress_callback=progress_callback,
+                    should_stop=lambda: self.should_stop,
+                    metrics_callback=self.metrics_update.emit,
+                    digest=self.digest
+                )
+            results["stopped"] = self.should_stop
+            self.finished.emit(results)
+            
+        except Exception as e:
+            logger.error(f"Error sending from outbox: {e}")
+            self.error.emit(str(e))
+
+
+class BatchPrepareWorker(QThread):
+    """Worker thread that prepares a bulk email batch and streams each email as it is ready"""
+    
+    email_ready = pyqtSignal(dict)
+    finished = pyqtSignal(list)  # all prepared emails, in batch order
+    error = pyqtSignal(str)
+    
+    def __init__(self, prepare):
+        super().__init__()
+        self.prepare = prepare  # callable(on_email) -> list of emails
+        
+    def run(self):
+        """Prepare the batch in background"""
+        try:
+            emails = self.prepare(self.email_ready.emit)
+            self.finished.emit(emails or [])
+        except Exception as e:
+            logger.error(f"Error preparing batch: {e}")
+            self.error.emit(str(e))
+
+
+class ScheduledSendWorker(QThread):
+    """Long-running worker that delivers scheduled emails as their send windows come due"""
+    
+    log_message = pyqtSignal(str)
+    metrics_update = pyqtSignal(dict)  # live throughput metrics while sending
+    sent_update = pyqtSignal(dict)  # results of each round that sent something
+    error = pyqtSignal(str)
+    
+    def __init__(self, bulk_service, poll_seconds=60):
+        super().__init__()
+        self.bulk_service = bulk_service
+        self.poll_seconds = poll_seconds
+        self.should_stop = False
+        
+    def stop(self):
+        """Stop after the email currently being sent"""
+        self.should_stop = True
+        
+    def run(self):
+        """Send due emails, then sleep until the next one (or the next poll) until stopped"""
+        self.log_message.emit("🕘 Scheduled sender started")
+        while not self.should_stop:
+            try:
+                results = self.bulk_service.send_due_scheduled(
+                    should_stop=lambda: self.should_stop,
+                    metrics_callback=self.metrics_update.emit
+                )
+                if results.get("sent") or results.get("failed"):
+                    self.sent_update.emit(results)
+                    self.log_message.emit(
+                        f"🕘 Scheduled send: {len(results['sent'])} sent, {len(results['failed'])} failed"
+                    )
+                
+                delay = self.bulk_service.outbox.next_retry_delay(scheduled=True)
+                if delay is not None and (results.get("daily_limit_reached") or results.get("busy")):
+                    # Missed slots are re-planned on a later round; a running batch holds the outbox
+                    delay = self.poll_seconds
+            except Exception as e:
+                logger.error(f"Error in scheduled sender: {e}")
+                self.error.emit(str(e))
+                delay = self.poll_seconds
+            
+            # Nothing left scheduled - the worker is restarted when a new batch is scheduled
+            if delay is None:
+                break
+            
+            # Sleep in short slices so stop requests are picked up promptly
+            waited = 0.0
+            while waited < min(max(delay, 1.0), self.poll_seconds) and not self.should_stop:
+                time.sleep(0.5)
+                waited += 0.5
+        self.log_message.emit("🕘 Scheduled sender stopped")
+
+
+class CMSNoteConsumerWorker(QThread):
+    """Long-running worker that adds queued CMS notes on the persistent CMS session"""
+    
+    status_update = pyqtSignal(dict)  # backlog, backpressure and throughput
+    log_message = pyqtSignal(str)
+    
+    def __init__(self, consumer=None):
+        super().__init__()
+        if consumer is None:
+            from services.cms_integration import CMSNoteConsumer
+            consumer = CMSNoteConsumer()
+        self.consumer = consumer
+        
+    def pause(self):
+        self.consumer.pause()
+        self.log_message.emit("⏸️ CMS note consumer paused")
+        
+    def resume(self):
+        self.consumer.resume()
+        self.log_message.emit("▶️ CMS note consumer resumed")
+        
+    def stop(self):
+        """Stop after the PID currently being noted"""
+        self.consumer.stop()
+        
+    def run(self):
+        """Own event loop for the lifetime of the consumer - the browser session is bound to it"""
+        import asyncio
+        self.log_message.emit("🚚 CMS note consumer started")
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.consumer.run(status_callback=self.status_update.emit))
+        except Exception as e:
+            logger.error(f"Error in CMS note consumer: {e}")
+            self.log_message.emit(f"❌ CMS note consumer error: {e}")
+        finally:
+            loop.close()
+        self.log_message.emit("🚚 CMS note consumer stopped")